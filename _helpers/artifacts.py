@@ -0,0 +1,57 @@
+"""Registry of derived network artifacts that can be precomputed.
+
+Compute functions decorated with ``precomputable`` first look for their
+result in the artifact store attached to the network (e.g. a sidecar file
+written by ``_helpers.sidecar``) and only compute it when it is missing.
+"""
+
+import functools
+import inspect
+import weakref
+
+PRECOMPUTABLE = {}
+
+_attached = weakref.WeakKeyDictionary()
+
+
+def attach(network, store):
+    """Serve artifacts of ``network`` from ``store`` (anything with ``get(key)``)."""
+    _attached[network] = store
+
+
+def detach(network):
+    _attached.pop(network, None)
+
+
+def attached(network):
+    try:
+        return _attached.get(network)
+    except (
+        TypeError
+    ):  # plain pypsa networks are unhashable and never have a store attached
+        return None
+
+
+def artifact_key(func, *args, **kwargs):
+    """Key of ``func(network, *args, **kwargs)``, e.g. ``carrier_dispatch[attr=p,rule=D]``."""
+    bound = inspect.signature(func).bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    params = list(bound.arguments.items())[1:]
+    if not params:
+        return func.__name__
+    return f"{func.__name__}[{','.join(f'{k}={v}' for k, v in params)}]"
+
+
+def precomputable(func):
+    PRECOMPUTABLE[func.__name__] = func
+
+    @functools.wraps(func)
+    def wrapper(network, *args, **kwargs):
+        store = attached(network)
+        if store is not None:
+            result = store.get(artifact_key(func, *args, **kwargs))
+            if result is not None:
+                return result
+        return func(network, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,180 @@
+"""Side-by-side comparison of several networks.
+
+Networks are reduced to ``NetworkVariant`` objects holding the static tables
+and snapshot-weighted results needed for comparison, so the full networks
+can be dropped after loading. Static columns are interned by content: when
+variants share the same base topology, their identical columns (buses,
+carriers, costs, coordinates, ...) point to one shared ``Series`` instead of
+N copies.
+"""
+
+import hashlib
+import weakref
+
+import pandas as pd
+
+from _helpers.profiling import profiled
+
+# list_name -> (nominal capacity attribute, dispatch attribute, snapshot weighting)
+COMPARE_COMPONENTS = {
+    "generators": ("p_nom", "p", "generators"),
+    "storage_units": ("p_nom", "p", "generators"),
+    "stores": ("e_nom", "p", "stores"),
+    "links": ("p_nom", "p0", "generators"),
+    "lines": ("s_nom", "p0", "generators"),
+}
+
+# Components whose energy is the transported energy, summed over both flow directions
+BRANCH_COMPONENTS = {"links", "lines"}
+
+COMPARE_METRICS = ["Capacity", "Energy", "Capital cost", "Operational cost"]
+
+_interned_columns = weakref.WeakValueDictionary()
+
+
+def _column_key(series):
+    try:
+        hashed = pd.util.hash_pandas_object(series, index=True).values
+    except TypeError:  # unhashable cell values, e.g. lists
+        return None
+    digest = hashlib.sha1(hashed.tobytes()).hexdigest()
+    return (series.name, str(series.dtype), len(series), digest)
+
+
+def intern_column(series):
+    """Return a shared instance of ``series`` if an identical column is already held.
+
+    New columns are copied, since a column taken from a network's table is a
+    view that would keep the network's whole block of columns alive.
+    """
+    key = _column_key(series)
+    if key is None:
+        return series.copy()
+    shared = _interned_columns.get(key)
+    if shared is None or not shared.index.equals(series.index):
+        _interned_columns[key] = shared = series.copy()
+    return shared
+
+
+class NetworkVariant:
+    """Comparison-ready extract of one network."""
+
+    def __init__(self, name, network):
+        self.name = name
+        self.snapshots = network.snapshots
+        self.static = {}
+        self.energy = {}
+        self.dispatch_by_carrier = {}
+
+        weightings = network.snapshot_weightings
+        for component, (_, dispatch_attr, weighting) in COMPARE_COMPONENTS.items():
+            df = getattr(network, component)
+            self.static[component] = {col: intern_column(df[col]) for col in df.columns}
+
+            dispatch = getattr(network, f"{component}_t").get(
+                dispatch_attr, pd.DataFrame()
+            )
+            dispatch = dispatch.reindex(columns=df.index, fill_value=0.0)
+            flow = dispatch.abs() if component in BRANCH_COMPONENTS else dispatch
+            self.energy[component] = flow.mul(weightings[weighting], axis=0).sum()
+            if "carrier" in df.columns and len(df):
+                self.dispatch_by_carrier[component] = (
+                    dispatch.T.groupby(df["carrier"]).sum().T
+                )
+
+    def static_frame(self, component):
+        return pd.DataFrame(self.static[component], copy=False)
+
+    def capacity(self, component):
+        """Optimised capacity if the network was solved, otherwise the nominal one."""
+        nom = COMPARE_COMPONENTS[component][0]
+        columns = self.static[component]
+        opt = columns.get(f"{nom}_opt")
+        if opt is not None and opt.abs().sum() > 0:
+            return opt
+        return columns.get(nom, pd.Series(dtype=float))
+
+    def metric(self, component, metric):
+        columns = self.static[component]
+        match metric:
+            case "Capacity":
+                return self.capacity(component)
+            case "Energy":
+                return self.energy[component]
+            case "Capital cost":
+                return self.capacity(component) * columns.get("capital_cost", 0.0)
+            case "Operational cost":
+                return self.energy[component] * columns.get("marginal_cost", 0.0)
+            case _:
+                raise ValueError(f"Unknown comparison metric: {metric}")
+
+
+def align(variants, component, metric):
+    """Metric per component (rows, union of all indexes) and variant (columns)."""
+    table = pd.concat(
+        {v.name: v.metric(component, metric) for v in variants},
+        axis=1,
+    )
+    return table.fillna(0.0)
+
+
+def carriers(variants, component):
+    """Carrier of each component, taken from the first variant that has it."""
+    series = [
+        v.static[component]["carrier"]
+        for v in variants
+        if "carrier" in v.static[component]
+    ]
+    if not series:
+        return pd.Series(dtype=object)
+    combined = pd.concat(series)
+    return combined[~combined.index.duplicated()]
+
+
+@profiled
+def by_carrier(variants, component, metric):
+    table = align(variants, component, metric)
+    return table.groupby(carriers(variants, component).reindex(table.index)).sum()
+
+
+def deltas(table, reference):
+    return table.sub(table[reference], axis=0)
+
+
+def common_snapshots(variants):
+    snapshots = variants[0].snapshots
+    for v in variants[1:]:
+        snapshots = snapshots.intersection(v.snapshots)
+    return snapshots
+
+
+@profiled
+def dispatch_deltas(variants, component, reference):
+    """Carrier dispatch of each variant minus the reference, on the shared snapshots."""
+    snapshots = common_snapshots(variants)
+    ref = next(v for v in variants if v.name == reference)
+    ref_dispatch = ref.dispatch_by_carrier.get(component, pd.DataFrame()).reindex(
+        snapshots
+    )
+    frames = {}
+    for v in variants:
+        if v.name == reference:
+            continue
+        dispatch = v.dispatch_by_carrier.get(component, pd.DataFrame()).reindex(
+            snapshots
+        )
+        frames[v.name] = dispatch.sub(ref_dispatch, fill_value=0.0)
+    return pd.concat(frames, axis=1) if frames else pd.DataFrame(index=snapshots)
+
+
+def shared_columns(variants):
+    """Number of static columns held and how many of them are shared with another variant."""
+    seen = {}
+    total = 0
+    for v in variants:
+        for columns in v.static.values():
+            for series in columns.values():
+                total += 1
+                seen[id(series)] = seen.get(id(series), 0) + 1
+    shared = sum(count for count in seen.values() if count > 1)
+    return total, shared
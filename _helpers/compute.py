@@ -0,0 +1,408 @@
+"""Computations behind the explorer views.
+
+Nothing in here touches Streamlit, so the same results can be produced by the
+app and by the headless batch report (``batch_report.py``).
+"""
+
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from _helpers.artifacts import precomputable
+from _helpers.profiling import profiled
+from _helpers.readonly import derived
+
+# View label -> network list_name
+COMPONENT_TABLES = {
+    "Generators": "generators",
+    "Buses": "buses",
+    "Lines": "lines",
+    "Links": "links",
+    "Loads": "loads",
+    "Storage Units": "storage_units",
+    "Stores": "stores",
+    "Transformers": "transformers",
+}
+
+CARRIER_COLORS = {
+    "nuclear": [10, 230, 120],
+    "onwind": [52, 152, 219],
+    "solar": [241, 196, 15],
+    "hydro": [41, 128, 185],
+    "gas": [230, 126, 34],
+    "ccgt": [127, 140, 141],
+    "ocgt": [117, 130, 141],
+    "coal": [17, 10, 161],
+    "oil": [192, 57, 43],
+    "biomass": [39, 174, 96],
+    "geothermal": [142, 68, 173],
+}
+
+# Heatmap label -> rows of the heatmap
+HEATMAP_LAYOUTS = {
+    "Day × hour": "day",
+    "Week × hour": "week",
+}
+
+# Resolution label -> pandas resample rule
+RESAMPLE_RULES = {
+    "Snapshots": None,
+    "Daily": "D",
+    "Weekly": "W",
+    "Monthly": "MS",
+}
+
+
+@precomputable
+def component_counts(network):
+    return pd.DataFrame(
+        {
+            "Component": list(COMPONENT_TABLES),
+            "Count": [len(getattr(network, c)) for c in COMPONENT_TABLES.values()],
+        },
+    )
+
+
+def network_attributes(network):
+    snapshots = network.snapshots
+    attributes = {
+        "Number of snapshots": len(snapshots),
+        "Investment periods": list(network.investment_periods),
+    }
+    if getattr(network, "name", None):
+        attributes["Network name"] = network.name
+    if len(snapshots) > 0:
+        attributes["Time range"] = f"{snapshots[0]} to {snapshots[-1]}"
+    positions = _positions(period_ranges(network))
+    if positions:
+        attributes["Snapshots per period"] = {
+            period: len(p) for period, p in positions.items()
+        }
+        # First and last timestep of each period, whether or not its snapshots are contiguous
+        timesteps = snapshots.get_level_values(1)
+        attributes["Period time ranges"] = {
+            period: f"{timesteps[p].min()} to {timesteps[p].max()}"
+            for period, p in positions.items()
+            if len(p)
+        }
+    return attributes
+
+
+@derived
+def period_ranges(network):
+    """Snapshot positions of each investment period, empty without periods.
+
+    Contiguous periods get a ``slice(start, stop)``, which slices time series
+    as a cheap positional view, unlike selecting a period through the
+    snapshot MultiIndex. Periods whose snapshots are interleaved with other
+    periods get the array of their positions instead.
+    """
+    snapshots = network.snapshots
+    if not isinstance(snapshots, pd.MultiIndex):
+        return {}
+    codes, periods = pd.factorize(snapshots.get_level_values(0))
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    if len(starts) == len(periods):
+        stops = np.r_[starts[1:], len(codes)]
+        return {
+            period: slice(int(start), int(stop))
+            for period, start, stop in zip(periods.tolist(), starts, stops)
+        }
+    return {
+        period: np.flatnonzero(codes == code)
+        for code, period in enumerate(periods.tolist())
+    }
+
+
+def _positions(ranges):
+    return {
+        period: np.arange(r.start, r.stop) if isinstance(r, slice) else r
+        for period, r in ranges.items()
+    }
+
+
+def period_slice(network, ts_df, period):
+    """Rows of ``ts_df`` in investment ``period``, indexed by timestep; ``ts_df`` for ``period=None``."""
+    if period is None:
+        return ts_df
+    return ts_df.iloc[period_ranges(network)[period]].droplevel(0)
+
+
+@derived
+def component_table(network, label):
+    """Static table of a component, with bus coordinates for single-bus components."""
+    df = getattr(network, COMPONENT_TABLES[label])
+    if "bus" in df.columns and "x" not in df.columns and "y" not in df.columns:
+        coordinates = bus_coordinates(network, COMPONENT_TABLES[label])
+        df = df.assign(x=coordinates["x"], y=coordinates["y"])
+    return df
+
+
+@derived
+def bus_coordinates(network, component):
+    """``x``/``y`` coordinates of the bus of each single-bus component."""
+    buses = getattr(network, component)["bus"]
+    return pd.DataFrame(
+        {"x": buses.map(network.buses["x"]), "y": buses.map(network.buses["y"])},
+    )
+
+
+@derived
+def carrier_table(network):
+    """Carriers with a ``legend_name`` (their nice name, else their name) and a ``color``."""
+    carriers = network.carriers
+    names = carriers.index.to_series()
+    default_colors = names.map(
+        lambda c: "#{:02x}{:02x}{:02x}".format(*carrier_color(c))
+    )
+
+    legend_name = (
+        carriers["nice_name"].replace("", pd.NA) if "nice_name" in carriers else names
+    )
+    color = (
+        carriers["color"].replace("", pd.NA) if "color" in carriers else default_colors
+    )
+    return carriers.assign(
+        legend_name=legend_name.fillna(names),
+        color=color.fillna(default_colors),
+    )
+
+
+@derived
+def carrier_colors(network):
+    """RGB color of each carrier for the map, following the carrier table."""
+    from matplotlib.colors import to_rgb
+
+    def rgb(carrier, color):
+        try:
+            return [round(255 * c) for c in to_rgb(color)]
+        except ValueError:
+            return carrier_color(carrier)
+
+    colors = carrier_table(network)["color"]
+    return pd.Series(
+        [rgb(c, color) for c, color in colors.items()], index=colors.index, dtype=object
+    )
+
+
+@profiled
+@precomputable
+@derived
+def capacity_by_carrier(network, component="generators"):
+    """Installed capacity (``p_nom``) per carrier, or ``None`` if not available."""
+    df = getattr(network, component)
+    if "carrier" not in df.columns or "p_nom" not in df.columns:
+        return None
+    return df.groupby("carrier")["p_nom"].sum()
+
+
+def timeseries(network, component, attr):
+    """Time series ``attr`` of ``component`` without all-NaN columns, or ``None``."""
+    ts_df = getattr(network, f"{component}_t").get(attr)
+    if ts_df is None or len(ts_df) == 0:
+        return None
+    return ts_df.dropna(axis=1, how="all")
+
+
+@profiled
+def aggregate_by_carrier(ts_df, static):
+    """Sum the columns of ``ts_df`` per carrier of the matching components in ``static``."""
+    columns = ts_df.columns.intersection(static.index)
+    carriers = static.loc[columns, "carrier"]
+    return ts_df[columns].T.groupby(carriers).sum().T.dropna()
+
+
+def resample(ts_df, rule):
+    """Average ``ts_df`` to the resample ``rule``; non-datetime snapshots are returned as is."""
+    if isinstance(ts_df.index, pd.MultiIndex):
+        ts_df = ts_df.droplevel(0)
+    if not isinstance(ts_df.index, pd.DatetimeIndex):
+        return ts_df
+    return ts_df.resample(rule).mean()
+
+
+@profiled
+@precomputable
+@derived
+def carrier_dispatch(network, attr="p", rule=None, period=None):
+    """Generator ``attr`` summed per carrier, optionally of one investment ``period`` and resampled, or ``None``."""
+    ts_df = timeseries(network, "generators", attr)
+    if ts_df is None or "carrier" not in network.generators.columns:
+        return None
+    agg_df = aggregate_by_carrier(
+        period_slice(network, ts_df, period), network.generators
+    )
+    if rule is not None:
+        agg_df = resample(agg_df, rule)
+    return agg_df
+
+
+def heatmap_series(
+    network, component, attr, aggregation="total", key=None, period=None
+):
+    """``attr`` of ``component`` summed over all components (``"total"``), the carrier ``key``
+    (``"carrier"``) or of the component ``key`` (``"column"``), or ``None``.
+    """
+    ts_df = timeseries(network, component, attr)
+    if ts_df is None:
+        return None
+    ts_df = period_slice(network, ts_df, period)
+    match aggregation:
+        case "total":
+            return ts_df.sum(axis=1)
+        case "carrier":
+            static = getattr(network, component)
+            return ts_df[
+                static.index[static["carrier"] == key].intersection(ts_df.columns)
+            ].sum(axis=1)
+        case "column":
+            return ts_df[key]
+        case _:
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+
+
+@profiled
+@derived
+def heatmap_matrix(
+    network, component, attr, aggregation="total", key=None, layout="day", period=None
+):
+    """One series (see ``heatmap_series``) as a (days or weeks x hour of day) matrix, or ``None``.
+
+    The series is brought onto a whole-day hourly grid and reshaped, weeks
+    average the hours of their days. Snapshots must be datetimes; time zone
+    aware ones are shown in local time, so days switching to or from daylight
+    saving time still have 24 hours.
+    """
+    series = heatmap_series(network, component, attr, aggregation, key, period)
+    if series is None or series.empty:
+        return None
+    if isinstance(series.index, pd.MultiIndex):
+        series = series.droplevel(0)
+    if not isinstance(series.index, pd.DatetimeIndex):
+        return None
+    if series.index.tz is not None:
+        # The hour skipped in spring stays empty, the repeated one in autumn is averaged
+        series = series.tz_localize(None)
+
+    hourly = series.resample("h").mean()
+    # Snapshots coarser than an hour hold for their interval, gaps in the snapshots stay empty
+    interval = (
+        series.index.to_series().diff().median()
+        if len(series) > 1
+        else pd.Timedelta(hours=1)
+    )
+    limit = int(np.ceil(interval / pd.Timedelta(hours=1))) - 1
+    if limit > 0:
+        hourly = hourly.reindex(
+            pd.date_range(hourly.index[0], periods=len(hourly) + limit, freq="h")
+        )
+        hourly = hourly.ffill(limit=limit)
+    start = hourly.index[0].normalize()
+    end = hourly.index[-1].normalize() + pd.Timedelta(days=1)
+    if layout == "week":
+        start -= pd.Timedelta(days=start.dayofweek)
+        end += pd.Timedelta(days=(7 - end.dayofweek) % 7)
+    hours = pd.date_range(start, end, freq="h", inclusive="left")
+    days = hourly.reindex(hours).to_numpy(dtype=float).reshape(-1, 24)
+    columns = pd.RangeIndex(24, name="hour")
+
+    if layout == "day":
+        return pd.DataFrame(days, index=hours[::24].rename("day"), columns=columns)
+    with warnings.catch_warnings():
+        # Hours missing on all days of a week stay empty
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        weeks = np.nanmean(days.reshape(-1, 7, 24), axis=1)
+    return pd.DataFrame(weeks, index=hours[:: 7 * 24].rename("week"), columns=columns)
+
+
+def _carrier_groups(static, columns):
+    if "carrier" in static.columns:
+        return static.loc[columns, "carrier"]
+    return pd.Series("total", index=columns)
+
+
+@profiled
+@derived
+def period_totals(network, component="generators", attr="p"):
+    """Snapshot-weighted sums of ``attr`` per investment period (rows) and carrier (columns), or ``None``."""
+    ranges = period_ranges(network)
+    ts_df = timeseries(network, component, attr)
+    if not ranges or ts_df is None:
+        return None
+    static = getattr(network, component)
+    columns = ts_df.columns.intersection(static.index)
+    weights = (
+        network.snapshot_weightings["generators"]
+        .reindex(ts_df.index)
+        .fillna(0)
+        .to_numpy()
+    )
+    values = ts_df[columns].fillna(0).to_numpy() * weights[:, None]
+
+    # One pass over the time series, each row summed into its period
+    sums = np.stack([values[r].sum(axis=0) for r in ranges.values()])
+    totals = pd.DataFrame(
+        sums, index=pd.Index(list(ranges), name="period"), columns=columns
+    )
+    return totals.T.groupby(_carrier_groups(static, columns)).sum().T
+
+
+@derived
+def period_profiles(network, component="generators", attr="p"):
+    """Total ``attr`` of each investment period (columns) by snapshot position within the period, or ``None``."""
+    ranges = period_ranges(network)
+    ts_df = timeseries(network, component, attr)
+    if not ranges or ts_df is None:
+        return None
+    total = ts_df.sum(axis=1).to_numpy()
+    profiles = pd.DataFrame(
+        {str(period): pd.Series(total[r]) for period, r in ranges.items()}
+    )
+    return profiles.rename_axis("snapshot in period")
+
+
+def carrier_color(carrier):
+    """Return RGB color based on carrier type"""
+    carrier_str = str(carrier).lower()
+    if carrier_str in CARRIER_COLORS:
+        return CARRIER_COLORS[carrier_str]
+    # Generate a random color for unknown carrier types
+    # Using seed based on carrier name for consistency
+    rng = random.Random(carrier_str)
+    return [rng.randint(50, 250), rng.randint(50, 250), rng.randint(50, 250)]
+
+
+def map_data(df, colors=None):
+    """Prepare component coordinates, point sizes and colors for the map, or ``None``.
+
+    ``colors`` maps carriers to RGB colors, unknown carriers get a generated one.
+    """
+    if "x" not in df.columns or "y" not in df.columns:
+        return None
+
+    map_df = df.rename(columns={"x": "lon", "y": "lat"})
+
+    # Use p_nom for elevation if available, otherwise a constant value
+    if "p_nom" in map_df.columns:
+        max_elevation = max(1, map_df["p_nom"].max())  # Avoid division by zero
+        map_df["elevation_normalized"] = map_df["p_nom"] / max_elevation * 1000
+    else:
+        map_df["elevation_normalized"] = 100
+
+    map_df = map_df.reset_index()
+    if "carrier" in map_df.columns:
+        colors = {} if colors is None else dict(colors)
+        palette = {
+            c: colors.get(c) or carrier_color(c) for c in map_df["carrier"].unique()
+        }
+        map_df["color"] = map_df["carrier"].map(palette)
+    return map_df
+
+
+@profiled
+@precomputable
+@derived
+def component_map_data(network, label):
+    return map_data(component_table(network, label), carrier_colors(network))
@@ -0,0 +1,149 @@
+"""Chunked export of network tables to Parquet, CSV or Excel.
+
+Exports are written chunk by chunk from ``*_chunks`` generators, which slice
+the network's frames instead of materializing the filtered result, so large
+time series can be exported with little memory on top of the network.
+"""
+
+import bz2
+import gzip
+import lzma
+
+import pandas as pd
+
+from _helpers.profiling import profiled
+
+CHUNK_ROWS = 50_000
+
+# Excel sheets hold at most 1,048,576 rows, including the header
+EXCEL_MAX_ROWS = 1_048_575
+
+# format -> (file extension, supported compressions)
+EXPORT_FORMATS = {
+    "Parquet": ("parquet", ["snappy", "zstd", "gzip", "none"]),
+    "CSV": ("csv", ["none", "gzip", "bz2", "xz"]),
+    "Excel": ("xlsx", ["none"]),
+}
+
+_CSV_OPENERS = {
+    "gzip": (gzip.open, ".gz"),
+    "bz2": (bz2.open, ".bz2"),
+    "xz": (lzma.open, ".xz"),
+}
+
+
+def export_filename(name, fmt, compression="none"):
+    extension = EXPORT_FORMATS[fmt][0]
+    if fmt == "CSV" and compression in _CSV_OPENERS:
+        extension += _CSV_OPENERS[compression][1]
+    return f"{name}.{extension}"
+
+
+def frame_chunks(df, start=0, stop=None, chunk_rows=CHUNK_ROWS):
+    """Chunks of the rows of ``df`` (a frame or series) between positions ``start`` and ``stop``."""
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+    stop = len(df) if stop is None else stop
+    for i in range(start, stop, chunk_rows):
+        yield df.iloc[i : min(i + chunk_rows, stop)]
+
+
+def timeseries_chunks(
+    ts_df, columns=None, start=0, stop=None, aggregation=None, chunk_rows=CHUNK_ROWS
+):
+    """Chunks of ``ts_df`` between snapshot positions ``start`` and ``stop``.
+
+    ``aggregation`` is ``None`` for the selected ``columns`` or ``"sum"`` for
+    their total.
+    """
+    stop = len(ts_df) if stop is None else stop
+    for i in range(start, stop, chunk_rows):
+        chunk = ts_df.iloc[i : min(i + chunk_rows, stop)]
+        if columns is not None:
+            chunk = chunk[columns]
+        match aggregation:
+            case None:
+                yield chunk
+            case "sum":
+                yield chunk.sum(axis=1).rename("total").to_frame()
+            case _:
+                raise ValueError(f"Unknown aggregation: {aggregation}")
+
+
+@profiled
+def write_chunks(chunks, fmt, path, compression="none"):
+    """Write ``chunks`` to ``path`` in ``fmt`` and return the number of rows written."""
+    match fmt:
+        case "Parquet":
+            return _write_parquet(chunks, path, compression)
+        case "CSV":
+            return _write_csv(chunks, path, compression)
+        case "Excel":
+            return _write_excel(chunks, path)
+        case _:
+            raise ValueError(f"Unknown export format: {fmt}")
+
+
+def _write_parquet(chunks, path, compression):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=True)
+                writer = pq.ParquetWriter(
+                    path,
+                    table.schema,
+                    compression=None if compression == "none" else compression,
+                )
+            else:
+                table = pa.Table.from_pandas(
+                    chunk, schema=writer.schema, preserve_index=True
+                )
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_csv(chunks, path, compression):
+    opener = _CSV_OPENERS[compression][0] if compression in _CSV_OPENERS else open
+    rows = 0
+    with opener(path, "wt", newline="") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+def _write_excel(chunks, path):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    rows = 0
+    try:
+        for chunk in chunks:
+            if rows + len(chunk) > EXCEL_MAX_ROWS:
+                raise ValueError(
+                    f"Excel sheets hold at most {EXCEL_MAX_ROWS} rows, use Parquet or CSV."
+                )
+            if rows == 0:
+                index_names = [name or "index" for name in chunk.index.names]
+                sheet.append(index_names + [str(c) for c in chunk.columns])
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for index, *values in chunk.itertuples(name=None):
+                index = list(index) if isinstance(index, tuple) else [index]
+                sheet.append(index + values)
+            rows += len(chunk)
+    except BaseException:
+        # Finishes the sheet's pending writer instead of leaving it to the garbage collector
+        sheet.close()
+        raise
+    workbook.save(path)
+    return rows
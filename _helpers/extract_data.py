@@ -1,5 +1,13 @@
 import pypsa
 
+from _helpers.artifacts import precomputable
+from _helpers.profiling import profiled
+from _helpers.readonly import derived
+
+
+@profiled
+@precomputable
+@derived
 def extract_data(network: pypsa.Network):
     stats = network.statistics()
-    return stats
\ No newline at end of file
+    return stats
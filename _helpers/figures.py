@@ -0,0 +1,97 @@
+"""Plotly figures shared by the explorer views and the batch report."""
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from _helpers.profiling import profiled
+
+
+@profiled
+def bus_map(df):
+    fig = px.scatter_mapbox(
+        df.reset_index(),
+        lat="y",
+        lon="x",
+        hover_name=df.index,
+        zoom=3,
+        height=500,
+    )
+    fig.update_layout(mapbox_style="open-street-map")
+    return fig
+
+
+@profiled
+def capacity_pie(capacity):
+    return px.pie(
+        capacity.rename("p_nom").reset_index(),
+        values="p_nom",
+        names="carrier",
+        title="Installed Capacity by Generator Type",
+    )
+
+
+@profiled
+def timeseries_line(ts_df, title):
+    return px.line(
+        ts_df,
+        x=ts_df.index,
+        y=ts_df.columns,
+        title=title,
+    )
+
+
+@profiled
+def series_line(series, title):
+    return px.line(
+        x=series.index,
+        y=series.values,
+        title=title,
+    )
+
+
+@profiled
+def period_bars(totals, title):
+    return px.bar(
+        totals,
+        x=totals.index.astype(str),
+        y=totals.columns,
+        barmode="group",
+        title=title,
+        labels={"x": "Investment period"},
+    )
+
+
+@profiled
+def carrier_bars(table, title):
+    return px.bar(
+        table.rename_axis(index="carrier").reset_index(),
+        x="carrier",
+        y=list(table.columns),
+        barmode="group",
+        title=title,
+    )
+
+
+@profiled
+def region_bars(table, title):
+    return px.bar(
+        table,
+        x=table.index,
+        y=table.columns,
+        title=title,
+        labels={"x": "Region"},
+    )
+
+
+@profiled
+def heatmap(matrix, title):
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrix.to_numpy().T,
+            x=matrix.index,
+            y=matrix.columns,
+            colorscale="Viridis",
+        ),
+    )
+    fig.update_layout(title=title, yaxis_title="Hour of day", height=400)
+    return fig
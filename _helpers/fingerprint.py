@@ -0,0 +1,83 @@
+"""Cheap, stable fingerprints of networks for cache keys.
+
+A network loaded from a file is identified by the file's content hash, a
+sample network by its name, both registered by the loader. Any other
+network gets a structural fingerprint from the shapes, indexes, columns and
+a fixed sample of rows of its static and time-series tables. Fingerprints
+are remembered per network object, so a network is never hashed twice.
+"""
+
+import hashlib
+import json
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# Components whose tables make up the structural fingerprint
+FINGERPRINT_COMPONENTS = [
+    "buses",
+    "carriers",
+    "generators",
+    "loads",
+    "storage_units",
+    "stores",
+    "lines",
+    "links",
+    "transformers",
+    "shunt_impedances",
+    "global_constraints",
+]
+
+# Rows sampled from each table
+SAMPLE_ROWS = 64
+
+_fingerprints = weakref.WeakKeyDictionary()
+
+
+def register_fingerprint(network, fingerprint):
+    """Use ``fingerprint`` (e.g. ``file:<sha256>``) as the fingerprint of ``network``."""
+    _fingerprints[network] = fingerprint
+
+
+def fingerprint(network):
+    try:
+        cached = _fingerprints.get(network)
+    except TypeError:  # pypsa networks define __eq__ and are unhashable, only their read-only proxies are remembered
+        return structural_fingerprint(network)
+    if cached is None:
+        cached = _fingerprints[network] = structural_fingerprint(network)
+    return cached
+
+
+def _update(digest, df):
+    digest.update(repr(df.shape).encode())
+    digest.update("\x1f".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df.index, index=False).values.tobytes())
+    if df.empty:
+        return
+    positions = np.unique(
+        np.linspace(0, len(df) - 1, min(len(df), SAMPLE_ROWS)).astype(int)
+    )
+    sample = df.iloc[positions]
+    try:
+        digest.update(pd.util.hash_pandas_object(sample, index=False).values.tobytes())
+    except TypeError:  # unhashable cell values, e.g. lists
+        digest.update(repr(sample.values.tolist()).encode())
+
+
+def structural_fingerprint(network):
+    digest = hashlib.blake2b(digest_size=16)
+    _update(digest, network.snapshot_weightings)
+    _update(digest, network.investment_period_weightings)
+    for component in FINGERPRINT_COMPONENTS:
+        static = getattr(network, component, None)
+        if static is None:
+            continue
+        digest.update(component.encode())
+        _update(digest, static)
+        for attr, df in sorted(getattr(network, f"{component}_t", {}).items()):
+            digest.update(attr.encode())
+            _update(digest, df)
+    digest.update(json.dumps(network.meta, sort_keys=True, default=str).encode())
+    return f"struct:{digest.hexdigest()}"
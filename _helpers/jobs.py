@@ -0,0 +1,86 @@
+"""Background computation of expensive view results.
+
+``JobExecutor`` runs computations in a thread pool shared by all sessions.
+Jobs are identified by a key, so a computation that is already queued or
+running is never started twice, and are owned by the groups (one per session
+and view) that asked for them. When a view is rerun with a new selection,
+it releases the jobs it no longer asks for. A job no group owns any more is
+cancelled if it has not started yet and dropped with its result. Groups of
+sessions that went away are released once they were not seen for
+``GROUP_TTL`` seconds. Failed and cancelled jobs are run again when they are
+asked for again.
+
+Jobs run outside of the rerun that submitted them and are not profiled.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Seconds after which the jobs of a group that was not seen are released
+GROUP_TTL = 30 * 60
+
+
+def _failed(future):
+    return future.cancelled() or (future.done() and future.exception() is not None)
+
+
+class JobExecutor:
+    def __init__(self, max_workers=4, group_ttl=GROUP_TTL):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="explorer-job"
+        )
+        self.group_ttl = group_ttl
+        self._jobs = {}
+        self._owners = {}
+        self._groups = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, group, key, func, *args, **kwargs):
+        """Future of ``func(*args, **kwargs)``, reusing a queued, running or finished job with the same key."""
+        with self._lock:
+            self._expire()
+            future = self._jobs.get(key)
+            if future is None or _failed(future):
+                future = self._pool.submit(func, *args, **kwargs)
+                self._jobs[key] = future
+            self._owners.setdefault(key, set()).add(group)
+            self._groups.setdefault(group, set()).add(key)
+            self._seen[group] = time.monotonic()
+        return future
+
+    def cancel_stale(self, group, keep):
+        """Release the jobs of ``group`` whose keys are not in ``keep``."""
+        keep = set(keep)
+        with self._lock:
+            keys = self._groups.pop(group, set())
+            for key in keys - keep:
+                self._release(group, key)
+            if keys & keep:
+                self._groups[group] = keys & keep
+                self._seen[group] = time.monotonic()
+            else:
+                self._seen.pop(group, None)
+
+    def _release(self, group, key):
+        owners = self._owners.get(key, set())
+        owners.discard(group)
+        if not owners:
+            self._owners.pop(key, None)
+            future = self._jobs.pop(key, None)
+            if future is not None:
+                future.cancel()
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.group_ttl
+        for group in [g for g, seen in self._seen.items() if seen < cutoff]:
+            for key in self._groups.pop(group, set()):
+                self._release(group, key)
+            del self._seen[group]
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,313 @@
+"""Operational KPIs of a network per investment period and carrier.
+
+All time-dependent KPIs come out of one weighted pass over each time-series
+matrix: a (periods x snapshots) matrix of snapshot weightings collapses the
+snapshots of each matrix once, and a (columns x KPIs) matrix of per-column
+factors (marginal cost, emission intensity, ...) then turns the collapsed
+columns into every KPI that depends on them, per carrier.
+
+Energy is per year of each investment period, as weighted by the generator
+snapshot weightings. Operational costs are weighted by the objective snapshot
+weightings, as in the PyPSA objective, and storage cycles are counted per
+period. Discounted system costs apply the objective weightings of the
+investment periods.
+"""
+
+import numpy as np
+import pandas as pd
+
+from _helpers.artifacts import precomputable
+from _helpers.profiling import profiled
+from _helpers.readonly import derived
+
+KPI_COLUMNS = [
+    "Generation (MWh)",
+    "Curtailment (MWh)",
+    "Capacity factor",
+    "Emissions (tCO2)",
+    "Capital cost",
+    "Operational cost",
+    "Storage cycles",
+]
+
+# KPIs weighted by the objective snapshot weightings, the others by the generator ones
+OBJECTIVE_KPIS = {"operational_cost"}
+
+# Period label of networks without investment periods
+SINGLE_PERIOD = "all"
+
+# Components with capital costs -> nominal attribute
+CAPEX_COMPONENTS = {
+    "generators": "p_nom",
+    "storage_units": "p_nom",
+    "stores": "e_nom",
+    "links": "p_nom",
+    "lines": "s_nom",
+    "transformers": "s_nom",
+}
+
+
+def nominal(static, attr):
+    """Optimized capacity ``<attr>_opt`` of solved networks, else ``attr``."""
+    optimized = f"{attr}_opt"
+    if optimized in static.columns and static[optimized].abs().sum() > 0:
+        return static[optimized]
+    return static[attr]
+
+
+def _carriers(static):
+    if "carrier" not in static.columns:
+        return pd.Series("", index=static.index)
+    return static["carrier"].fillna("")
+
+
+def _active(static, period):
+    """Components of ``static`` in operation during ``period``."""
+    if period == SINGLE_PERIOD or "build_year" not in static.columns:
+        return pd.Series(True, index=static.index)
+    lifetime = static["lifetime"] if "lifetime" in static.columns else np.inf
+    return (static["build_year"] <= period) & (period < static["build_year"] + lifetime)
+
+
+def _timeseries(network, component, attr):
+    ts_df = getattr(network, f"{component}_t").get(attr)
+    if ts_df is None or ts_df.empty:
+        return None
+    return ts_df
+
+
+def _column_factors(columns, factor):
+    if isinstance(factor, pd.Series):
+        return factor.reindex(columns).fillna(0).to_numpy(dtype=float)
+    return np.full(len(columns), float(factor))
+
+
+def _flows(network, periods, period_weights, objective_weights):
+    """Weighted sums per period of every (KPI, carrier) flow, in one pass per matrix."""
+    blocks = []
+
+    def add(values, static, **factors):
+        """``values`` (snapshots x components) contribute ``factor * values`` to each KPI."""
+        if values is None:
+            return
+        values = values.reindex(columns=values.columns.intersection(static.index))
+        if values.columns.empty:
+            return
+        carriers = _carriers(static).reindex(values.columns)
+        blocks.append((values, carriers, factors))
+
+    generators = network.generators
+    carrier_table = network.carriers
+    p = _timeseries(network, "generators", "p")
+    if p is not None:
+        efficiency = generators["efficiency"] if "efficiency" in generators else 1.0
+        co2 = (
+            _carriers(generators)
+            .map(carrier_table.get("co2_emissions", pd.Series(dtype=float)))
+            .fillna(0)
+        )
+
+        # Time-varying marginal costs override the static ones
+        marginal_cost = generators["marginal_cost"]
+        marginal_cost_t = _timeseries(network, "generators", "marginal_cost")
+        if marginal_cost_t is not None:
+            marginal_cost = marginal_cost.where(
+                ~marginal_cost.index.isin(marginal_cost_t.columns), 0
+            )
+            columns = marginal_cost_t.columns.intersection(p.columns)
+            add(p[columns] * marginal_cost_t[columns], generators, operational_cost=1)
+
+        # Curtailment of generators with a variable availability
+        p_max_pu = _timeseries(network, "generators", "p_max_pu")
+        variable = pd.Series(0.0, index=generators.index)
+        if p_max_pu is not None:
+            columns = p_max_pu.columns.intersection(p.columns)
+            variable[columns] = 1.0
+            add(
+                p_max_pu[columns] * nominal(generators, "p_nom")[columns],
+                generators,
+                curtailment=1,
+            )
+
+        add(
+            p,
+            generators,
+            generation=1,
+            curtailment=-variable,
+            emissions=co2 / efficiency,
+            operational_cost=marginal_cost,
+        )
+
+    storage_units = network.storage_units
+    add(
+        _timeseries(network, "storage_units", "p_dispatch"),
+        storage_units,
+        storage_discharge=1,
+        operational_cost=storage_units.get("marginal_cost", 0),
+    )
+    stores_p = _timeseries(network, "stores", "p")
+    add(
+        None if stores_p is None else stores_p.clip(lower=0),
+        network.stores,
+        storage_discharge=1,
+    )
+
+    links = network.links
+    add(
+        _timeseries(network, "links", "p0"),
+        links,
+        operational_cost=links.get("marginal_cost", 0),
+    )
+
+    # Both weightings are stacked so each matrix is still collapsed in one pass
+    weights = np.vstack([period_weights, objective_weights])
+    flows = []
+    for values, carriers, factors in blocks:
+        # The only pass over the time series; all KPIs reuse the collapsed matrix
+        collapsed = weights @ values.fillna(0).to_numpy(dtype=float)
+        energy, objective = collapsed[: len(periods)], collapsed[len(periods) :]
+        for kpi, factor in factors.items():
+            weighted = objective if kpi in OBJECTIVE_KPIS else energy
+            weighted = weighted * _column_factors(values.columns, factor)
+            flows.append(
+                pd.DataFrame(
+                    weighted,
+                    columns=pd.MultiIndex.from_arrays(
+                        [[kpi] * len(carriers), carriers]
+                    ),
+                ),
+            )
+    if not flows:
+        return pd.DataFrame(index=periods)
+    flows = pd.concat(flows, axis=1).T.groupby(level=[0, 1]).sum().T
+    flows.index = periods
+    return flows
+
+
+def _capacities(network, periods):
+    """Per period and carrier: generator capacity, storage energy capacity and capital cost."""
+    rows = []
+    for period in periods:
+        row = {}
+        generators = network.generators
+        active = _active(generators, period)
+        row["capacity"] = (
+            nominal(generators, "p_nom")[active]
+            .groupby(_carriers(generators)[active])
+            .sum()
+        )
+
+        storage_units = network.storage_units
+        active = _active(storage_units, period)
+        energy = nominal(storage_units, "p_nom") * storage_units.get("max_hours", 0)
+        stores = network.stores
+        active_stores = _active(stores, period)
+        row["energy_capacity"] = (
+            pd.concat(
+                [
+                    energy[active].groupby(_carriers(storage_units)[active]).sum(),
+                    nominal(stores, "e_nom")[active_stores]
+                    .groupby(_carriers(stores)[active_stores])
+                    .sum(),
+                ],
+            )
+            .groupby(level=0)
+            .sum()
+        )
+
+        capex = []
+        for component, attr in CAPEX_COMPONENTS.items():
+            static = getattr(network, component)
+            if static.empty or "capital_cost" not in static.columns:
+                continue
+            active = _active(static, period)
+            cost = static["capital_cost"] * nominal(static, attr)
+            capex.append(cost[active].groupby(_carriers(static)[active]).sum())
+        row["capital_cost"] = (
+            pd.concat(capex).groupby(level=0).sum() if capex else pd.Series(dtype=float)
+        )
+        rows.append(row)
+    return rows
+
+
+def _period_weights(network, weighting="generators"):
+    """Periods and the (periods x snapshots) matrix of the ``weighting`` snapshot weightings."""
+    snapshots = network.snapshots
+    if isinstance(snapshots, pd.MultiIndex):
+        codes, periods = pd.factorize(snapshots.get_level_values(0))
+    else:
+        codes, periods = np.zeros(len(snapshots), dtype=int), pd.Index([SINGLE_PERIOD])
+    weights = (
+        network.snapshot_weightings[weighting].reindex(snapshots).fillna(0).to_numpy()
+    )
+    matrix = np.zeros((len(periods), len(snapshots)))
+    matrix[codes, np.arange(len(snapshots))] = weights
+    return periods, matrix
+
+
+@profiled
+@precomputable
+@derived
+def system_kpis(network):
+    """KPIs (``KPI_COLUMNS``) per investment period and carrier."""
+    periods, period_weights = _period_weights(network)
+    _, objective_weights = _period_weights(network, "objective")
+    hours = pd.Series(period_weights.sum(axis=1), index=periods)
+    flows = _flows(network, periods, period_weights, objective_weights)
+
+    def flow(kpi, period):
+        if kpi not in flows.columns.get_level_values(0):
+            return pd.Series(dtype=float)
+        return flows.loc[period, kpi]
+
+    frames = []
+    for period, capacities in zip(periods, _capacities(network, periods)):
+        generation = flow("generation", period)
+        frame = pd.DataFrame(
+            {
+                "Generation (MWh)": generation,
+                "Curtailment (MWh)": flow("curtailment", period),
+                "Capacity factor": generation
+                / (capacities["capacity"] * hours[period]).replace(0, np.nan),
+                "Emissions (tCO2)": flow("emissions", period),
+                "Capital cost": capacities["capital_cost"],
+                "Operational cost": flow("operational_cost", period),
+                "Storage cycles": flow("storage_discharge", period)
+                / capacities["energy_capacity"].replace(0, np.nan),
+            },
+            columns=KPI_COLUMNS,
+        )
+        frames.append(frame.rename_axis("carrier"))
+
+    kpis = pd.concat(frames, keys=periods, names=["period", "carrier"])
+    return kpis.dropna(how="all")
+
+
+@derived
+def period_summary(network):
+    """Totals of ``system_kpis`` per period, with the system cost and its discounted value."""
+    kpis = system_kpis(network)
+    summary = kpis.groupby(level="period", sort=False)[
+        [
+            "Generation (MWh)",
+            "Curtailment (MWh)",
+            "Emissions (tCO2)",
+            "Capital cost",
+            "Operational cost",
+        ]
+    ].sum()
+    summary["System cost"] = summary["Capital cost"] + summary["Operational cost"]
+
+    weightings = network.investment_period_weightings
+    objective = (
+        weightings["objective"]
+        if "objective" in weightings.columns
+        else pd.Series(dtype=float)
+    )
+    summary["Objective weighting"] = (
+        objective.reindex(summary.index).fillna(1.0).to_numpy()
+    )
+    summary["Discounted system cost"] = (
+        summary["System cost"] * summary["Objective weighting"]
+    )
+    return summary
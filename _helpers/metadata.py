@@ -0,0 +1,121 @@
+"""Flattened, searchable and comparable views of a network's ``meta`` tree.
+
+The nested ``meta`` dictionary (e.g. the full PyPSA-Eur config of a run) is
+flattened once per network into a table with one row per node, keyed by its
+dotted key path (``electricity.extendable_carriers.Generator[0]``). Browsing,
+searching and diffing all work on that table instead of walking or dumping
+the tree on every rerun.
+"""
+
+import json
+
+import pandas as pd
+
+from _helpers.profiling import profiled
+from _helpers.readonly import derived
+
+FLAT_COLUMNS = ["parent", "key", "depth", "type", "value", "children"]
+
+
+def _format(value):
+    try:
+        return json.dumps(value, default=str)
+    except ValueError:  # e.g. circular references
+        return repr(value)
+
+
+def _walk(node, path, parent, key, depth):
+    match node:
+        case dict():
+            items = [
+                (str(k), f"{path}.{k}" if path else str(k), v) for k, v in node.items()
+            ]
+        case list() | tuple():
+            items = [(f"[{i}]", f"{path}[{i}]", v) for i, v in enumerate(node)]
+        case _:
+            yield path, parent, key, depth, type(node).__name__, _format(node), 0
+            return
+    if depth >= 0:
+        yield (
+            path,
+            parent,
+            key,
+            depth,
+            type(node).__name__,
+            f"{len(items)} items",
+            len(items),
+        )
+    for child_key, child_path, child in items:
+        yield from _walk(child, child_path, path, child_key, depth + 1)
+
+
+def flatten_meta(meta):
+    """One row per node of ``meta``, indexed by key path; leaves have no ``children``."""
+    rows = list(_walk(meta or {}, "", None, None, -1))
+    flat = pd.DataFrame.from_records(rows, columns=["path", *FLAT_COLUMNS])
+    return flat.set_index("path")
+
+
+@profiled
+@derived
+def flat_meta(network):
+    return flatten_meta(network.meta)
+
+
+@derived
+def meta_yaml(network):
+    """``meta`` serialized as YAML, e.g. for download."""
+    import yaml
+
+    return yaml.dump(network.meta, default_flow_style=False)
+
+
+def meta_children(flat, path=""):
+    """Direct children of the node at ``path`` (the root for ``""``)."""
+    return flat.loc[flat["parent"] == path]
+
+
+def search_meta(flat, text, limit=500):
+    """Nodes whose key path or leaf value contains ``text`` (case-insensitive), at most ``limit``."""
+    # The value of a section is only its "<n> items" summary
+    leaves = flat["children"] == 0
+    matches = flat.index.str.contains(text, case=False, regex=False) | (
+        leaves & flat["value"].str.contains(text, case=False, regex=False)
+    )
+    return flat.loc[matches].head(limit)
+
+
+@profiled
+def meta_diff(left, right):
+    """Leaves that differ between two flattened ``meta`` trees, with their ``status``.
+
+    A key that is a leaf in one tree and a section in the other is one changed
+    row, showing the section's summary, rather than its leaves being added.
+    """
+    shared = left.index.intersection(right.index)
+    reshaped = shared[
+        (left.loc[shared, "children"] == 0) != (right.loc[shared, "children"] == 0)
+    ]
+    prefixes = tuple(f"{path}{sep}" for path in reshaped for sep in ".[")
+
+    def values(flat):
+        keep = (flat["children"] == 0) | flat.index.isin(reshaped)
+        if prefixes:
+            keep &= ~flat.index.str.startswith(prefixes)
+        return flat.loc[keep, "value"]
+
+    diff = pd.concat({"left": values(left), "right": values(right)}, axis=1)
+    diff = diff.loc[diff["left"].ne(diff["right"])]
+    diff["status"] = "changed"
+    diff.loc[diff["left"].isna(), "status"] = "added"
+    diff.loc[diff["right"].isna(), "status"] = "removed"
+    return diff.sort_index()
+
+
+def read_meta(path):
+    """``meta`` of a NetCDF network file, read from its header without loading any data."""
+    import netCDF4
+
+    with netCDF4.Dataset(path) as dataset:
+        meta = dataset.getncattr("meta") if "meta" in dataset.ncattrs() else "{}"
+    return json.loads(meta)
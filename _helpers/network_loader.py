@@ -1,7 +1,208 @@
-import pypsa
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
 import streamlit as st
 
+from _helpers.artifacts import attach
+from _helpers.profiling import profiled, span
+
+# pypsa and the helpers built on pandas are imported on first use to keep the
+# landing page fast
+
+SAMPLE_NETWORKS = ["ac_dc_meshed", "scigrid_de", "storage_hvdc"]
+
+# Saved uploads not used for this many seconds are removed, and the least
+# recently used ones once all of them take up more than this many bytes
+UPLOAD_MAX_AGE = 24 * 3600
+UPLOAD_MAX_BYTES = 4 * 1024**3
+
+
+@profiled
+def read_sample_network(name):
+    import pypsa
+
+    from _helpers.fingerprint import register_fingerprint
+    from _helpers.readonly import read_only
+
+    match name:
+        case "ac_dc_meshed":
+            network = read_only(pypsa.examples.ac_dc_meshed())
+        case "scigrid_de":
+            network = read_only(pypsa.examples.scigrid_de())
+        case "storage_hvdc":
+            network = read_only(pypsa.examples.storage_hvdc())
+        case _:
+            raise ValueError(f"Unknown sample network: {name}")
+
+    register_fingerprint(network, f"sample:{name}:{pypsa.__version__}")
+    return network
+
+
+def upload_path(content_hash):
+    """File an upload is saved to, one per content so each upload keeps its own sidecar."""
+    folder = Path(tempfile.gettempdir()) / "pypsa_explorer_uploads"
+    folder.mkdir(exist_ok=True)
+    return folder / f"{content_hash}.nc"
+
+
+def _sweep_uploads(folder, incoming=0):
+    """Remove saved uploads (and their sidecars) by age and size, least recently used first."""
+    uploads = []
+    for path in folder.glob("*.nc"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        uploads.append((stat.st_mtime, stat.st_size, path))
+    cutoff = time.time() - UPLOAD_MAX_AGE
+    total = incoming + sum(size for _, size, _ in uploads)
+    for mtime, size, path in sorted(uploads):
+        if mtime >= cutoff and total <= UPLOAD_MAX_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        shutil.rmtree(path.with_name(f"{path.name}.explorer"), ignore_errors=True)
+        total -= size
+
+
+def save_upload(uploaded_file, path):
+    """Save an upload to ``path`` once; sessions uploading the same content at once write the same bytes.
+
+    Saving an upload again marks it as recently used, and restores it if it
+    was swept in the meantime.
+    """
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+    data = uploaded_file.getbuffer()
+    _sweep_uploads(Path(path).parent, len(data))
+    fd, partial = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".partial")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(partial, path)
+    return path
+
+
+@profiled
+def read_uploaded_network(uploaded_file, path, content_hash=None):
+    import pypsa
+
+    from _helpers.fingerprint import register_fingerprint
+    from _helpers.readonly import read_only
+
+    save_upload(uploaded_file, path)
+
+    # Load the network from the saved file
+    network = read_only(pypsa.Network(path))
+    if content_hash is not None:
+        register_fingerprint(network, f"file:{content_hash}")
+    return network
+
+
+def upload_hash(uploaded_file):
+    """Content hash of an upload, computed once per uploaded file."""
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    if uploaded_file.file_id not in hashes:
+        hashes[uploaded_file.file_id] = hashlib.sha256(
+            uploaded_file.getbuffer()
+        ).hexdigest()
+    return hashes[uploaded_file.file_id]
+
+
+def session_uploaded_network(uploaded_file, path):
+    """Uploaded network, parsed once per session and content hash."""
+    content_hash = upload_hash(uploaded_file)
+    cached = st.session_state.get("uploaded_network")
+    if cached is None or cached[0] != content_hash:
+        cached = (
+            content_hash,
+            read_uploaded_network(uploaded_file, path, content_hash),
+        )
+        st.session_state["uploaded_network"] = cached
+    return cached[1]
+
+
+@st.cache_resource(show_spinner="Loading sample network...")
+def shared_sample_network(name):
+    """Sample network shared read-only by all sessions of the app process."""
+    return read_sample_network(name)
+
+
+@st.cache_resource(show_spinner="Loading network...", max_entries=8)
+def shared_uploaded_network(content_hash, _uploaded_file, path):
+    """Uploaded network shared read-only by all sessions uploading the same file."""
+    return read_uploaded_network(_uploaded_file, path, content_hash)
 
+
+def show_precompute_button(network, path):
+    """Serve summaries from the network's sidecar and offer to (re)write it."""
+    from _helpers.sidecar import attach_sidecar, write_sidecar
+
+    if attach_sidecar(network, path) is not None:
+        st.sidebar.caption("Using precomputed summaries.")
+    if st.sidebar.button("Precompute summaries"):
+        with st.sidebar, st.spinner("Precomputing summaries..."):
+            sidecar = write_sidecar(network, path)
+            attach(network, sidecar)
+        st.sidebar.success("Summaries precomputed.")
+        if sidecar.manifest["skipped"]:
+            st.sidebar.warning(
+                f"Not precomputed: {', '.join(sidecar.manifest['skipped'])}."
+            )
+
+
+@st.cache_resource(show_spinner="Loading network...", max_entries=8)
+def shared_local_network(path, fmt, signature):
+    """Network read from the server's disk, shared read-only by all sessions until the file changes."""
+    from _helpers.network_sources import read_local_network
+
+    return read_local_network(path, fmt)
+
+
+def select_local_network():
+    """Network picked from the networks found in a directory on the server, and its path."""
+    import os
+
+    from _helpers.network_sources import (
+        DATA_DIR_VARIABLE,
+        allowed,
+        data_dir,
+        directory_index,
+        signature,
+    )
+
+    directory = st.sidebar.text_input(
+        "Results directory:",
+        value=str(data_dir()),
+        help=f"Restricted to ${DATA_DIR_VARIABLE}, or to the app's working directory if it is not set.",
+    )
+    if not directory:
+        return None, None
+    if not os.path.isdir(directory) or not allowed(directory):
+        st.sidebar.error(f"{directory} is not an accessible directory.")
+        return None, None
+
+    index = directory_index(directory)
+    if index.empty:
+        st.sidebar.info(
+            "No networks (.nc, .h5, CSV folders or .zip) found in this directory."
+        )
+        return None, None
+    with st.sidebar.expander(f"{len(index)} networks found"):
+        st.dataframe(index)
+    selected = st.sidebar.selectbox("Select network", index.index)
+
+    path = os.path.join(directory, selected)
+    fmt = index.at[selected, "format"]
+    return shared_local_network(path, fmt, signature(path)), path
+
+
+@profiled
 def load_network(file_input_method, uploaded_file=None, file_path=None):
     network = None
 
@@ -11,43 +212,107 @@ def load_network(file_input_method, uploaded_file=None, file_path=None):
                 "Upload a PyPSA network file (.nc)",
                 type=["nc"],
             )
+            shared = st.sidebar.checkbox(
+                "Share with other sessions",
+                help="Keep one read-only copy of this network for every session that uploads the same file.",
+            )
             if uploaded_file:
                 try:
-                    # Save the uploaded file temporarily
-                    with open("temp_network.nc", "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-
-                    # Load the network from the saved file
-                    network = pypsa.Network("temp_network.nc")
+                    content_hash = upload_hash(uploaded_file)
+                    path = str(upload_path(content_hash))
+                    if shared:
+                        network = shared_uploaded_network(
+                            content_hash, uploaded_file, path
+                        )
+                    else:
+                        network = session_uploaded_network(uploaded_file, path)
                     st.sidebar.success("Network loaded successfully!")
                 except Exception as e:
                     st.sidebar.error(f"Error loading network: {e}")
+                else:
+                    # Keeps the saved file from being swept while the session uses it
+                    save_upload(uploaded_file, path)
+                    show_precompute_button(network, path)
 
         case "Load sample network":
-            options = ["ac_dc_meshed", "scigrid_de", "storage_hvdc"]
             # Let user select which sample network to load
-            selected_example = st.sidebar.selectbox("Select sample network", options)
+            selected_example = st.sidebar.selectbox(
+                "Select sample network", SAMPLE_NETWORKS
+            )
 
             try:
-                match selected_example:
-                    case "ac_dc_meshed":
-                        network = pypsa.examples.ac_dc_meshed()
-                    case "scigrid_de":
-                        # breakpoint()
-                        network = pypsa.examples.scigrid_de()
-                    case "storage_hvdc":
-                        network = pypsa.examples.storage_hvdc()
-                    case _:
-                        st.sidebar.error(f"Unknown sample network: {selected_example}")
-                        return None
+                network = shared_sample_network(selected_example)
+            except ValueError as e:
+                st.sidebar.error(str(e))
+                return None
             except Exception as e:
                 st.sidebar.error(f"Error loading sample network: {e}")
 
+        case "Browse local directory":
+            try:
+                network, path = select_local_network()
+            except Exception as e:
+                st.sidebar.error(f"Error loading network: {e}")
+                return None
+            if network is not None:
+                st.sidebar.success("Network loaded successfully!")
+                # Sidecars are kept next to NetCDF files in the data directory only
+                from _helpers.network_sources import allowed
+
+                if path.endswith(".nc") and allowed(path):
+                    show_precompute_button(network, path)
+
         case _:
             st.sidebar.error(f"Unknown file input method: {file_input_method}")
 
-    if network is not None:
-        network.generators["x"] = network.generators.bus.map(network.buses.x)
-        network.generators["y"] = network.generators.bus.map(network.buses.y)
-
     return network
+
+
+@profiled
+def load_comparison():
+    """Load two or more networks for comparison.
+
+    Networks are reduced to ``NetworkVariant`` extracts which are kept in the
+    session, so each source is only read once and the full networks are not
+    held in memory.
+    """
+    from _helpers.comparison import NetworkVariant
+
+    samples = st.sidebar.multiselect("Select sample networks", SAMPLE_NETWORKS)
+    uploaded_files = st.sidebar.file_uploader(
+        "Upload PyPSA network files (.nc)",
+        type=["nc"],
+        accept_multiple_files=True,
+    )
+
+    cache = st.session_state.setdefault("comparison_variants", {})
+    sources = {f"sample:{name}": name for name in samples}
+    # Uploads are keyed by content, two files with the same name and size can differ
+    sources.update({f"upload:{upload_hash(f)}": f for f in uploaded_files or []})
+
+    variants = []
+    for key, source in sources.items():
+        if key not in cache:
+            label = source if isinstance(source, str) else source.name
+            try:
+                if isinstance(source, str):
+                    network = shared_sample_network(source)
+                    name = source
+                else:
+                    content_hash = key.removeprefix("upload:")
+                    network = read_uploaded_network(
+                        source, str(upload_path(content_hash)), content_hash
+                    )
+                    name = source.name.removesuffix(".nc")
+                with span("comparison.NetworkVariant"):
+                    cache[key] = NetworkVariant(name, network)
+            except Exception as e:
+                st.sidebar.error(f"Error loading {label}: {e}")
+                continue
+        variants.append(cache[key])
+
+    # Drop variants that are no longer selected
+    for key in set(cache) - set(sources):
+        del cache[key]
+
+    return variants
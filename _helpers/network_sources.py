@@ -0,0 +1,279 @@
+"""Networks stored on the server: NetCDF and HDF5 files, CSV folders and zip archives of them.
+
+Networks are found by scanning a results directory and described by header
+metadata (size, snapshot and component counts) read without loading them.
+Headers are cached per file and modification time, so a directory listing
+only reads the headers of new or changed networks.
+
+Browsing is restricted to the data directory, ``$PYPSA_EXPLORER_DATA_DIR`` or
+else the working directory of the app. Entries resolving outside of it,
+e.g. through symlinks, are not listed.
+"""
+
+import csv
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from _helpers.profiling import profiled
+
+# Environment variable of the directory local networks are restricted to
+DATA_DIR_VARIABLE = "PYPSA_EXPLORER_DATA_DIR"
+
+NETWORK_SUFFIXES = {".nc": "netcdf", ".h5": "hdf5", ".hdf5": "hdf5", ".zip": "zip"}
+
+HEADER_COMPONENTS = [
+    "buses",
+    "generators",
+    "loads",
+    "lines",
+    "links",
+    "storage_units",
+    "stores",
+]
+
+SCAN_DEPTH = 2
+
+# Largest uncompressed size of a zip archive that is extracted
+MAX_EXTRACT_BYTES = 4 * 2**30
+
+_headers = {}
+
+_extract_lock = threading.Lock()
+
+
+def data_dir():
+    """Directory local networks are restricted to, the working directory unless configured."""
+    directory = os.environ.get(DATA_DIR_VARIABLE)
+    return Path(directory or os.getcwd()).resolve()
+
+
+def allowed(path, root=None):
+    """Whether ``path``, with symlinks resolved, lies in ``root``, by default the data directory."""
+    try:
+        return Path(path).resolve().is_relative_to(root or data_dir())
+    except OSError:  # e.g. symlink loops
+        return False
+
+
+def _is_csv_folder(names):
+    return "buses.csv" in names or "network.csv" in names
+
+
+def detect_format(path):
+    """``netcdf``, ``hdf5``, ``csv`` (folder) or ``zip``, or ``None`` for anything else."""
+    path = Path(path)
+    if path.is_dir():
+        return "csv" if _is_csv_folder({p.name for p in path.iterdir()}) else None
+    return NETWORK_SUFFIXES.get(path.suffix.lower())
+
+
+def signature(path):
+    """Size and modification time of a file, or of the files of a folder."""
+    path = Path(path)
+    files = [path] if path.is_file() else [p for p in path.iterdir() if p.is_file()]
+    stats = [f.stat() for f in files]
+    return sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0)
+
+
+def scan_directory(directory, depth=SCAN_DEPTH, root=None):
+    """Paths and formats of the networks in ``directory`` and its subfolders up to ``depth``.
+
+    Entries outside ``root`` (by default the data directory) and unreadable entries are skipped.
+    """
+    root = root or data_dir()
+    try:
+        entries = sorted(Path(directory).iterdir())
+    except OSError:
+        return []
+    found = []
+    for entry in entries:
+        if not allowed(entry, root):
+            continue
+        try:
+            fmt = detect_format(entry)
+            if fmt is not None:
+                found.append((entry, fmt))
+            elif entry.is_dir() and depth > 0:
+                found.extend(scan_directory(entry, depth - 1, root))
+        except OSError:
+            continue
+    return found
+
+
+def _count_rows(lines):
+    # Quoted values may span lines, so rows are counted by the CSV parser
+    return max(sum(1 for _ in csv.reader(lines)) - 1, 0)
+
+
+def _netcdf_header(path):
+    import netCDF4
+
+    with netCDF4.Dataset(path) as dataset:
+        dims = {name: len(dim) for name, dim in dataset.dimensions.items()}
+    header = {"snapshots": dims.get("snapshots")}
+    header.update({c: dims.get(f"{c}_i", 0) for c in HEADER_COMPONENTS})
+    return header
+
+
+def _hdf5_header(path):
+    with pd.HDFStore(path, mode="r") as store:
+        keys = {key.strip("/") for key in store.keys()}
+
+        def rows(key):
+            if key not in keys:
+                return 0
+            storer = store.get_storer(key)
+            return getattr(storer, "nrows", None) or len(store[key])
+
+        header = {"snapshots": rows("snapshots")}
+        header.update({c: rows(c) for c in HEADER_COMPONENTS})
+    return header
+
+
+def _csv_header(open_file, names):
+    header = {}
+    for name in ["snapshots", *HEADER_COMPONENTS]:
+        if f"{name}.csv" not in names:
+            header[name] = 0
+            continue
+        with open_file(f"{name}.csv") as f:
+            header[name] = _count_rows(f)
+    return header
+
+
+def _zip_header(path):
+    with zipfile.ZipFile(path) as archive:
+        infos = [i for i in archive.infolist() if not i.is_dir()]
+        by_name = {
+            Path(i.filename).name: i for i in infos if Path(i.filename).suffix == ".csv"
+        }
+        if _is_csv_folder(by_name):
+
+            def open_member(name):
+                return io.TextIOWrapper(archive.open(by_name[name]), encoding="utf-8")
+
+            return _csv_header(open_member, by_name)
+    # Zipped NetCDF and HDF5 files only show their headers once extracted
+    return {}
+
+
+@profiled
+def network_header(path, fmt):
+    """Header metadata of the network at ``path``, read without loading it; cached per modification."""
+    size, mtime = signature(path)
+    key = (str(Path(path).resolve()), size, mtime)
+    if key not in _headers:
+        try:
+            match fmt:
+                case "netcdf":
+                    header = _netcdf_header(path)
+                case "hdf5":
+                    header = _hdf5_header(path)
+                case "csv":
+                    names = {p.name for p in Path(path).iterdir()}
+                    header = _csv_header(
+                        lambda name: open(Path(path) / name, newline=""), names
+                    )
+                case "zip":
+                    header = _zip_header(path)
+                case _:
+                    header = {}
+        except Exception:  # unreadable headers still list the network
+            header = {}
+        _headers[key] = {"format": fmt, "size (MB)": size / 1e6, **header}
+    return _headers[key]
+
+
+def directory_index(directory):
+    """Table of the networks in ``directory`` with their header metadata, indexed by relative path."""
+    directory = Path(directory)
+    rows = {}
+    for path, fmt in scan_directory(directory):
+        try:
+            rows[str(path.relative_to(directory))] = network_header(path, fmt)
+        except OSError:  # e.g. files of a CSV folder that cannot be read
+            continue
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("network")
+
+
+def _extract(path):
+    """Folder holding the contents of the archive at ``path``, extracted once per archive version.
+
+    Archives larger than ``MAX_EXTRACT_BYTES`` once extracted are refused, and
+    the extractions of older versions of the archive are removed.
+    """
+    size, mtime = signature(path)
+    name = hashlib.sha256(str(Path(path).resolve()).encode()).hexdigest()[:16]
+    version = hashlib.sha256(f"{size}:{mtime}".encode()).hexdigest()[:8]
+    extractions = Path(tempfile.gettempdir()) / "pypsa_explorer_archives"
+    target = extractions / f"{name}_{version}"
+    with _extract_lock:
+        if target.is_dir():
+            return target
+        extractions.mkdir(exist_ok=True)
+        with zipfile.ZipFile(path) as archive:
+            extracted = sum(info.file_size for info in archive.infolist())
+            if extracted > MAX_EXTRACT_BYTES:
+                raise ValueError(
+                    f"The archive holds {extracted / 1e9:.1f} GB, more than the {MAX_EXTRACT_BYTES / 1e9:.1f} GB "
+                    "extracted at most.",
+                )
+            partial = Path(
+                tempfile.mkdtemp(dir=extractions, prefix=f"{name}_", suffix=".partial")
+            )
+            try:
+                archive.extractall(partial)
+                os.rename(partial, target)
+            except OSError:
+                # Another process extracted the same version in the meantime
+                shutil.rmtree(partial, ignore_errors=True)
+                if not target.is_dir():
+                    raise
+            except BaseException:
+                shutil.rmtree(partial, ignore_errors=True)
+                raise
+        for old in extractions.glob(f"{name}_*"):
+            if old != target and not old.name.endswith(".partial"):
+                shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def _network_in(folder):
+    """Network path in an extracted archive: the archive root, a CSV folder or a single file."""
+    folder = folder.resolve()
+    candidates = (
+        [(folder, detect_format(folder))]
+        if detect_format(folder)
+        else scan_directory(folder, root=folder)
+    )
+    candidates = [(p, fmt) for p, fmt in candidates if fmt != "zip"]
+    if len(candidates) != 1:
+        raise ValueError(
+            f"Expected one network in the archive, found {len(candidates)}."
+        )
+    return candidates[0][0]
+
+
+@profiled
+def read_local_network(path, fmt):
+    """Read-only network at ``path``, fingerprinted by its path, size and modification time."""
+    import pypsa
+
+    from _helpers.fingerprint import register_fingerprint
+    from _helpers.readonly import read_only
+
+    if not allowed(path):
+        raise ValueError(f"{path} is outside of the data directory.")
+    source = _network_in(_extract(path)) if fmt == "zip" else path
+    network = read_only(pypsa.Network(str(source)))
+    size, mtime = signature(path)
+    register_fingerprint(network, f"local:{Path(path).resolve()}:{size}:{mtime}")
+    return network
@@ -0,0 +1,261 @@
+"""Per-rerun timing of the explorer's stages.
+
+A ``Trace`` collects nested spans (wall time, peak traced memory and payload
+size of the returned object) for one run of the app script. Stages are
+marked with the ``profiled`` decorator or the ``span`` context manager,
+which cost a single lookup when no trace is active.
+
+Memory is only traced when the server runs with ``PYPSA_EXPLORER_TRACE_MEMORY=1``.
+``tracemalloc`` then runs for the whole process and slows down every session,
+wall times included. Peaks are process-wide, so only one trace at a time
+records them, and they include allocations of other threads.
+
+Computations run in the background job threads (``_helpers.jobs``) are not
+traced, as the threads do not see the trace of the rerun that submitted them.
+
+Finished traces can be exported as OpenTelemetry-style span records, one
+JSON object per line; set ``PYPSA_EXPLORER_TRACE_FILE`` to append every
+trace to that file.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+TRACE_FILE_ENV = "PYPSA_EXPLORER_TRACE_FILE"
+TRACE_MEMORY_ENV = "PYPSA_EXPLORER_TRACE_MEMORY"
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+# Trace recording memory peaks, tracemalloc has a single peak per process
+_memory_owner = None
+_memory_lock = threading.Lock()
+
+
+def memory_tracking():
+    """Whether memory is traced, a process-wide opt-in since tracing slows down every session."""
+    return os.environ.get(TRACE_MEMORY_ENV, "") not in ("", "0")
+
+
+def _claim_memory(trace):
+    global _memory_owner
+    with _memory_lock:
+        if _memory_owner is not None:
+            return False
+        if not tracemalloc.is_tracing():
+            # Started once and left running, stopping it would break other traces
+            tracemalloc.start()
+        _memory_owner = trace
+        return True
+
+
+def _release_memory(trace):
+    global _memory_owner
+    with _memory_lock:
+        if _memory_owner is trace:
+            _memory_owner = None
+
+
+class Span:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.span_id = secrets.token_hex(8)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.child_ns = 0
+        self.peak_bytes = None
+        self.payload_bytes = None
+        self._start_mem = 0
+        self._peak_seen = 0
+
+    @property
+    def wall_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    @property
+    def self_ms(self):
+        return (self.end_ns - self.start_ns - self.child_ns) / 1e6
+
+
+class Trace:
+    def __init__(self, name="rerun", track_memory=None):
+        self.trace_id = secrets.token_hex(16)
+        self.track_memory = memory_tracking() if track_memory is None else track_memory
+        self.spans = []
+        self._stack = []
+        self.root = None
+        self.name = name
+
+    def start(self):
+        # A previous run of the script may have been interrupted mid-trace
+        finish_active_trace()
+        # Traces overlapping the one recording memory only record times
+        self.track_memory = self.track_memory and _claim_memory(self)
+        _current_trace.set(self)
+        self.root = self.open(self.name)
+        return self
+
+    def finish(self):
+        while self._stack:
+            self.close(self._stack[-1])
+        if _current_trace.get() is self:
+            _current_trace.set(None)
+        _release_memory(self)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.finish()
+        return False
+
+    def open(self, name):
+        parent = self._stack[-1] if self._stack else None
+        span = Span(name, parent)
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._peak_seen = max(parent._peak_seen, peak)
+            tracemalloc.reset_peak()
+            span._start_mem = span._peak_seen = current
+        self.spans.append(span)
+        self._stack.append(span)
+        return span
+
+    def close(self, span, result=None):
+        span.end_ns = time.time_ns()
+        if self.track_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            span._peak_seen = max(span._peak_seen, peak)
+            span.peak_bytes = span._peak_seen - span._start_mem
+            if span.parent is not None:
+                span.parent._peak_seen = max(span.parent._peak_seen, span._peak_seen)
+        span.payload_bytes = payload_size(result)
+        if span.parent is not None:
+            span.parent.child_ns += span.end_ns - span.start_ns
+        self._stack.remove(span)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "Stage": ["  " * s.depth + s.name for s in self.spans],
+                "Wall [ms]": [s.wall_ms for s in self.spans],
+                "Self [ms]": [s.self_ms for s in self.spans],
+                "Peak memory [MB]": [_mb(s.peak_bytes) for s in self.spans],
+                "Payload [MB]": [_mb(s.payload_bytes) for s in self.spans],
+            },
+        )
+
+    def to_records(self):
+        """OpenTelemetry-style span records."""
+        records = []
+        for s in self.spans:
+            attributes = {"explorer.self_ms": s.self_ms}
+            if s.peak_bytes is not None:
+                attributes["explorer.memory.peak_bytes"] = s.peak_bytes
+            if s.payload_bytes is not None:
+                attributes["explorer.payload_bytes"] = s.payload_bytes
+            records.append(
+                {
+                    "name": s.name,
+                    "trace_id": self.trace_id,
+                    "span_id": s.span_id,
+                    "parent_span_id": s.parent.span_id
+                    if s.parent is not None
+                    else None,
+                    "start_time_unix_nano": s.start_ns,
+                    "end_time_unix_nano": s.end_ns,
+                    "attributes": attributes,
+                },
+            )
+        return records
+
+    def to_json(self):
+        return "\n".join(json.dumps(r) for r in self.to_records())
+
+    def export(self, path=None):
+        """Append the trace to ``path`` or the file named by ``PYPSA_EXPLORER_TRACE_FILE``."""
+        path = path or os.environ.get(TRACE_FILE_ENV)
+        if path:
+            with open(path, "a") as f:
+                f.write(self.to_json() + "\n")
+
+
+def finish_active_trace():
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.finish()
+
+
+def _mb(size):
+    return None if size is None else size / 1e6
+
+
+def payload_size(obj):
+    """Approximate size in bytes of frames, series, arrays and plotly figures."""
+    # Objects can only be frames or arrays once pandas or numpy were imported
+    pd = sys.modules.get("pandas")
+    np = sys.modules.get("numpy")
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    if np is None:
+        return None
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    data = getattr(obj, "data", None)
+    if isinstance(data, tuple) and hasattr(obj, "to_plotly_json"):
+        size = 0
+        for trace in data:
+            for key in ("x", "y", "z", "lat", "lon", "values"):
+                value = getattr(trace, key, None)
+                if value is not None:
+                    size += np.asarray(value).nbytes
+        return size
+    return None
+
+
+@contextmanager
+def span(name):
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    s = trace.open(name)
+    try:
+        yield s
+    finally:
+        trace.close(s)
+
+
+def profiled(func=None, *, name=None):
+    """Record each call of ``func`` as a span of the active trace."""
+    if func is None:
+        return functools.partial(profiled, name=name)
+    stage = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = _current_trace.get()
+        if trace is None:
+            return func(*args, **kwargs)
+        s = trace.open(stage)
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            trace.close(s, result)
+
+    return wrapper
@@ -0,0 +1,323 @@
+"""Sandboxed query engine over the static and time-series tables of a network."""
+
+import ast
+import re
+import threading
+import time
+from typing import NamedTuple
+
+import pandas as pd
+
+from _helpers.fingerprint import fingerprint
+from _helpers.profiling import profiled
+
+try:
+    import duckdb
+except ImportError:  # SQL queries are only offered when duckdb is importable
+    duckdb = None
+
+# Component tables exposed to the query console
+QUERY_COMPONENTS = [
+    "buses",
+    "carriers",
+    "generators",
+    "loads",
+    "storage_units",
+    "stores",
+    "lines",
+    "links",
+    "transformers",
+]
+
+DEFAULT_ROW_LIMIT = 10_000
+MAX_ROW_LIMIT = 100_000
+DEFAULT_TIMEOUT = 10.0
+
+# Rows a pandas query expression is evaluated on at a time
+QUERY_CHUNK_ROWS = 50_000
+
+_SQL_STATEMENT = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+
+# Methods a query expression may call on a column, and on its ``.str`` accessor
+COLUMN_METHODS = {
+    "isin",
+    "between",
+    "isna",
+    "notna",
+    "abs",
+    "min",
+    "max",
+    "mean",
+    "median",
+    "sum",
+}
+STR_METHODS = {"contains", "startswith", "endswith"}
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.Invert,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.List,
+    ast.Tuple,
+)
+
+# Backtick-quoted column names, e.g. `p_nom opt`
+_QUOTED_NAME = re.compile(r"`[^`]*`")
+
+
+class QueryResult(NamedTuple):
+    frame: pd.DataFrame
+    elapsed: float
+    truncated: bool
+    cached: bool
+
+
+class QueryError(Exception):
+    pass
+
+
+def _check_literal(node):
+    """Method arguments are constants or lists of constants."""
+    match node:
+        case ast.Constant():
+            return
+        case ast.UnaryOp(op=ast.USub() | ast.UAdd(), operand=ast.Constant()):
+            return
+        case ast.List(elts=elts) | ast.Tuple(elts=elts):
+            for elt in elts:
+                _check_literal(elt)
+        case _:
+            raise QueryError("Method arguments must be constants.")
+
+
+def _check_call(node):
+    match node.func:
+        case ast.Attribute(value=ast.Name(), attr=method) if method in COLUMN_METHODS:
+            pass
+        case ast.Attribute(
+            value=ast.Attribute(value=ast.Name(), attr="str"), attr=method
+        ) if method in STR_METHODS:
+            pass
+        case _:
+            allowed = ", ".join(
+                [*sorted(COLUMN_METHODS), *(f"str.{m}" for m in sorted(STR_METHODS))]
+            )
+            raise QueryError(f"Only these column methods can be called: {allowed}.")
+    for arg in node.args:
+        _check_literal(arg)
+    for keyword in node.keywords:
+        if keyword.arg is None:
+            raise QueryError("Method arguments must be constants.")
+        _check_literal(keyword.value)
+
+
+def _check_node(node):
+    if isinstance(node, ast.Call):
+        _check_call(node)
+        # The method and its receiver are checked, only the column name remains
+        receiver = node.func.value
+        _check_node(receiver.value if isinstance(receiver, ast.Attribute) else receiver)
+        return
+    if isinstance(node, ast.Name) and node.id.startswith("__"):
+        raise QueryError("Dunder names are not allowed.")
+    if not isinstance(node, _ALLOWED_NODES):
+        raise QueryError(f"{type(node).__name__} is not allowed in query expressions.")
+    for child in ast.iter_child_nodes(node):
+        _check_node(child)
+
+
+def check_expression(expression):
+    """Raise ``QueryError`` unless ``expression`` only compares columns and constants.
+
+    Besides comparisons, boolean and arithmetic operators, only the methods in
+    ``COLUMN_METHODS`` and ``STR_METHODS`` may be called on columns, with
+    constant arguments. Any other call or attribute access, e.g. ``to_csv``,
+    is rejected before pandas evaluates the expression.
+    """
+    if "@" in expression:
+        raise QueryError("Variable references ('@') are not allowed.")
+    try:
+        tree = ast.parse(_QUOTED_NAME.sub("_quoted", expression), mode="eval")
+    except SyntaxError as e:
+        raise QueryError(f"Invalid query expression: {e.msg}")
+    _check_node(tree)
+
+
+class QueryEngine:
+    """Run pandas ``query`` expressions or SQL against the tables of one network.
+
+    Static tables are exposed as ``<component>`` (e.g. ``generators``) with the
+    component name in a ``name`` column, time-series tables as
+    ``<component>_t_<attr>`` (e.g. ``generators_t_p``) with a ``snapshot``
+    column. Tables are prepared lazily and results are cached per query text.
+    """
+
+    def __init__(self, network, max_cached_results=32):
+        self.network = network
+        self.fingerprint = fingerprint(network)
+        self.max_cached_results = max_cached_results
+        self._frames = {}
+        self._results = {}
+        self._connection = None
+        self._registered = set()
+
+    @property
+    def tables(self):
+        names = []
+        for component in QUERY_COMPONENTS:
+            if len(getattr(self.network, component)):
+                names.append(component)
+            dynamic = getattr(self.network, f"{component}_t", {})
+            for attr, df in dynamic.items():
+                if not df.empty:
+                    names.append(f"{component}_t_{attr}")
+        return names
+
+    def frame(self, table):
+        if table not in self._frames:
+            if table not in self.tables:
+                raise QueryError(f"Unknown table: {table}")
+            if "_t_" in table:
+                component, attr = table.split("_t_", 1)
+                df = getattr(self.network, f"{component}_t")[attr]
+                index_name = "snapshot"
+            else:
+                df = getattr(self.network, table)
+                index_name = "name"
+            # Multi-period snapshots keep their (period, timestep) level names
+            if not isinstance(df.index, pd.MultiIndex):
+                df = df.rename_axis(index=index_name)
+            df = df.rename_axis(columns=None).reset_index()
+            df.columns = [str(c) for c in df.columns]
+            self._frames[table] = df
+        return self._frames[table]
+
+    @profiled
+    def query(
+        self, table, expression, limit=DEFAULT_ROW_LIMIT, timeout=DEFAULT_TIMEOUT
+    ):
+        """Filter ``table`` with a pandas ``query`` expression.
+
+        Expressions are checked by ``check_expression`` and evaluated without
+        access to Python locals or globals, so only the table's columns are in
+        scope. They are evaluated on blocks of ``QUERY_CHUNK_ROWS`` rows,
+        stopping once ``limit`` rows matched or ``timeout`` seconds passed, so
+        aggregates like ``p_nom.mean()`` refer to the rows of a block.
+        """
+        check_expression(expression)
+        limit = min(int(limit), MAX_ROW_LIMIT)
+
+        def run():
+            df = self.frame(table)
+            deadline = time.perf_counter() + timeout
+            parts = []
+            matched = 0
+            for start in range(0, max(len(df), 1), QUERY_CHUNK_ROWS):
+                if time.perf_counter() > deadline:
+                    raise QueryError(f"Query cancelled after {timeout:g} s.")
+                part = df.iloc[start : start + QUERY_CHUNK_ROWS].query(
+                    expression, local_dict={}, global_dict={}
+                )
+                parts.append(part)
+                matched += len(part)
+                if matched > limit:
+                    break
+            return pd.concat(parts)
+
+        return self._cached(("query", table, expression, limit), run, limit)
+
+    @profiled
+    def sql(self, statement, limit=DEFAULT_ROW_LIMIT, timeout=DEFAULT_TIMEOUT):
+        """Run a single read-only SQL ``SELECT`` through DuckDB.
+
+        The query is interrupted after ``timeout`` seconds and file or network
+        access from SQL is disabled.
+        """
+        if duckdb is None:
+            raise QueryError("SQL queries require the duckdb package.")
+        limit = min(int(limit), MAX_ROW_LIMIT)
+        statement = statement.strip().rstrip(";")
+        if not _SQL_STATEMENT.match(statement) or ";" in statement:
+            raise QueryError(
+                "Only a single SELECT (or WITH ... SELECT) statement is allowed."
+            )
+
+        def run():
+            con = self._duckdb(statement)
+            timer = threading.Timer(timeout, con.interrupt)
+            timer.start()
+            try:
+                return con.execute(
+                    f"SELECT * FROM ({statement}) AS q LIMIT {int(limit) + 1}",
+                ).df()
+            except duckdb.InterruptException:
+                raise QueryError(f"Query cancelled after {timeout:g} s.")
+            except duckdb.Error as e:
+                raise QueryError(str(e))
+            finally:
+                timer.cancel()
+
+        return self._cached(("sql", statement, limit), run, limit)
+
+    def _duckdb(self, statement):
+        if self._connection is None:
+            self._connection = duckdb.connect(":memory:")
+            self._connection.execute("SET enable_external_access = false")
+            self._connection.execute("SET lock_configuration = true")
+        # Only register tables the statement refers to, DuckDB scans the
+        # pandas columns in place so no copy is made on registration
+        words = set(re.findall(r"\w+", statement.lower()))
+        for table in self.tables:
+            if table.lower() in words and table not in self._registered:
+                self._connection.register(table, self.frame(table))
+                self._registered.add(table)
+        return self._connection
+
+    def _cached(self, key, compute, limit):
+        if key in self._results:
+            frame, elapsed, truncated = self._results[key]
+            return QueryResult(frame, elapsed, truncated, cached=True)
+
+        start = time.perf_counter()
+        try:
+            frame = compute()
+        except QueryError:
+            raise
+        except Exception as e:
+            raise QueryError(str(e))
+        elapsed = time.perf_counter() - start
+
+        truncated = len(frame) > limit
+        frame = frame.head(limit)
+        if len(self._results) >= self.max_cached_results:
+            self._results.pop(next(iter(self._results)))
+        self._results[key] = (frame, elapsed, truncated)
+        return QueryResult(frame, elapsed, truncated, cached=False)
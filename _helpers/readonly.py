@@ -0,0 +1,174 @@
+"""Read-only access to loaded networks.
+
+``ReadOnlyNetwork`` wraps a network and refuses attribute assignment and the
+network's methods that change it in place. Its component and time-series
+tables are handed out as shallow copies, and with pandas copy-on-write
+enabled any change made to those copies (new columns, ``.loc`` assignments,
+...) stays local to the caller instead of reaching the wrapped network.
+Copy-on-write is a process-wide pandas option and is switched on by the app
+(``pypsa_explorer.py``), not by this module. Other mutable attributes, like
+``meta``, are handed out as deep copies.
+
+Frames derived from a network (coordinates, carrier legends, aggregations,
+...) are computed by functions decorated with ``derived``, which memoizes
+them for read-only networks, since those cannot change underneath. The
+memo is process-wide and keyed by the network's fingerprint, so networks
+with the same content share their derived frames.
+"""
+
+import copy
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import pandas as pd
+
+from _helpers.fingerprint import fingerprint
+
+# Network methods that change the network in place
+MUTATING_METHODS = {
+    "add",
+    "madd",
+    "remove",
+    "mremove",
+    "merge",
+    "rename_component_names",
+    "set_snapshots",
+    "set_investment_periods",
+    "calculate_dependent_values",
+    "determine_network_topology",
+    "read_in_default_standard_types",
+    "to_crs",
+    "pf",
+    "lpf",
+    "lpf_contingency",
+    "optimize",
+    "cluster",
+    "import_components_from_dataframe",
+    "import_series_from_dataframe",
+    "import_from_csv_folder",
+    "import_from_hdf5",
+    "import_from_netcdf",
+    "import_from_pandapower_net",
+    "import_from_pypower_ppc",
+}
+
+# Network methods returning the network's own tables
+TABLE_METHODS = {"static", "df", "dynamic", "pnl"}
+
+
+def _shallow(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _protect(value):
+    if isinstance(value, dict) and all(
+        isinstance(v, pd.DataFrame) for v in value.values()
+    ):
+        return ReadOnlyTimeSeries(value)
+    if isinstance(value, (dict, list, set)):
+        return copy.deepcopy(value)
+    return _shallow(value)
+
+
+class ReadOnlyTimeSeries(Mapping):
+    """Read-only version of a network's ``<component>_t`` dictionary."""
+
+    def __init__(self, data):
+        object.__setattr__(self, "_data", data)
+
+    def __getitem__(self, key):
+        return _shallow(self._data[key])
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Shared networks are read-only.")
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ReadOnlyNetwork:
+    """Proxy of a network that can be shared between sessions without defensive copies."""
+
+    def __init__(self, network):
+        object.__setattr__(self, "_network", network)
+
+    def __getattr__(self, name):
+        if name in MUTATING_METHODS:
+            raise AttributeError(
+                f"Shared networks are read-only, {name} is not available."
+            )
+        value = getattr(self._network, name)
+        if name in TABLE_METHODS:
+            return functools.wraps(value)(
+                lambda *args, **kwargs: _protect(value(*args, **kwargs))
+            )
+        if name.endswith("_t") and isinstance(value, dict):
+            return ReadOnlyTimeSeries(value)
+        if isinstance(value, (dict, list, set)):
+            return copy.deepcopy(value)
+        return _shallow(value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Shared networks are read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Shared networks are read-only.")
+
+    def __repr__(self):
+        return f"ReadOnlyNetwork({self._network!r})"
+
+
+def read_only(network):
+    return network if isinstance(network, ReadOnlyNetwork) else ReadOnlyNetwork(network)
+
+
+DERIVED_CACHE_SIZE = 256
+
+_derived_cache = OrderedDict()
+_derived_lock = threading.Lock()
+_missing = object()
+
+
+def derived(func):
+    """Memoize ``func(network, ...)`` for read-only networks and return shallow copies."""
+
+    @functools.wraps(func)
+    def wrapper(network, *args, **kwargs):
+        if not isinstance(network, ReadOnlyNetwork):
+            return func(network, *args, **kwargs)
+
+        key = (
+            fingerprint(network),
+            func.__module__,
+            func.__qualname__,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        with _derived_lock:
+            value = _derived_cache.get(key, _missing)
+            if value is not _missing:
+                _derived_cache.move_to_end(key)
+        if value is _missing:
+            value = func(network, *args, **kwargs)
+            with _derived_lock:
+                _derived_cache[key] = value
+                while len(_derived_cache) > DERIVED_CACHE_SIZE:
+                    _derived_cache.popitem(last=False)
+        return _shallow(value)
+
+    return wrapper
@@ -0,0 +1,202 @@
+"""Rollups of network components to regions, i.e. arbitrary groups of buses.
+
+A ``RegionMapping`` assigns buses to regions, from a bus column (e.g.
+``country``), a CSV table or the polygons of a GeoJSON file. For each network
+and mapping a sparse (regions x components) incidence matrix is built once,
+after which capacities and time series of any component are rolled up to
+regions with one sparse matrix product.
+"""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from _helpers.compute import map_data, period_slice, timeseries
+from _helpers.profiling import profiled
+from _helpers.readonly import derived
+
+# Component -> capacity attribute rolled up by ``regional_capacity``
+CAPACITY_ATTRS = {
+    "generators": "p_nom",
+    "storage_units": "p_nom",
+    "stores": "e_nom",
+}
+
+
+class RegionMapping:
+    """Regions (values) of buses (index), identified by ``key`` in cache keys."""
+
+    def __init__(self, key, regions):
+        self.key = key
+        self.regions = regions
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, RegionMapping) and self.key == other.key
+
+    def __repr__(self):
+        return f"RegionMapping({self.key!r})"
+
+
+def from_bus_column(network, column):
+    return RegionMapping(("column", column), network.buses[column].replace("", np.nan))
+
+
+def from_csv(data, content_hash):
+    """Mapping from a CSV table with buses in its first and regions in its second column.
+
+    Repeated rows are dropped, buses assigned to more than one region are rejected.
+    """
+    df = pd.read_csv(io.BytesIO(data), dtype=str)
+    if len(df.columns) < 2:
+        raise ValueError("The region table needs a bus and a region column.")
+    df = df.iloc[:, :2].drop_duplicates()
+    conflicting = df.iloc[:, 0][df.iloc[:, 0].duplicated()].unique()
+    if len(conflicting):
+        listed = ", ".join(map(str, conflicting[:5])) + (
+            ", ..." if len(conflicting) > 5 else ""
+        )
+        raise ValueError(
+            f"Buses assigned to more than one region in the region table: {listed}"
+        )
+    return RegionMapping(
+        ("csv", content_hash), df.set_index(df.columns[0])[df.columns[1]]
+    )
+
+
+def geojson_properties(data):
+    """Property names of the features of a GeoJSON document."""
+    features = json.loads(data).get("features", [])
+    return list(features[0].get("properties") or {}) if features else []
+
+
+@profiled
+def from_geojson(buses, data, prop, content_hash):
+    """Mapping of buses to the ``prop`` of the GeoJSON polygon containing their coordinates."""
+    import shapely
+    from shapely.geometry import shape
+
+    features = [f for f in json.loads(data).get("features", []) if f.get("geometry")]
+    tree = shapely.STRtree([shape(f["geometry"]) for f in features])
+    names = np.array(
+        [(f.get("properties") or {}).get(prop) for f in features], dtype=object
+    )
+
+    points = shapely.points(
+        buses["x"].to_numpy(dtype=float), buses["y"].to_numpy(dtype=float)
+    )
+    point_idx, feature_idx = tree.query(points, predicate="within")
+    # Buses in overlapping polygons go to the first one
+    point_idx, first = np.unique(point_idx, return_index=True)
+    regions = pd.Series(np.nan, index=buses.index, dtype=object)
+    regions.iloc[point_idx] = names[feature_idx[first]]
+    return RegionMapping(("geojson", content_hash, prop), regions)
+
+
+@derived
+def region_codes(network, mapping):
+    """Region code of every bus (-1 if unmapped) and the region labels."""
+    codes, labels = pd.factorize(
+        mapping.regions.reindex(network.buses.index), sort=True
+    )
+    return codes, pd.Index(labels, name="region")
+
+
+@derived
+def incidence(network, mapping, component="buses"):
+    """Sparse (regions x components) incidence matrix of buses or a single-bus component, or ``None``."""
+    from scipy import sparse
+
+    codes, labels = region_codes(network, mapping)
+    static = getattr(network, component)
+    if component != "buses":
+        if "bus" not in static.columns:
+            return None
+        positions = network.buses.index.get_indexer(static["bus"])
+        codes = np.where(positions >= 0, codes[positions], -1)
+    columns = np.flatnonzero(codes >= 0)
+    return sparse.csr_matrix(
+        (np.ones(len(columns)), (codes[columns], columns)),
+        shape=(len(labels), len(static)),
+    )
+
+
+@profiled
+@derived
+def regional_capacity(network, mapping, component="generators"):
+    """Capacity (``CAPACITY_ATTRS``) per region (rows) and carrier (columns), or ``None``."""
+    from scipy import sparse
+
+    matrix = incidence(network, mapping, component)
+    static = getattr(network, component)
+    attr = CAPACITY_ATTRS.get(component)
+    if matrix is None or attr not in static.columns:
+        return None
+    carriers = (
+        static["carrier"].fillna("")
+        if "carrier" in static.columns
+        else pd.Series("total", index=static.index)
+    )
+    carrier_codes, carrier_labels = pd.factorize(carriers, sort=True)
+    values = sparse.csr_matrix(
+        (
+            static[attr].fillna(0).to_numpy(dtype=float),
+            (np.arange(len(static)), carrier_codes),
+        ),
+        shape=(len(static), len(carrier_labels)),
+    )
+    capacity = pd.DataFrame(
+        (matrix @ values).toarray(),
+        index=region_codes(network, mapping)[1],
+        columns=pd.Index(carrier_labels, name="carrier"),
+    )
+    return capacity.loc[capacity.sum(axis=1) > 0]
+
+
+@profiled
+@derived
+def regional_timeseries(network, mapping, component, attr, period=None, how="sum"):
+    """``attr`` of ``component`` summed (or for ``how="mean"`` averaged) per region, or ``None``."""
+    ts_df = timeseries(network, component, attr)
+    matrix = incidence(network, mapping, component)
+    if ts_df is None or matrix is None:
+        return None
+    ts_df = period_slice(network, ts_df, period)
+
+    # Time series usually cover only some of the components
+    positions = getattr(network, component).index.get_indexer(ts_df.columns)
+    valid = positions >= 0
+    matrix = matrix[:, positions[valid]]
+    counts = np.asarray(matrix.sum(axis=1)).ravel()
+
+    rolled = (matrix @ ts_df.iloc[:, valid].fillna(0).to_numpy().T).T
+    if how == "mean":
+        rolled = rolled / np.where(counts > 0, counts, 1)
+    regional = pd.DataFrame(
+        rolled, index=ts_df.index, columns=region_codes(network, mapping)[1]
+    )
+    return regional.loc[:, counts > 0]
+
+
+@derived
+def region_map_data(network, mapping):
+    """Regions at the mean coordinates of their buses, sized by generator capacity, for the map."""
+    buses = network.buses
+    if "x" not in buses.columns or "y" not in buses.columns:
+        return None
+    matrix = incidence(network, mapping)
+    counts = np.asarray(matrix.sum(axis=1)).ravel()
+    coordinates = matrix @ buses[["x", "y"]].fillna(0).to_numpy(dtype=float)
+    regions = pd.DataFrame(
+        coordinates / np.where(counts > 0, counts, 1)[:, None],
+        index=region_codes(network, mapping)[1],
+        columns=["x", "y"],
+    )
+    capacity = regional_capacity(network, mapping)
+    if capacity is not None:
+        regions["p_nom"] = capacity.sum(axis=1).reindex(regions.index).fillna(0)
+    return map_data(regions.loc[counts > 0])
@@ -0,0 +1,260 @@
+"""Persistent store of scenario statistics in one long-format table.
+
+Each scenario folder holds ``statistics/statistics*.csv`` files written by
+the workflow, wide tables of (component, carrier) rows and (variable,
+horizon) columns. The store keeps all scenarios as one table of
+``scenario, table, horizon, component, carrier, variable, value`` rows,
+where ``table`` is the file name without extension, indexed and sorted on
+its key columns. It is saved as Parquet next to a manifest of the size and
+modification time of every ingested file, and ``refresh`` only re-reads the
+scenarios whose files changed.
+
+The app and the command line scripts find the scenarios of a comparison
+YAML or a directory the same way (``scenario_sources``): scenarios keep
+their configured names, paths in a YAML are relative to the YAML, and the
+store is ``.scenario_store`` next to it, so they share one store.
+
+    uv run python -m _helpers.scenario_store scenarios.yaml --store results/store
+"""
+
+import argparse
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from _helpers.profiling import profiled
+
+KEY_COLUMNS = ["scenario", "table", "horizon", "component", "carrier", "variable"]
+
+STATISTICS_FILES = "statistics/statistics*.csv"
+
+# Table of the ``statistics/statistics.csv`` files, the one selected by default
+STATISTICS_TABLE = "statistics"
+
+STORE_DIRECTORY = ".scenario_store"
+
+
+def long_format(scenario, statistics, table=STATISTICS_TABLE):
+    """Rows of a wide ``statistics`` table of ``scenario``."""
+    values = statistics.stack(
+        list(range(statistics.columns.nlevels)), future_stack=True
+    ).dropna()
+    values.index = values.index.set_names(
+        ["component", "carrier", "variable", "horizon"]
+    )
+    rows = values.rename("value").reset_index()
+    rows.insert(0, "scenario", scenario)
+    rows.insert(1, "table", table)
+    return rows
+
+
+def _signature(path):
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def statistics_files(path):
+    """Statistics files of the scenario folder ``path``, by table name."""
+    return {
+        file.stem: file
+        for file in sorted(Path(path).glob(STATISTICS_FILES))
+        if file.is_file()
+    }
+
+
+def scenario_folders(directory):
+    """Scenarios (``{"name", "path"}``) of the folders in ``directory`` holding statistics."""
+    return [
+        {"name": folder.name, "path": str(folder)}
+        for folder in sorted(Path(directory).iterdir())
+        if folder.is_dir() and statistics_files(folder)
+    ]
+
+
+def config_scenarios(config, base):
+    """Scenarios of a scenario comparison ``config``, with their paths relative to ``base``."""
+    return [
+        {"name": s["name"], "path": str(Path(base) / s["path"])}
+        for s in config["scenarios"]
+    ]
+
+
+def scenario_sources(path):
+    """Scenarios and store directory of a scenario comparison YAML or a directory of scenario folders."""
+    import yaml
+
+    path = Path(path).expanduser()
+    if path.is_dir():
+        return scenario_folders(path), path / STORE_DIRECTORY
+    config = yaml.safe_load(path.read_text())
+    return config_scenarios(config, path.parent), path.parent / STORE_DIRECTORY
+
+
+class ScenarioStore:
+    """Long-format scenario statistics kept in ``directory``."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._manifest = {}
+        self._table = pd.DataFrame(columns=[*KEY_COLUMNS, "value"]).set_index(
+            KEY_COLUMNS
+        )
+        self._load()
+
+    @property
+    def table(self):
+        return self._table
+
+    @property
+    def scenarios(self):
+        return list(self._manifest)
+
+    def _load(self):
+        manifest = self.directory / "manifest.json"
+        table = self.directory / "statistics.parquet"
+        if not manifest.is_file() or not table.is_file():
+            return
+        table = pd.read_parquet(table)
+        # Stores written with other key columns are rebuilt by the next refresh
+        if list(table.index.names) != KEY_COLUMNS:
+            return
+        self._manifest = json.loads(manifest.read_text())
+        self._table = table
+
+    def _save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._table.to_parquet(self.directory / "statistics.parquet")
+        (self.directory / "manifest.json").write_text(
+            json.dumps(self._manifest, indent=2)
+        )
+
+    @profiled
+    def refresh(self, scenarios):
+        """Ingest new or changed ``scenarios`` (``{"name", "path"}``), drop the others; return the ingested names."""
+        with self._lock:
+            manifest = {}
+            changed = {}
+            for scenario in scenarios:
+                files = statistics_files(scenario["path"])
+                if not files:
+                    continue
+                entry = {
+                    name: {"file": str(path.resolve()), "signature": _signature(path)}
+                    for name, path in files.items()
+                }
+                manifest[scenario["name"]] = entry
+                if self._manifest.get(scenario["name"]) != entry:
+                    changed[scenario["name"]] = files
+
+            if not changed and manifest.keys() == self._manifest.keys():
+                return []
+
+            table = self._table
+            keep = [s for s in manifest if s not in changed]
+            table = table.loc[table.index.get_level_values("scenario").isin(keep)]
+            new = [
+                long_format(
+                    name, pd.read_csv(path, index_col=[0, 1], header=[0, 1]), stem
+                )
+                for name, files in changed.items()
+                for stem, path in files.items()
+            ]
+            if new:
+                new = (
+                    pd.concat(new, ignore_index=True)
+                    .astype({"horizon": str})
+                    .set_index(KEY_COLUMNS)
+                )
+                table = pd.concat([table, new]) if len(table) else new
+            self._table = table.sort_index()
+            self._manifest = manifest
+            self._save()
+            return list(changed)
+
+    def select(
+        self,
+        variable=None,
+        horizon=None,
+        scenarios=None,
+        components=None,
+        table=STATISTICS_TABLE,
+    ):
+        """Values of the given key values (``None`` for all), indexed by the key columns.
+
+        ``scenarios`` and ``components`` are lists, labels missing from the store are
+        ignored. Only the ``statistics.csv`` rows are selected unless ``table`` is given.
+        """
+        index = self._table.index
+        mask = np.ones(len(index), dtype=bool)
+        for level, values in [
+            ("table", None if table is None else [table]),
+            ("scenario", scenarios),
+            ("horizon", None if horizon is None else [horizon]),
+            ("component", components),
+            ("variable", None if variable is None else [variable]),
+        ]:
+            if values is not None:
+                mask &= index.get_level_values(level).isin(list(values))
+        return self._table["value"].loc[mask]
+
+    def statistics(self, scenario, table=STATISTICS_TABLE):
+        """Wide table of ``scenario`` as in its statistics file, (component, carrier) by (variable, horizon)."""
+        values = self.select(scenarios=[scenario], table=table).droplevel(
+            ["scenario", "table"]
+        )
+        return values.unstack(["variable", "horizon"]).rename_axis(
+            index=[None, None], columns=[None, None]
+        )
+
+    def tables(self, scenario):
+        return list(
+            self.select(scenarios=[scenario], table=None)
+            .index.get_level_values("table")
+            .unique()
+        )
+
+    def horizons(self, variable=None):
+        values = (
+            self.select(variable=variable)
+            if variable is not None
+            else self._table["value"]
+        )
+        return list(values.index.get_level_values("horizon").unique())
+
+    def variables(self):
+        return list(self._table.index.get_level_values("variable").unique())
+
+    def wide(self, variable, horizon, scenarios=None, components=None):
+        """Carriers (rows) by scenario (columns) of ``variable`` in ``horizon``."""
+        values = self.select(variable, horizon, scenarios, components)
+        table = values.groupby(level=["carrier", "scenario"]).sum().unstack("scenario")
+        if scenarios is not None:
+            table = table.reindex(columns=[s for s in scenarios if s in table.columns])
+        return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Ingest scenario statistics into a scenario store."
+    )
+    parser.add_argument(
+        "config", help="Scenario comparison YAML, or a directory of scenario folders."
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help=f"Store directory (default: {STORE_DIRECTORY} next to config).",
+    )
+    args = parser.parse_args()
+
+    scenarios, store_dir = scenario_sources(args.config)
+    store_dir = args.store or store_dir
+    store = ScenarioStore(store_dir)
+    ingested = store.refresh(scenarios)
+    print(
+        f"{len(ingested)} of {len(store.scenarios)} scenarios ingested into {store_dir}"
+    )
@@ -0,0 +1,224 @@
+"""Precomputed artifacts stored in a sidecar directory next to a network file.
+
+``network.nc`` gets a ``network.nc.explorer/`` directory holding a
+``manifest.json`` and one uncompressed Arrow IPC file per artifact. The
+manifest records the sidecar format, a hash of the code computing the
+artifacts and the content hash of the network file, so a sidecar is ignored
+as soon as any of them change.
+A network loaded from an upload is matched by the content hash it was
+registered with, not by whatever file is on disk when the sidecar is read.
+Artifacts are memory-mapped on first access.
+
+The network itself is still parsed in full when it is opened, the sidecar
+only saves recomputing the summaries.
+
+    uv run python -m _helpers.sidecar path/to/network.nc [...]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from importlib.metadata import version
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from _helpers.artifacts import PRECOMPUTABLE, artifact_key, attach
+from _helpers.compute import (
+    RESAMPLE_RULES,
+    capacity_by_carrier,
+    carrier_dispatch,
+    component_counts,
+    component_map_data,
+)
+from _helpers.extract_data import extract_data
+from _helpers.fingerprint import fingerprint
+from _helpers.kpis import system_kpis
+
+SIDECAR_FORMAT = 1
+
+
+def _code_version():
+    """Hash of the modules defining the precomputable functions and of the PyPSA version.
+
+    The app is not installed as a package, so its version never changes; the
+    source of the modules does whenever an artifact may be computed differently.
+    """
+    digest = hashlib.sha256(version("pypsa").encode())
+    for source in sorted(
+        {inspect.getsourcefile(inspect.unwrap(f)) for f in PRECOMPUTABLE.values()}
+    ):
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+APP_VERSION = _code_version()
+
+# (function, args) of every artifact written by ``write_sidecar``
+SIDECAR_ARTIFACTS = [
+    (component_counts, ()),
+    (capacity_by_carrier, ()),
+    (extract_data, ()),
+    (system_kpis, ()),
+    *[(carrier_dispatch, ("p", rule)) for rule in RESAMPLE_RULES.values()],
+    (component_map_data, ("Buses",)),
+    (component_map_data, ("Generators",)),
+]
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sidecar_path(path):
+    return Path(f"{path}.explorer")
+
+
+def registered_hash(network):
+    """Content hash ``network`` was registered with when loaded from a file, or ``None``."""
+    kind, _, content_hash = fingerprint(network).partition(":")
+    return content_hash if kind == "file" else None
+
+
+def _file_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class Sidecar:
+    def __init__(self, directory, manifest):
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self._loaded = {}
+
+    def get(self, key):
+        entry = self.manifest["artifacts"].get(key)
+        if entry is None:
+            return None
+        if key not in self._loaded:
+            table = feather.read_table(self.directory / entry["file"], memory_map=True)
+            df = table.to_pandas(split_blocks=True)
+            self._loaded[key] = df.iloc[:, 0] if entry["kind"] == "series" else df
+        return self._loaded[key]
+
+
+def write_sidecar(network, path):
+    """Compute all sidecar artifacts of ``network``, which was loaded from ``path``.
+
+    Artifacts that cannot be computed for this network (e.g. statistics of an
+    unsolved network) are left out and listed in the manifest's ``skipped``.
+    """
+    directory = sidecar_path(path)
+    tmp = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    artifacts = {}
+    skipped = {}
+    for i, (func, args) in enumerate(SIDECAR_ARTIFACTS):
+        key = artifact_key(func, *args)
+        # Bypass any attached (possibly stale) store
+        try:
+            result = PRECOMPUTABLE[func.__name__](network, *args)
+            if result is None:
+                continue
+            kind = "series" if isinstance(result, pd.Series) else "frame"
+            df = result.to_frame() if kind == "series" else result
+            filename = f"{i:02d}_{func.__name__}.arrow"
+            feather.write_feather(df, tmp / filename, compression="uncompressed")
+        except (
+            KeyError,
+            ValueError,
+            TypeError,
+            AttributeError,
+            pa.ArrowException,
+        ) as e:
+            skipped[key] = f"{type(e).__name__}: {e}"
+            continue
+        artifacts[key] = {"file": filename, "kind": kind}
+
+    manifest = {
+        "format": SIDECAR_FORMAT,
+        "app_version": APP_VERSION,
+        "content_hash": registered_hash(network) or file_hash(path),
+        **_file_stat(path),
+        "artifacts": artifacts,
+        "skipped": skipped,
+    }
+    with open(tmp / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    tmp.rename(directory)
+    return Sidecar(directory, manifest)
+
+
+def read_sidecar(path, content_hash=None):
+    """Return the valid sidecar of the network file at ``path``, or ``None``.
+
+    With ``content_hash`` the sidecar must have been written for that content,
+    otherwise for the file currently at ``path``.
+    """
+    directory = sidecar_path(path)
+    try:
+        with open(directory / "manifest.json") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        manifest.get("format") != SIDECAR_FORMAT
+        or manifest.get("app_version") != APP_VERSION
+    ):
+        return None
+    if content_hash is not None:
+        return (
+            Sidecar(directory, manifest)
+            if manifest.get("content_hash") == content_hash
+            else None
+        )
+    # Only rehash the network file when it was touched since the sidecar was written
+    stat = _file_stat(path)
+    if any(manifest.get(k) != v for k, v in stat.items()):
+        if manifest.get("content_hash") != file_hash(path):
+            return None
+        manifest.update(stat)
+        try:
+            with open(directory / "manifest.json", "w") as f:
+                json.dump(manifest, f, indent=2)
+        except OSError:
+            pass
+    return Sidecar(directory, manifest)
+
+
+def attach_sidecar(network, path):
+    """Serve precomputed artifacts of ``network`` from its sidecar, if there is a valid one."""
+    sidecar = read_sidecar(path, registered_hash(network))
+    if sidecar is not None:
+        attach(network, sidecar)
+    return sidecar
+
+
+if __name__ == "__main__":
+    import pypsa
+
+    parser = argparse.ArgumentParser(description="Precompute explorer sidecar files.")
+    parser.add_argument("paths", nargs="+", type=str, help="PyPSA network files (.nc).")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        sidecar = write_sidecar(pypsa.Network(path), path)
+        print(
+            f"Wrote {len(sidecar.manifest['artifacts'])} artifacts to {sidecar.directory}"
+        )
+        for key, error in sidecar.manifest["skipped"].items():
+            print(f"  skipped {key}: {error}")
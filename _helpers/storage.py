@@ -0,0 +1,197 @@
+"""Operation of all storage units and stores of a network at once.
+
+Storage units and stores are brought into one set of (snapshots x storages)
+matrices of state of charge, discharge and charge, with columns
+``(component, name)``. Cycles, utilization and charge/discharge durations
+are then computed for all storages in vectorized passes over those matrices.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from _helpers.kpis import nominal
+from _helpers.profiling import profiled
+from _helpers.readonly import derived
+
+# Flows below this share of the power capacity count as idle
+IDLE_THRESHOLD = 1e-3
+
+
+class StorageFrames(NamedTuple):
+    soc: pd.DataFrame
+    discharge: pd.DataFrame
+    charge: pd.DataFrame
+    static: pd.DataFrame
+
+
+def _timeseries(network, component, attr, columns):
+    ts_df = getattr(network, f"{component}_t").get(attr)
+    if ts_df is None or ts_df.empty:
+        return pd.DataFrame(0.0, index=network.snapshots, columns=columns)
+    return ts_df.reindex(columns=columns).fillna(0)
+
+
+def _carriers(static):
+    if "carrier" not in static.columns:
+        return pd.Series("", index=static.index)
+    return static["carrier"]
+
+
+def _storage_units(network):
+    static = network.storage_units
+    names = static.index
+    discharge = _timeseries(network, "storage_units", "p_dispatch", names)
+    charge = _timeseries(network, "storage_units", "p_store", names)
+    # Networks without split dispatch only have the net power
+    if not discharge.to_numpy().any() and not charge.to_numpy().any():
+        p = _timeseries(network, "storage_units", "p", names)
+        discharge, charge = p.clip(lower=0), (-p).clip(lower=0)
+    power = nominal(static, "p_nom")
+    max_hours = static["max_hours"] if "max_hours" in static.columns else 0
+    table = pd.DataFrame(
+        {
+            "carrier": _carriers(static),
+            "power capacity (MW)": power,
+            "energy capacity (MWh)": power * max_hours,
+        },
+    )
+    soc = _timeseries(network, "storage_units", "state_of_charge", names)
+    return soc, discharge, charge, table
+
+
+def _stores(network):
+    static = network.stores
+    names = static.index
+    p = _timeseries(network, "stores", "p", names)
+    table = pd.DataFrame(
+        {
+            "carrier": _carriers(static),
+            # Stores have no power rating, their largest flow stands in for it
+            "power capacity (MW)": p.abs().max(),
+            "energy capacity (MWh)": nominal(static, "e_nom"),
+        },
+    )
+    soc = _timeseries(network, "stores", "e", names)
+    return soc, p.clip(lower=0), (-p).clip(lower=0), table
+
+
+@derived
+def storage_frames(network):
+    """``StorageFrames`` of all storage units and stores, or ``None`` if there are none."""
+    parts = {}
+    if len(network.storage_units):
+        parts["storage_units"] = _storage_units(network)
+    if len(network.stores):
+        parts["stores"] = _stores(network)
+    if not parts:
+        return None
+    soc, discharge, charge = (
+        pd.concat({c: part[i] for c, part in parts.items()}, axis=1) for i in range(3)
+    )
+    static = pd.concat({c: part[3] for c, part in parts.items()})
+    return StorageFrames(soc, discharge, charge, static)
+
+
+def _weights(network, index):
+    return network.snapshot_weightings["generators"].reindex(index).fillna(0).to_numpy()
+
+
+def _period_count(index):
+    return (
+        index.get_level_values(0).nunique() if isinstance(index, pd.MultiIndex) else 1
+    )
+
+
+@profiled
+@derived
+def storage_statistics(network):
+    """Throughput, equivalent full cycles, utilization and mean state of charge of every storage.
+
+    Cycles are per investment period, averaged over the periods of multi-horizon networks.
+    """
+    frames = storage_frames(network)
+    if frames is None:
+        return None
+    weights = _weights(network, frames.soc.index)
+    discharge = frames.discharge.to_numpy()
+    charge = frames.charge.to_numpy()
+    power = frames.static["power capacity (MW)"].to_numpy(dtype=float)
+    energy = frames.static["energy capacity (MWh)"].to_numpy(dtype=float)
+
+    discharged = weights @ discharge
+    active = (
+        np.maximum(discharge, charge) > IDLE_THRESHOLD * np.maximum(power, 1e-9)
+    ).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cycles = np.where(
+            energy > 0, discharged / energy / _period_count(frames.soc.index), np.nan
+        )
+        mean_soc = np.where(
+            energy > 0,
+            (weights @ frames.soc.to_numpy()) / weights.sum() / energy,
+            np.nan,
+        )
+
+    return frames.static.assign(
+        **{
+            "discharged (MWh)": discharged,
+            "charged (MWh)": weights @ charge,
+            "equivalent full cycles": cycles,
+            "utilization": weights @ active / weights.sum()
+            if weights.sum() > 0
+            else np.nan,
+            "mean state of charge": mean_soc,
+        },
+    )
+
+
+def _run_lengths(state):
+    """Lengths and states of the runs of equal values down each column of ``state``."""
+    # Separate the columns by a row of zeros, then run-length encode the whole matrix at once
+    padded = np.vstack([state, np.zeros((1, state.shape[1]), dtype=state.dtype)])
+    sequence = padded.ravel(order="F")
+    starts = np.r_[0, np.flatnonzero(np.diff(sequence)) + 1]
+    lengths = np.diff(np.r_[starts, len(sequence)])
+    return lengths, sequence[starts]
+
+
+@profiled
+@derived
+def duration_histogram(network):
+    """Number of charging and discharging periods (columns) by their duration in hours (index)."""
+    frames = storage_frames(network)
+    if frames is None:
+        return None
+    power = np.maximum(frames.static["power capacity (MW)"].to_numpy(dtype=float), 1e-9)
+    threshold = IDLE_THRESHOLD * power
+    state = (frames.discharge.to_numpy() > threshold).astype(np.int8) - (
+        frames.charge.to_numpy() > threshold
+    ).astype(np.int8)
+    lengths, states = _run_lengths(state)
+
+    # Durations in hours of the typical snapshot
+    hours = (
+        float(np.median(_weights(network, frames.soc.index)))
+        if len(frames.soc)
+        else 1.0
+    )
+    histogram = pd.DataFrame(
+        {
+            mode: pd.Series(lengths[states == value]).value_counts()
+            for mode, value in [("charging", -1), ("discharging", 1)]
+        },
+    ).fillna(0)
+    histogram.index = histogram.index * hours
+    return histogram.rename_axis("duration (h)").sort_index()
+
+
+@derived
+def soc_by_carrier(network):
+    """State of charge summed per carrier."""
+    frames = storage_frames(network)
+    if frames is None:
+        return None
+    carriers = frames.static["carrier"].reindex(frames.soc.columns)
+    return frames.soc.T.groupby(carriers.to_numpy()).sum().T
@@ -0,0 +1,207 @@
+"""Graph structure of a network from a sparse bus adjacency matrix.
+
+The adjacency matrix of the buses is built once per network from the
+branches (lines, transformers and links) as a SciPy CSR matrix. Islands,
+AC sub-networks, bus degrees and shortest electrical paths are computed on
+it with ``scipy.sparse.csgraph`` instead of PyPSA's
+``determine_network_topology``, which rebuilds its graph on every call.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from _helpers.compute import map_data
+from _helpers.fingerprint import fingerprint
+from _helpers.profiling import profiled
+from _helpers.readonly import ReadOnlyNetwork, derived
+
+# Branch components -> connected in AC sub-networks
+BRANCH_COMPONENTS = {
+    "lines": True,
+    "transformers": True,
+    "links": False,
+}
+
+# Bytes of shortest path trees kept for further targets from the same source bus
+PATH_CACHE_BYTES = 32 * 2**20
+
+_path_cache = OrderedDict()
+_path_cache_lock = threading.Lock()
+
+
+def _edges(network, ac_only):
+    """Bus positions and reactance weights of the branches."""
+    buses = network.buses.index
+    bus0, bus1, weights = [], [], []
+    for component, ac in BRANCH_COMPONENTS.items():
+        if ac_only and not ac:
+            continue
+        branches = getattr(network, component)
+        if branches.empty:
+            continue
+        start = buses.get_indexer(branches["bus0"])
+        end = buses.get_indexer(branches["bus1"])
+        weight = (
+            branches["x"].abs().to_numpy(dtype=float)
+            if "x" in branches.columns
+            else np.zeros(len(branches))
+        )
+        # Branches to unknown buses are dropped
+        known = (start >= 0) & (end >= 0)
+        bus0.append(start[known])
+        bus1.append(end[known])
+        weights.append(weight[known])
+    if not bus0:
+        return np.array([], dtype=int), np.array([], dtype=int), np.array([])
+    weights = np.concatenate(weights)
+    # Branches without a reactance (links) weigh as much as the median branch,
+    # so paths neither avoid nor prefer them
+    missing = ~(weights > 0)
+    reactances = weights[~missing]
+    weights[missing] = np.median(reactances) if len(reactances) else 1.0
+    return np.concatenate(bus0), np.concatenate(bus1), weights
+
+
+@profiled
+@derived
+def adjacency(network, ac_only=False):
+    """Symmetric (buses x buses) CSR matrix of the smallest branch reactance between buses."""
+    from scipy import sparse
+
+    bus0, bus1, weights = _edges(network, ac_only)
+    n = len(network.buses)
+    rows = np.concatenate([bus0, bus1])
+    cols = np.concatenate([bus1, bus0])
+    data = np.concatenate([weights, weights])
+
+    # Parallel branches keep the smallest weight instead of summing up
+    keys = rows.astype(np.int64) * n + cols
+    order = np.lexsort((data, keys))
+    _, first = np.unique(keys[order], return_index=True)
+    keep = order[first]
+    return sparse.csr_matrix((data[keep], (rows[keep], cols[keep])), shape=(n, n))
+
+
+@derived
+def islands(network, ac_only=False):
+    """Island (connected component) number of every bus; AC sub-networks for ``ac_only``."""
+    from scipy.sparse.csgraph import connected_components
+
+    _, labels = connected_components(adjacency(network, ac_only), directed=False)
+    return pd.Series(labels, index=network.buses.index, name="island")
+
+
+@derived
+def bus_degrees(network):
+    """Number of distinct neighbours of every bus."""
+    return pd.Series(
+        np.diff(adjacency(network).indptr), index=network.buses.index, name="degree"
+    )
+
+
+@profiled
+@derived
+def topology_summary(network):
+    """Counts of buses, branches, islands and AC sub-networks and bus degree statistics."""
+    bus0, _, _ = _edges(network, ac_only=False)
+    degrees = bus_degrees(network)
+    island_sizes = islands(network).value_counts()
+    buses = network.buses
+    ac = (
+        buses["carrier"] == "AC"
+        if "carrier" in buses.columns
+        else pd.Series(True, index=buses.index)
+    )
+    return {
+        "Buses": len(degrees),
+        "Branches": len(bus0),
+        "Islands": len(island_sizes),
+        "AC sub-networks": islands(network, ac_only=True)[ac].nunique(),
+        "Isolated buses": int((degrees == 0).sum()),
+        "Largest island (buses)": int(island_sizes.max()) if len(island_sizes) else 0,
+        "Mean degree": float(degrees.mean()) if len(degrees) else 0.0,
+        "Max degree": int(degrees.max()) if len(degrees) else 0,
+    }
+
+
+@derived
+def island_table(network):
+    """Buses and carriers of every island, largest first."""
+    buses = network.buses
+    carriers = (
+        buses["carrier"]
+        if "carrier" in buses.columns
+        else pd.Series("", index=buses.index)
+    )
+    table = pd.DataFrame({"island": islands(network), "carrier": carriers})
+    return (
+        table.groupby("island")
+        .agg(
+            buses=("carrier", "size"),
+            carriers=("carrier", lambda c: ", ".join(sorted(set(c) - {""}))),
+        )
+        .sort_values("buses", ascending=False)
+    )
+
+
+def _predecessors(network, source):
+    """Shortest path tree from bus position ``source``, kept for read-only networks.
+
+    Only the predecessors are kept, as int32, in an LRU bounded by ``PATH_CACHE_BYTES``.
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    key = (
+        (fingerprint(network), source) if isinstance(network, ReadOnlyNetwork) else None
+    )
+    if key is not None:
+        with _path_cache_lock:
+            predecessors = _path_cache.get(key)
+            if predecessors is not None:
+                _path_cache.move_to_end(key)
+                return predecessors
+
+    _, predecessors = dijkstra(
+        adjacency(network), directed=False, indices=source, return_predecessors=True
+    )
+    predecessors = predecessors.astype(np.int32)
+    if key is not None:
+        with _path_cache_lock:
+            _path_cache[key] = predecessors
+            while (
+                sum(p.nbytes for p in _path_cache.values()) > PATH_CACHE_BYTES
+                and len(_path_cache) > 1
+            ):
+                _path_cache.popitem(last=False)
+    return predecessors
+
+
+def shortest_path(network, source, target):
+    """Buses on the path of least total reactance from ``source`` to ``target`` and its length.
+
+    Returns ``(None, inf)`` if the buses are not connected. Shortest path
+    trees from a source bus are memoized, so paths to further targets are
+    immediate.
+    """
+    buses = network.buses.index
+    start, end = buses.get_loc(source), buses.get_loc(target)
+    predecessors = _predecessors(network, start)
+    if end != start and predecessors[end] < 0:
+        return None, np.inf
+    path = [end]
+    while path[-1] != start:
+        path.append(predecessors[path[-1]])
+    path = path[::-1]
+    distance = adjacency(network)[path[:-1], path[1:]].sum() if len(path) > 1 else 0.0
+    return list(buses[path]), float(distance)
+
+
+@derived
+def island_map_data(network):
+    """Buses for the map, colored by island."""
+    buses = network.buses
+    labels = islands(network)
+    return map_data(buses.assign(carrier="island " + labels.astype(str)))
@@ -9,10 +9,12 @@ import pypsa
 import yaml
 from matplotlib import pyplot as plt
 
+from _helpers.scenario_store import STORE_DIRECTORY, ScenarioStore, config_scenarios
+
 
 def get_carriers(n):
-    carriers = n.carriers
-    carriers["legend_name"] = carriers.nice_name
+    # Work on a copy, the network's carriers stay untouched
+    carriers = n.carriers.assign(legend_name=n.carriers.nice_name)
     carriers.loc["DC", "legend_name"] = "Transmission"
     carriers.loc["DC", "color"] = "#cf1dab"
     carriers.loc["battery", "legend_name"] = "Existing BESS"
@@ -59,6 +61,15 @@ def process_data(data, alias_dict=None, new_order=None):
     return stats
 
 
+def stats_from_store(store, alias_dict=None, new_order=None):
+    """``process_data`` output served from a ``ScenarioStore``, without reading the CSV files again."""
+    data = {
+        name: {table: store.statistics(name, table) for table in store.tables(name)}
+        for name in store.scenarios
+    }
+    return process_data(data, alias_dict, new_order)
+
+
 def prepare_combined_dataframe(
     stats,
     variable,
@@ -100,6 +111,61 @@ def prepare_combined_dataframe(
     return combined_df
 
 
+def combined_from_store(
+    store,
+    variable,
+    carriers,
+    scenarios=None,
+    as_pct=False,
+    variable_units=None,
+    alias_dict=None,
+):
+    """``prepare_combined_dataframe`` output served from a ``ScenarioStore`` slice.
+
+    ``scenarios`` are named by their aliases in ``alias_dict``, the store keeps the configured names.
+    """
+    factor_units = {"GW": 1e3, "GWh": 1e3, "%": 1}.get(variable_units, 1e9)
+    alias_dict = alias_dict or {}
+    names = [alias_dict.get(s, s) for s in store.scenarios]
+    scenarios = names if scenarios is None else [s for s in scenarios if s in names]
+
+    values = store.select(variable, components=["Generator", "StorageUnit", "Link"])
+    values = values.rename(index=alias_dict, level="scenario")
+    values = values.loc[values.index.get_level_values("scenario").isin(scenarios)]
+    values = values.groupby(level=["scenario", "horizon", "carrier"]).sum()
+    values = values.loc[values.index.get_level_values("carrier").isin(carriers.index)]
+    if as_pct:
+        values = (
+            values
+            / values.groupby(level=["scenario", "horizon"]).transform("sum")
+            * 100
+        ).round(2)
+    else:
+        values = values / factor_units
+
+    combined_df = values.rename("statistics").reset_index()
+    combined_df = combined_df.rename(
+        columns={"scenario": "Scenario", "carrier": "nice_name"}
+    )
+    # Scenarios in the requested order and technologies in the order of the carriers table
+    combined_df["Scenario"] = pd.Categorical(
+        combined_df["Scenario"], categories=scenarios, ordered=True
+    )
+    combined_df["nice_name"] = pd.Categorical(
+        combined_df["nice_name"], categories=carriers.index.unique(), ordered=True
+    )
+    combined_df = combined_df.sort_values(
+        ["Scenario", "horizon", "nice_name"], ignore_index=True
+    )
+    combined_df = combined_df.astype({"Scenario": str, "nice_name": str})[
+        ["nice_name", "statistics", "Scenario", "horizon"]
+    ]
+
+    combined_df["scenario_name"] = combined_df["Scenario"].str.split("_").str[0]
+    combined_df["trans_expansion"] = combined_df["Scenario"].str.split("_").str[1]
+    return combined_df
+
+
 def plot_scenario_comparison(
     combined_df,
     carriers,
@@ -132,7 +198,9 @@ def plot_scenario_comparison(
             scenario_df = horizon_df[horizon_df["Scenario"] == scenario]
             bottoms = np.zeros(len(y_positions))
             for tech in scenario_df["nice_name"].unique():
-                values = scenario_df[scenario_df["nice_name"] == tech]["statistics"].values[0]
+                values = scenario_df[scenario_df["nice_name"] == tech][
+                    "statistics"
+                ].values[0]
                 ax.barh(
                     y_positions[j],
                     values,
@@ -157,8 +225,13 @@ def plot_scenario_comparison(
     plt.xlabel(f"{variable} [{variable_units}]")
     plt.subplots_adjust(hspace=0.5)
 
-    carriers_plotted = carriers.loc[carriers.index.intersection(combined_df["nice_name"].unique())]
-    legend_handles = [plt.Rectangle((0, 0), 1, 1, color=colors[tech]) for tech in carriers_plotted.index]
+    carriers_plotted = carriers.loc[
+        carriers.index.intersection(combined_df["nice_name"].unique())
+    ]
+    legend_handles = [
+        plt.Rectangle((0, 0), 1, 1, color=colors[tech])
+        for tech in carriers_plotted.index
+    ]
     fig.legend(
         handles=legend_handles,
         labels=carriers_plotted.legend_name.tolist(),
@@ -204,7 +277,9 @@ def _plot_reference_comparison(
     combined_df = combined_df.reset_index().set_index("nice_name")
     for carrier in combined_df.index.unique():
         combined_df.loc[carrier, "statistics"] = (
-            (combined_df.loc[carrier, "statistics"] - ref.loc[carrier, "statistics"]) / ref.statistics.sum() * 100
+            (combined_df.loc[carrier, "statistics"] - ref.loc[carrier, "statistics"])
+            / ref.statistics.sum()
+            * 100
         )
     combined_df = combined_df.reset_index().set_index("Scenario")
     stacked_data = combined_df.reset_index().pivot(
@@ -336,7 +411,10 @@ def scenario_comparison(
     plt.xlabel(f"{variable} [{variable_units}]")
     plt.subplots_adjust(hspace=0)
     carriers_plotted = carriers.loc[carriers.index.intersection(df.index.unique())]
-    legend_handles = [plt.Rectangle((0, 0), 1, 1, color=colors[tech]) for tech in carriers_plotted.index]
+    legend_handles = [
+        plt.Rectangle((0, 0), 1, 1, color=colors[tech])
+        for tech in carriers_plotted.index
+    ]
     fig.legend(
         handles=legend_handles,
         labels=carriers_plotted.legend_name.tolist(),
@@ -370,7 +448,12 @@ def scenario_comparison(
         combined_df = combined_df.reset_index().set_index("nice_name")
         for scenario in combined_df.index.unique():
             combined_df.loc[scenario, "statistics"] = (
-                (combined_df.loc[scenario, "statistics"] - ref.loc[scenario, "statistics"]) / ref.statistics.sum() * 100
+                (
+                    combined_df.loc[scenario, "statistics"]
+                    - ref.loc[scenario, "statistics"]
+                )
+                / ref.statistics.sum()
+                * 100
             )
         combined_df = combined_df.reset_index().set_index("Scenario")
         stacked_data = combined_df.reset_index().pivot(
@@ -414,7 +497,10 @@ def plot_cost_comparison(
                     {
                         "Scenario": scenario,
                         "statistics": (
-                            (stat["Capital Expenditure"].sum() + stat["Operational Expenditure"].sum())
+                            (
+                                stat["Capital Expenditure"].sum()
+                                + stat["Operational Expenditure"].sum()
+                            )
                             * n.investment_period_weightings.objective.values
                         ).sum()
                         / 1e9,
@@ -474,20 +560,24 @@ if __name__ == "__main__":
 
     # Load and process data
     config = load_yaml_config(yaml_path)
-    scenarios = config["scenarios"]
-    raw_data = load_scenario_data(scenarios)
 
     alias_dict = config.get("alias_dict", None)
     new_order = config.get("new_order", None)
     reference_scenario = config.get("reference_scenario", None)
 
     figures_path = (
-        Path.cwd() / f"results/{config.get('output_folder_name', 'scenario_comparison')}"
+        Path.cwd()
+        / f"results/{config.get('output_folder_name', 'scenario_comparison')}"
     )  # Directory to save the figures in the parent of cwd
 
     figures_path.mkdir(exist_ok=True)
 
-    processed_data = process_data(raw_data, alias_dict, new_order)
+    # Long-format statistics of all scenarios, only re-read for changed scenarios. The store
+    # is shared with the app, so it keeps the configured names and paths relative to the YAML
+    store = ScenarioStore(yaml_path.parent / STORE_DIRECTORY)
+    store.refresh(config_scenarios(config, yaml_path.parent))
+
+    processed_data = stats_from_store(store, alias_dict, new_order)
 
     n = pypsa.Network(config["network"]["path"])
     # Example carrier setup
@@ -500,13 +590,16 @@ if __name__ == "__main__":
     title = "Capacity Comparison"
 
     # Generate plots
-    combined_df = prepare_combined_dataframe(
-        processed_data,
+    combined_df = combined_from_store(
+        store,
         variable,
         carriers,
+        scenarios=new_order,
         as_pct=False,
         variable_units=variable_units,
+        alias_dict=alias_dict,
     )
+    combined_df.to_csv(figures_path / f"{variable}_comparison.csv")
     plot_scenario_comparison(
         combined_df,
         carriers,
@@ -0,0 +1,209 @@
+"""Headless batch report over a directory of PyPSA networks.
+
+Runs the explorer's summary, temporal, geospatial and comparison computations
+for every ``.nc`` file in a directory, in a process pool, and writes every
+table as Parquet and every chart as interactive HTML (the app's plotly
+figure) and static PNG per network. Temporal charts of multi-horizon networks
+are written per investment period.
+
+    uv run python batch_report.py results/networks --output reports
+"""
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+import pandas as pd
+import pypsa
+
+matplotlib.use("Agg")
+from matplotlib import pyplot as plt  # noqa: E402
+
+from _helpers.comparison import COMPARE_METRICS, NetworkVariant, by_carrier, deltas
+from _helpers.compute import (
+    aggregate_by_carrier,
+    capacity_by_carrier,
+    component_counts,
+    map_data,
+    network_attributes,
+    period_ranges,
+    period_slice,
+    timeseries,
+)
+from _helpers.figures import (
+    bus_map,
+    capacity_pie,
+    carrier_bars,
+    series_line,
+    timeseries_line,
+)
+from _helpers.kpis import period_summary, system_kpis
+
+
+def _save_chart(fig, data, stem, title, ylabel, **plot_kwargs):
+    """Write the plotly ``fig`` as HTML and a matplotlib plot of ``data`` as PNG next to ``stem``."""
+    fig.write_html(stem.with_suffix(".html"))
+    plot_kwargs.setdefault("legend", isinstance(data, pd.DataFrame))
+    ax = data.plot(figsize=(10, 6), title=title, **plot_kwargs)
+    ax.set_ylabel(ylabel)
+    plt.tight_layout()
+    plt.savefig(stem.with_suffix(".png"), dpi=150, bbox_inches="tight")
+    plt.close(ax.figure)
+
+
+def _period_title(title, period):
+    return title if period is None else f"{title} ({period})"
+
+
+def _period_stem(stem, period):
+    return stem if period is None else stem.with_name(f"{stem.name}_{period}")
+
+
+def report_network(path, output_dir):
+    """Write the report of the network at ``path`` and return its comparison extract."""
+    network = pypsa.Network(path)
+    name = Path(path).stem
+    out = Path(output_dir) / name
+    out.mkdir(parents=True, exist_ok=True)
+
+    # System summary
+    component_counts(network).to_parquet(out / "component_counts.parquet")
+    with open(out / "attributes.json", "w") as f:
+        json.dump(network_attributes(network), f, indent=2, default=str)
+
+    system_kpis(network).to_parquet(out / "kpis.parquet")
+    period_summary(network).to_parquet(out / "kpis_by_period.parquet")
+
+    capacity = capacity_by_carrier(network)
+    if capacity is not None:
+        capacity.to_frame().to_parquet(out / "capacity_by_carrier.parquet")
+        title = "Installed Capacity by Generator Type"
+        _save_chart(
+            capacity_pie(capacity),
+            capacity,
+            out / "capacity_by_carrier",
+            title,
+            "p_nom",
+            kind="bar",
+        )
+
+    # Temporal, charted per investment period like the Temporal view
+    periods = list(period_ranges(network)) or [None]
+    dispatch = timeseries(network, "generators", "p")
+    if dispatch is not None and "carrier" in network.generators.columns:
+        dispatch = aggregate_by_carrier(dispatch, network.generators)
+        dispatch.to_parquet(out / "generation_by_carrier.parquet")
+        for period in periods:
+            data = period_slice(network, dispatch, period)
+            title = _period_title("Generator p by type", period)
+            _save_chart(
+                timeseries_line(data, title),
+                data,
+                _period_stem(out / "generation_by_carrier", period),
+                title,
+                "p",
+            )
+    loads = timeseries(network, "loads", "p")
+    if loads is not None:
+        total = loads.sum(axis=1).rename("p")
+        total.to_frame().to_parquet(out / "total_load.parquet")
+        for period in periods:
+            data = period_slice(network, total.to_frame(), period)["p"]
+            title = _period_title("Total Load p", period)
+            _save_chart(
+                series_line(data, title),
+                data,
+                _period_stem(out / "total_load", period),
+                title,
+                "p",
+            )
+
+    # Geospatial
+    buses = network.buses
+    map_df = map_data(buses)
+    if map_df is not None and len(buses):
+        map_df.drop(columns="color", errors="ignore").to_parquet(
+            out / "bus_map.parquet"
+        )
+        _save_chart(
+            bus_map(buses),
+            buses,
+            out / "bus_map",
+            "Buses",
+            "y",
+            kind="scatter",
+            x="x",
+            y="y",
+            legend=False,
+        )
+
+    return NetworkVariant(name, network)
+
+
+def write_comparison(variants, output_dir, reference=None):
+    out = Path(output_dir) / "comparison"
+    out.mkdir(parents=True, exist_ok=True)
+    reference = reference or variants[0].name
+
+    for metric in COMPARE_METRICS:
+        slug = metric.lower().replace(" ", "_")
+        table = by_carrier(variants, "generators", metric)
+        if table.empty:
+            continue
+        table.to_parquet(out / f"{slug}_by_carrier.parquet")
+        delta = deltas(table, reference).drop(columns=reference)
+        delta.to_parquet(out / f"{slug}_delta_by_carrier.parquet")
+        title = f"{metric} comparison"
+        _save_chart(
+            carrier_bars(table, title),
+            table,
+            out / f"{slug}_comparison",
+            title,
+            metric,
+            kind="bar",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write explorer reports for a directory of networks."
+    )
+    parser.add_argument(
+        "input_dir", type=str, help="Directory containing PyPSA .nc files."
+    )
+    parser.add_argument(
+        "--output", type=str, default="reports", help="Directory to write reports to."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--reference",
+        type=str,
+        default=None,
+        help="Network to compare the others against.",
+    )
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.input_dir).glob("*.nc"))
+    if not paths:
+        parser.error(f"No .nc files found in {args.input_dir}")
+
+    variants = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(report_network, path, args.output): path for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                variants.append(future.result())
+                print(f"Wrote report for {futures[future].name}")
+            except Exception as e:
+                print(f"Failed to report {futures[future].name}: {e}")
+
+    if len(variants) > 1:
+        variants.sort(key=lambda v: v.name)
+        write_comparison(variants, args.output, args.reference)
+        print(f"Wrote comparison of {len(variants)} networks")
@@ -0,0 +1,171 @@
+"""Synthetic networks and scenario statistics for the benchmark suite.
+
+Sizes are selected with ``--bench-sizes`` (default ``small,medium``); use
+``--bench-sizes=small,medium,production`` for the full scaling run.
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+# name -> (buses, generators, snapshots)
+NETWORK_SIZES = {
+    "small": (50, 200, 168),
+    "medium": (500, 2_000, 2_190),
+    "production": (5_000, 20_000, 8_760),
+}
+
+# name -> number of scenarios
+SCENARIO_SIZES = {
+    "small": 2,
+    "medium": 10,
+    "production": 50,
+}
+
+CARRIERS = [
+    "solar",
+    "onwind",
+    "offwind",
+    "hydro",
+    "CCGT",
+    "OCGT",
+    "coal",
+    "nuclear",
+    "biomass",
+    "battery",
+]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default="small,medium",
+        help=f"Comma separated benchmark sizes out of {', '.join(NETWORK_SIZES)}.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--bench-sizes").split(",")
+        metafunc.parametrize("size", [s for s in NETWORK_SIZES if s in sizes])
+
+
+@functools.cache
+def synthetic_network(n_buses, n_generators, n_snapshots, seed=0):
+    """Solved-looking network with random coordinates, capacities and dispatch."""
+    rng = np.random.default_rng(seed)
+    n = pypsa.Network()
+    n.set_snapshots(pd.date_range("2030-01-01", periods=n_snapshots, freq="h"))
+
+    n.add("Carrier", CARRIERS, co2_emissions=rng.uniform(0, 1, len(CARRIERS)))
+
+    buses = [f"bus{i}" for i in range(n_buses)]
+    n.add(
+        "Bus",
+        buses,
+        x=rng.uniform(-10, 30, n_buses),
+        y=rng.uniform(35, 60, n_buses),
+        v_nom=380.0,
+    )
+    n.add(
+        "Line",
+        [f"line{i}" for i in range(n_buses - 1)],
+        bus0=buses[:-1],
+        bus1=buses[1:],
+        x=0.1,
+        s_nom=rng.uniform(100, 2_000, n_buses - 1),
+    )
+
+    generators = [f"gen{i}" for i in range(n_generators)]
+    p_nom = rng.uniform(10, 1_000, n_generators)
+    n.add(
+        "Generator",
+        generators,
+        bus=rng.choice(buses, n_generators),
+        carrier=rng.choice(CARRIERS[:-1], n_generators),
+        p_nom=p_nom,
+        p_nom_opt=p_nom * rng.uniform(0.5, 1.5, n_generators),
+        marginal_cost=rng.uniform(0, 100, n_generators),
+        capital_cost=rng.uniform(1e3, 1e5, n_generators),
+    )
+    n.generators_t["p"] = pd.DataFrame(
+        rng.uniform(0, 1, (n_snapshots, n_generators)) * p_nom,
+        index=n.snapshots,
+        columns=generators,
+    )
+
+    storage_units = [f"storage{i}" for i in range(max(1, n_generators // 10))]
+    n.add(
+        "StorageUnit",
+        storage_units,
+        bus=rng.choice(buses, len(storage_units)),
+        carrier="battery",
+        p_nom=100.0,
+        max_hours=4.0,
+    )
+    n.storage_units_t["p"] = pd.DataFrame(
+        rng.uniform(-100, 100, (n_snapshots, len(storage_units))),
+        index=n.snapshots,
+        columns=storage_units,
+    )
+
+    loads = [f"load{i}" for i in range(n_buses)]
+    n.add("Load", loads, bus=buses)
+    n.loads_t["p"] = pd.DataFrame(
+        rng.uniform(100, 1_000, (n_snapshots, n_buses)),
+        index=n.snapshots,
+        columns=loads,
+    )
+    return n
+
+
+def synthetic_scenario_stats(n_scenarios, horizons=(2030, 2040, 2050), seed=0):
+    """Scenario statistics shaped like ``load_scenario_data`` output, plus the carriers table."""
+    rng = np.random.default_rng(seed)
+    index = pd.MultiIndex.from_tuples(
+        [("Generator", c) for c in CARRIERS[:-1]] + [("StorageUnit", "battery")],
+    )
+    variables = [
+        "Optimal Capacity",
+        "Supply",
+        "Capital Expenditure",
+        "Operational Expenditure",
+    ]
+    columns = pd.MultiIndex.from_product([variables, [str(h) for h in horizons]])
+
+    stats = {
+        f"scenario{i}_tx{i % 3}": {
+            "statistics": pd.DataFrame(
+                rng.uniform(0, 1e5, (len(index), len(columns))),
+                index=index,
+                columns=columns,
+            ),
+        }
+        for i in range(n_scenarios)
+    }
+    carriers = pd.DataFrame(
+        {"legend_name": CARRIERS, "color": "#aaaaaa", "co2_emissions": 0.0},
+        index=pd.Index(CARRIERS, name="nice_name"),
+    )
+    return stats, carriers
+
+
+@pytest.fixture
+def network(size):
+    return synthetic_network(*NETWORK_SIZES[size])
+
+
+@pytest.fixture
+def network_file(size, tmp_path_factory):
+    path = tmp_path_factory.getbasetemp() / f"network_{size}.nc"
+    if not path.exists():
+        synthetic_network(*NETWORK_SIZES[size]).export_to_netcdf(path)
+    return path
+
+
+@pytest.fixture
+def scenario_stats(size):
+    return synthetic_scenario_stats(SCENARIO_SIZES[size])
@@ -0,0 +1,65 @@
+import pytest
+
+from _helpers import visualization
+from _helpers.comparison import (
+    COMPARE_METRICS,
+    NetworkVariant,
+    by_carrier,
+    dispatch_deltas,
+)
+from _helpers.scenario_store import ScenarioStore
+from conftest import NETWORK_SIZES, synthetic_network
+
+
+@pytest.fixture
+def variants(size):
+    return [
+        NetworkVariant(f"v{seed}", synthetic_network(*NETWORK_SIZES[size], seed=seed))
+        for seed in range(3)
+    ]
+
+
+@pytest.mark.parametrize("metric", COMPARE_METRICS)
+def test_compare_by_carrier(benchmark, variants, metric):
+    benchmark(by_carrier, variants, "generators", metric)
+
+
+def test_compare_dispatch(benchmark, variants):
+    benchmark(dispatch_deltas, variants, "generators", "v0")
+
+
+def test_scenario_pipeline(benchmark, scenario_stats, tmp_path, monkeypatch):
+    stats, carriers = scenario_stats
+    # prepare_combined_dataframe writes its CSV to the module level figures_path
+    monkeypatch.setattr(visualization, "figures_path", tmp_path, raising=False)
+
+    def pipeline():
+        processed = visualization.process_data(stats)
+        return visualization.prepare_combined_dataframe(
+            processed,
+            "Optimal Capacity",
+            carriers,
+            variable_units="GW",
+        )
+
+    benchmark(pipeline)
+
+
+def test_scenario_store(benchmark, scenario_stats, tmp_path):
+    stats, carriers = scenario_stats
+    scenarios = []
+    for name, files in stats.items():
+        folder = tmp_path / name / "statistics"
+        folder.mkdir(parents=True)
+        files["statistics"].to_csv(folder / "statistics.csv")
+        scenarios.append({"name": name, "path": str(tmp_path / name)})
+    store = ScenarioStore(tmp_path / ".scenario_store")
+    store.refresh(scenarios)
+
+    def pipeline():
+        store.refresh(scenarios)
+        return visualization.combined_from_store(
+            store, "Optimal Capacity", carriers, variable_units="GW"
+        )
+
+    benchmark(pipeline)
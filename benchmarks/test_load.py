@@ -0,0 +1,30 @@
+import pypsa
+
+from _helpers.comparison import NetworkVariant
+from _helpers.sidecar import read_sidecar, write_sidecar
+
+
+def test_read_netcdf(benchmark, network_file):
+    benchmark(pypsa.Network, network_file)
+
+
+def test_write_sidecar(benchmark, network, tmp_path):
+    path = tmp_path / "network.nc"
+    path.write_bytes(b"")
+    benchmark(write_sidecar, network, path)
+
+
+def test_read_sidecar(benchmark, network, tmp_path):
+    path = tmp_path / "network.nc"
+    path.write_bytes(b"")
+    write_sidecar(network, path)
+
+    def read_all():
+        sidecar = read_sidecar(path)
+        return [sidecar.get(key) for key in sidecar.manifest["artifacts"]]
+
+    benchmark(read_all)
+
+
+def test_network_variant(benchmark, network):
+    benchmark(NetworkVariant, "variant", network)
@@ -0,0 +1,53 @@
+"""Cold-start checks for the landing page (no network loaded)."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Libraries that must not be imported before a network is loaded
+HEAVY_MODULES = ["pypsa", "plotly", "pydeck", "matplotlib", "pyarrow.feather", "duckdb"]
+
+# Seconds allowed for importing the app's own modules on top of streamlit
+IMPORT_BUDGET = 0.25
+
+APP_MODULES = (
+    "_helpers.network_loader, _helpers.profiling, views.registry, views.profiling_panel"
+)
+
+
+def _run(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_landing_page_defers_heavy_imports():
+    # Streamlit itself imports plotly when it is installed, so only imports made by the app count
+    loaded = _run(
+        "import json, sys\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "baseline = set(sys.modules)\n"
+        "AppTest.from_file('pypsa_explorer.py').run()\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules and m not in baseline]))\n",
+    )
+    assert loaded == []
+
+
+def test_landing_page_import_budget(benchmark):
+    code = (
+        "import json, time\n"
+        "import streamlit\n"
+        "start = time.perf_counter()\n"
+        f"import {APP_MODULES}\n"
+        "print(json.dumps(time.perf_counter() - start))\n"
+    )
+    elapsed = benchmark.pedantic(_run, args=(code,), rounds=3, iterations=1)
+    assert elapsed < IMPORT_BUDGET
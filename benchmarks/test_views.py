@@ -0,0 +1,70 @@
+import pandas as pd
+
+from _helpers.compute import (
+    RESAMPLE_RULES,
+    aggregate_by_carrier,
+    capacity_by_carrier,
+    carrier_dispatch,
+    component_counts,
+    component_map_data,
+    heatmap_matrix,
+    timeseries,
+)
+from _helpers.kpis import system_kpis
+from _helpers.regions import RegionMapping, regional_capacity, regional_timeseries
+from _helpers.storage import duration_histogram, storage_statistics
+from _helpers.topology import topology_summary
+
+
+def test_system_summary(benchmark, network):
+    def summary():
+        component_counts(network)
+        capacity_by_carrier(network)
+
+    benchmark(summary)
+
+
+def test_temporal_aggregate_by_carrier(benchmark, network):
+    ts_df = timeseries(network, "generators", "p")
+    benchmark(aggregate_by_carrier, ts_df, network.generators)
+
+
+def test_temporal_resample(benchmark, network):
+    benchmark(carrier_dispatch, network, "p", RESAMPLE_RULES["Daily"])
+
+
+def test_temporal_heatmap(benchmark, network):
+    benchmark(heatmap_matrix, network, "generators", "p", "total", None, "week")
+
+
+def test_geospatial_map_data(benchmark, network):
+    benchmark(component_map_data, network, "Generators")
+
+
+def test_system_kpis(benchmark, network):
+    benchmark(system_kpis, network)
+
+
+def test_regional_rollup(benchmark, network):
+    buses = network.buses.index
+    mapping = RegionMapping(
+        "bench", pd.Series([f"region{i % 10}" for i in range(len(buses))], index=buses)
+    )
+
+    def rollup():
+        regional_capacity(network, mapping)
+        regional_timeseries(network, mapping, "generators", "p")
+
+    benchmark(rollup)
+
+
+def test_topology(benchmark, network):
+    benchmark(topology_summary, network)
+
+
+def test_storage(benchmark, network):
+    def storage():
+        storage_statistics(network)
+        duration_histogram(network)
+
+    benchmark(storage)
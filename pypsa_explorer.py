@@ -1,13 +1,22 @@
+import pandas as pd
 import streamlit as st
-from _helpers.network_loader import load_network
-from views.system_summary import show_system_summary
-from views.temporal_view import show_temporal_view
-from views.geospatial_view import show_geospatial_view
-from views.config_view import show_config_view
+from _helpers.network_loader import load_comparison, load_network
+from _helpers.profiling import Trace, finish_active_trace
+from views.profiling_panel import show_profiling_panel
+from views.registry import COMPARE_VIEW, SCENARIO_VIEW, VIEWS, load_view, show_view
+
+# Loaded networks are shared read-only and hand out shallow copies of their
+# tables; copy-on-write keeps changes to those copies local to the caller
+pd.set_option("mode.copy_on_write", True)
 
 # Set page configuration
 st.set_page_config(page_title="PyPSA Network Explorer", layout="wide")
 
+# Optional per-rerun profiling, toggled from the debug panel at the bottom of the sidebar
+finish_active_trace()
+profiling = st.session_state.get("profile_reruns", False)
+trace = Trace().start() if profiling else None
+
 # Sidebar for file selection
 st.sidebar.title("⚡ PyPSA Network Explorer")
 st.sidebar.write(
@@ -17,26 +26,34 @@ st.sidebar.write(
 # Option to select file input method
 file_input_method = st.sidebar.radio(
     "Select how to load the network:",
-    ["Upload NetCDF file", "Load sample network"],
+    [
+        "Upload NetCDF file",
+        "Browse local directory",
+        "Load sample network",
+        "Compare networks",
+        "Scenario statistics",
+    ],
 )
-network = load_network(file_input_method)
+if file_input_method == "Scenario statistics":
+    variants = None
+    network = None
+elif file_input_method == "Compare networks":
+    variants = load_comparison()
+    network = None
+else:
+    variants = None
+    network = load_network(file_input_method)
 
 # Main content area - only show if network is loaded
-if network is not None:
+if file_input_method == "Scenario statistics":
+    load_view(*SCENARIO_VIEW)()
+elif variants is not None:
+    load_view(*COMPARE_VIEW)(variants)
+elif network is not None:
     # Navigation through different components and views
     st.sidebar.title("Navigation")
-    component_options = ["System Summary", "Temporal", "Geospatial", "Metadata"]
-    selected_view = st.sidebar.radio("Select view:", component_options)
-
-    match selected_view:
-        case "System Summary":
-            show_system_summary(network)
-        case "Temporal":
-            show_temporal_view(network)
-        case "Geospatial":
-            show_geospatial_view(network)
-        case "Metadata":
-            show_config_view(network)
+    selected_view = st.sidebar.radio("Select view:", list(VIEWS))
+    show_view(selected_view, network)
 else:
     # Instructions when no network is loaded
     st.info("Please select a PyPSA network to explore using the sidebar options.")
@@ -64,6 +81,19 @@ else:
     ### Getting Started:
 
     1. Upload a PyPSA network file (.nc format).
-    3. Alternatively, load a sample network for demonstration.
+    2. Alternatively, open a network (.nc, .h5, CSV folder or .zip) from a results directory on the server,
+       or load a sample network for demonstration.
+    3. Or select "Compare networks" to diff two or more networks side by side.
+    4. Or select "Scenario statistics" to compare the statistics of workflow scenarios.
     """,
     )
+
+with st.sidebar.expander("Debug"):
+    st.toggle(
+        "Profile reruns",
+        key="profile_reruns",
+        help="Record time and memory per stage of each rerun.",
+    )
+    if trace is not None:
+        trace.finish().export()
+        show_profiling_panel(trace)
@@ -0,0 +1,40 @@
+"""Small hand-made networks for the behavior tests."""
+
+import pandas as pd
+import pypsa
+import pytest
+
+
+@pytest.fixture
+def network():
+    """Three AC buses in a line with two generators each, a load and a day of hourly dispatch."""
+    n = pypsa.Network()
+    n.set_snapshots(pd.date_range("2030-01-01", periods=24, freq="h"))
+    n.add("Carrier", ["AC", "solar", "gas"])
+    n.add(
+        "Bus", ["b0", "b1", "b2"], x=[0.0, 1.0, 2.0], y=[50.0, 50.0, 50.0], carrier="AC"
+    )
+    n.add(
+        "Line",
+        ["l0", "l1"],
+        bus0=["b0", "b1"],
+        bus1=["b1", "b2"],
+        x=0.1,
+        r=0.01,
+        s_nom=100.0,
+    )
+    n.add(
+        "Generator",
+        ["solar0", "gas0", "solar1", "gas2"],
+        bus=["b0", "b0", "b1", "b2"],
+        carrier=["solar", "gas", "solar", "gas"],
+        p_nom=[10.0, 20.0, 30.0, 40.0],
+        marginal_cost=[0.0, 50.0, 0.0, 60.0],
+    )
+    n.generators_t["p"] = pd.DataFrame(
+        {"solar0": 1.0, "gas0": 2.0, "solar1": 3.0, "gas2": 4.0},
+        index=n.snapshots,
+    )
+    n.add("Load", ["load1"], bus="b1")
+    n.loads_t["p"] = pd.DataFrame({"load1": 10.0}, index=n.snapshots)
+    return n
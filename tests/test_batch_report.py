@@ -0,0 +1,21 @@
+import pandas as pd
+
+from batch_report import report_network
+
+
+def test_report_per_investment_period(network, tmp_path):
+    timesteps = network.snapshots
+    p = network.generators_t["p"].to_numpy()
+    network.set_snapshots(pd.MultiIndex.from_product([[2030, 2040], timesteps]))
+    network.investment_periods = [2030, 2040]
+    network.generators_t["p"] = pd.DataFrame(
+        list(p) * 2, index=network.snapshots, columns=network.generators.index
+    )
+    path = tmp_path / "multi.nc"
+    network.export_to_netcdf(path)
+
+    report_network(path, tmp_path / "reports")
+    out = tmp_path / "reports" / "multi"
+    assert (out / "generation_by_carrier_2030.html").exists()
+    assert (out / "generation_by_carrier_2040.png").exists()
+    assert len(pd.read_parquet(out / "generation_by_carrier.parquet")) == 48
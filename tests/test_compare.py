@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from _helpers.comparison import (
+    NetworkVariant,
+    by_carrier,
+    deltas,
+    dispatch_deltas,
+    shared_columns,
+)
+
+
+def test_variants_share_identical_columns(network):
+    other = network.copy()
+    other.generators.loc["gas2", "p_nom"] = 80.0
+    a, b = NetworkVariant("a", network), NetworkVariant("b", other)
+
+    assert a.static["generators"]["carrier"] is b.static["generators"]["carrier"]
+    assert a.static["generators"]["p_nom"] is not b.static["generators"]["p_nom"]
+    assert shared_columns([a, b])[1] > 0
+    # Interned columns do not keep the network's tables alive
+    assert not np.shares_memory(
+        a.static["generators"]["p_nom"].to_numpy(),
+        network.generators["p_nom"].to_numpy(),
+    )
+
+
+def test_capacity_by_carrier_deltas(network):
+    other = network.copy()
+    other.generators.loc["gas2", "p_nom"] = 80.0
+    table = by_carrier(
+        [NetworkVariant("a", network), NetworkVariant("b", other)],
+        "generators",
+        "Capacity",
+    )
+    assert deltas(table, "a")["b"].to_dict() == {"gas": 40.0, "solar": 0.0}
+
+
+def test_line_energy_counts_both_directions(network):
+    network.lines_t["p0"] = pd.DataFrame(
+        {"l0": [5.0, -5.0] * 12, "l1": 1.0}, index=network.snapshots
+    )
+    variant = NetworkVariant("a", network)
+    assert variant.metric("lines", "Energy").to_dict() == {"l0": 120.0, "l1": 24.0}
+
+
+def test_dispatch_deltas(network):
+    other = network.copy()
+    other.generators_t["p"] = network.generators_t["p"] * 2
+    result = dispatch_deltas(
+        [NetworkVariant("a", network), NetworkVariant("b", other)], "generators", "a"
+    )
+    assert (result["b"]["gas"] == 6.0).all()
+    assert (result["b"]["solar"] == 4.0).all()
@@ -0,0 +1,71 @@
+import gc
+
+import pandas as pd
+import pytest
+
+from _helpers import export
+from _helpers.export import frame_chunks, timeseries_chunks, write_chunks
+from views.export_panel import ExportFile
+
+
+@pytest.fixture
+def ts_df(network):
+    return network.generators_t["p"].rename_axis(index="snapshot", columns=None)
+
+
+def test_timeseries_chunks_window(ts_df):
+    chunks = list(timeseries_chunks(ts_df, ["gas0"], start=2, stop=12, chunk_rows=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert pd.concat(chunks).index.equals(ts_df.index[2:12])
+    assert list(chunks[0].columns) == ["gas0"]
+
+
+def test_timeseries_chunks_sum(ts_df):
+    total = pd.concat(timeseries_chunks(ts_df, aggregation="sum", chunk_rows=5))
+    assert (total["total"] == 10.0).all()
+
+
+@pytest.mark.parametrize(
+    ("fmt", "compression", "read"),
+    [
+        ("Parquet", "zstd", pd.read_parquet),
+        (
+            "CSV",
+            "gzip",
+            lambda path: pd.read_csv(
+                path, index_col=0, parse_dates=True, compression="gzip"
+            ),
+        ),
+        ("Excel", "none", lambda path: pd.read_excel(path, index_col=0)),
+    ],
+)
+def test_write_chunks_roundtrip(ts_df, tmp_path, fmt, compression, read):
+    path = tmp_path / "export"
+    assert write_chunks(
+        frame_chunks(ts_df, chunk_rows=7), fmt, path, compression
+    ) == len(ts_df)
+    # Excel stores whole floats as integers
+    pd.testing.assert_frame_equal(
+        read(path),
+        ts_df,
+        check_freq=False,
+        check_names=False,
+        check_dtype=fmt != "Excel",
+    )
+
+
+def test_excel_row_limit(ts_df, tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXCEL_MAX_ROWS", 10)
+    with pytest.raises(ValueError, match="at most 10 rows"):
+        write_chunks(
+            frame_chunks(ts_df, chunk_rows=7), "Excel", tmp_path / "export.xlsx"
+        )
+
+
+def test_export_file_is_removed_with_its_object(tmp_path):
+    export_file = ExportFile(tmp_path, "data.csv", params=())
+    export_file.path.write_text("a")
+    directory = export_file.directory
+    del export_file
+    gc.collect()
+    assert not directory.exists()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from _helpers import compute
+from _helpers.compute import heatmap_matrix
+
+
+def with_load(network, index, values):
+    network.set_snapshots(index)
+    network.loads_t["p"] = pd.DataFrame({"load1": values}, index=network.snapshots)
+    return network
+
+
+def test_day_by_hour(network):
+    with_load(
+        network,
+        pd.date_range("2030-01-01 12:00", periods=24, freq="h"),
+        np.arange(24.0),
+    )
+    matrix = heatmap_matrix(network, "loads", "p")
+    assert matrix.shape == (2, 24)
+    assert np.isnan(matrix.iloc[0, :12]).all()
+    assert matrix.iloc[0, 12] == 0.0
+    assert matrix.iloc[1, 11] == 23.0
+
+
+def test_coarse_snapshots_hold_for_their_interval_only(network):
+    index = pd.date_range("2030-01-01", periods=8, freq="3h").delete(4)
+    with_load(network, index, np.arange(7.0))
+    day = heatmap_matrix(network, "loads", "p").iloc[0]
+    assert day[:12].tolist() == [0.0] * 3 + [1.0] * 3 + [2.0] * 3 + [3.0] * 3
+    # The snapshot at 12:00 is missing, its hours are not filled from 09:00
+    assert np.isnan(day[12:15]).all()
+    assert day[15:].tolist() == [4.0] * 3 + [5.0] * 3 + [6.0] * 3
+
+
+def test_week_by_hour(network):
+    with_load(network, pd.date_range("2030-01-07", periods=14 * 24, freq="h"), 1.0)
+    matrix = heatmap_matrix(network, "loads", "p", layout="week")
+    assert matrix.shape == (2, 24)
+    assert (matrix == 1.0).all().all()
+
+
+@pytest.mark.parametrize("day, hours", [("2030-03-31", 23), ("2030-10-27", 25)])
+def test_daylight_saving_days(network, monkeypatch, day, hours):
+    # PyPSA keeps snapshots naive, time zone aware series come from other sources
+    series = pd.Series(
+        1.0, index=pd.date_range(day, periods=hours, freq="h", tz="Europe/Berlin")
+    )
+    monkeypatch.setattr(compute, "heatmap_series", lambda *args: series)
+    matrix = heatmap_matrix(network, "loads", "p")
+    assert matrix.shape == (1, 24)
+    # The hour skipped in spring stays empty
+    assert matrix.iloc[0].count() == min(hours, 24)
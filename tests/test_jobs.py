@@ -0,0 +1,53 @@
+import threading
+import time
+
+from _helpers.jobs import JobExecutor
+
+
+def test_jobs_are_shared_by_key():
+    executor = JobExecutor(max_workers=1)
+    a = executor.submit("a", "key", sum, [1, 2])
+    b = executor.submit("b", "key", sum, [1, 2])
+    assert a is b
+    assert a.result() == 3
+
+
+def test_jobs_of_other_sessions_are_not_cancelled():
+    executor = JobExecutor(max_workers=1)
+    gate = threading.Event()
+    executor.submit("blocker", "blocker", gate.wait)
+    future = executor.submit("a", "key", sum, [1, 2])
+    executor.submit("b", "key", sum, [1, 2])
+
+    executor.cancel_stale("a", [])
+    assert not future.cancelled()
+    executor.cancel_stale("b", [])
+    assert future.cancelled()
+    assert len(executor) == 1
+    gate.set()
+
+
+def test_released_results_are_dropped():
+    executor = JobExecutor(max_workers=1)
+    executor.submit("a", "key", sum, [1, 2]).result()
+    executor.cancel_stale("a", ["key"])
+    assert len(executor) == 1
+    executor.cancel_stale("a", [])
+    assert len(executor) == 0
+
+
+def test_failed_jobs_are_retried():
+    executor = JobExecutor(max_workers=1)
+    failed = executor.submit("a", "key", lambda: 1 / 0)
+    assert isinstance(failed.exception(), ZeroDivisionError)
+    retried = executor.submit("a", "key", lambda: 1)
+    assert retried is not failed
+    assert retried.result() == 1
+
+
+def test_groups_of_closed_sessions_expire():
+    executor = JobExecutor(max_workers=1, group_ttl=0.01)
+    executor.submit("closed", "key", sum, [1, 2]).result()
+    time.sleep(0.02)
+    executor.submit("open", "other", sum, [3])
+    assert len(executor) == 1
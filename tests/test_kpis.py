@@ -0,0 +1,47 @@
+import pandas as pd
+import pypsa
+import pytest
+
+from _helpers.kpis import period_summary, system_kpis
+
+
+def test_energy_and_cost_weightings(network):
+    # Two-hourly snapshots in the objective, hourly energy
+    network.snapshot_weightings["objective"] = 2.0
+    kpis = system_kpis(network).loc["all"]
+
+    assert kpis.at["gas", "Generation (MWh)"] == pytest.approx(24 * 6.0)
+    assert kpis.at["solar", "Generation (MWh)"] == pytest.approx(24 * 4.0)
+    assert kpis.at["gas", "Operational cost"] == pytest.approx(
+        2 * 24 * (2.0 * 50 + 4.0 * 60)
+    )
+    assert kpis.at["gas", "Capacity factor"] == pytest.approx(6.0 / 60.0)
+
+
+def test_variable_generators_are_curtailed(network):
+    network.generators_t["p_max_pu"] = pd.DataFrame(
+        {"solar0": 0.5}, index=network.snapshots
+    )
+    kpis = system_kpis(network).loc["all"]
+    assert kpis.at["solar", "Curtailment (MWh)"] == pytest.approx(
+        24 * (0.5 * 10.0 - 1.0)
+    )
+
+
+def test_storage_cycles_per_period():
+    n = pypsa.Network()
+    snapshots = pd.date_range("2030-01-01", periods=4, freq="h")
+    n.set_snapshots(pd.MultiIndex.from_product([[2030, 2040], snapshots]))
+    n.investment_periods = [2030, 2040]
+    n.add("Carrier", ["AC", "battery"])
+    n.add("Bus", "b0", carrier="AC")
+    n.add(
+        "StorageUnit", "battery", bus="b0", carrier="battery", p_nom=1.0, max_hours=2.0
+    )
+    n.storage_units_t["p_dispatch"] = pd.DataFrame(
+        {"battery": [1.0] * 4 + [0.5] * 4}, index=n.snapshots
+    )
+
+    cycles = system_kpis(n).xs("battery", level="carrier")["Storage cycles"]
+    assert cycles.to_dict() == pytest.approx({2030: 4.0 / 2.0, 2040: 2.0 / 2.0})
+    assert list(period_summary(n).index) == [2030, 2040]
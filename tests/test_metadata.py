@@ -0,0 +1,43 @@
+from _helpers.metadata import flatten_meta, meta_diff, read_meta, search_meta
+
+META = {
+    "scenario": {"clusters": [37, 128], "opts": ""},
+    "solving": {"options": {"noisy_costs": True}, "solver": "gurobi"},
+}
+
+
+def test_flatten_meta():
+    flat = flatten_meta(META)
+    assert flat.at["scenario.clusters[1]", "value"] == "128"
+    assert flat.at["scenario.clusters", "children"] == 2
+    assert flat.at["solving.options.noisy_costs", "parent"] == "solving.options"
+
+
+def test_search_skips_section_summaries():
+    flat = flatten_meta(META)
+    assert search_meta(flat, "items").empty
+    assert list(search_meta(flat, "gurobi").index) == ["solving.solver"]
+    assert "solving.options" in search_meta(flat, "options").index
+
+
+def test_meta_diff():
+    other = {
+        "scenario": {"clusters": [37, 256], "opts": {"co2": 0.05}},
+        "solving": {"options": {"noisy_costs": True}},
+        "run": "test",
+    }
+    diff = meta_diff(flatten_meta(META), flatten_meta(other))
+    assert diff["status"].to_dict() == {
+        "run": "added",
+        "scenario.clusters[1]": "changed",
+        "scenario.opts": "changed",
+        "solving.solver": "removed",
+    }
+    assert diff.at["scenario.opts", "right"] == "1 items"
+
+
+def test_read_meta_from_file(network, tmp_path):
+    network.meta = META
+    path = tmp_path / "network.nc"
+    network.export_to_netcdf(path)
+    assert read_meta(path) == META
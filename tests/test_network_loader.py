@@ -0,0 +1,37 @@
+import os
+import time
+from types import SimpleNamespace
+
+from _helpers import network_loader
+from _helpers.network_loader import save_upload
+
+
+def _upload(data):
+    return SimpleNamespace(getbuffer=lambda: memoryview(data))
+
+
+def _age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_old_uploads_are_swept(tmp_path):
+    old = save_upload(_upload(b"old"), tmp_path / "old.nc")
+    (tmp_path / "old.nc.explorer").mkdir()
+    used = save_upload(_upload(b"used"), tmp_path / "used.nc")
+    _age(old, network_loader.UPLOAD_MAX_AGE + 60)
+    _age(used, network_loader.UPLOAD_MAX_AGE + 60)
+    # Saving an existing upload again marks it as used
+    save_upload(_upload(b"used"), used)
+
+    save_upload(_upload(b"new"), tmp_path / "new.nc")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.nc", "used.nc"]
+
+
+def test_least_recently_used_uploads_are_swept(tmp_path, monkeypatch):
+    monkeypatch.setattr(network_loader, "UPLOAD_MAX_BYTES", 10)
+    for i, name in enumerate(["a.nc", "b.nc", "c.nc"]):
+        _age(save_upload(_upload(b"1234"), tmp_path / name), 60 - i)
+
+    save_upload(_upload(b"1234"), tmp_path / "d.nc")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["c.nc", "d.nc"]
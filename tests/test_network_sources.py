@@ -0,0 +1,84 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from _helpers import network_sources
+from _helpers.network_sources import (
+    DATA_DIR_VARIABLE,
+    allowed,
+    data_dir,
+    directory_index,
+    read_local_network,
+)
+
+
+@pytest.fixture
+def results(tmp_path, monkeypatch, network):
+    """A data directory with a NetCDF file, a CSV folder and a zipped CSV folder."""
+    root = tmp_path / "results"
+    root.mkdir()
+    network.export_to_netcdf(root / "base.nc")
+    (root / "runs").mkdir()
+    network.export_to_csv_folder(root / "runs" / "csv")
+    with zipfile.ZipFile(root / "zipped.zip", "w") as archive:
+        for file in (root / "runs" / "csv").iterdir():
+            archive.write(file, f"csv/{file.name}")
+    monkeypatch.setenv(DATA_DIR_VARIABLE, str(root))
+    return root
+
+
+def test_data_dir_defaults_to_working_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv(DATA_DIR_VARIABLE, raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert data_dir() == tmp_path.resolve()
+    assert allowed(tmp_path / "results")
+    assert not allowed("/")
+
+
+def test_directory_index(results):
+    index = directory_index(results)
+    assert index["format"].to_dict() == {
+        "base.nc": "netcdf",
+        "runs/csv": "csv",
+        "zipped.zip": "zip",
+    }
+    assert (index["buses"] == 3).all()
+    assert (index["generators"] == 4).all()
+
+
+def test_symlinks_out_of_the_data_directory_are_skipped(results, tmp_path, network):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    network.export_to_netcdf(outside / "secret.nc")
+    (results / "link").symlink_to(outside, target_is_directory=True)
+    (results / "secret.nc").symlink_to(outside / "secret.nc")
+    assert list(directory_index(results).index) == ["base.nc", "runs/csv", "zipped.zip"]
+    with pytest.raises(ValueError, match="outside"):
+        read_local_network(str(results / "secret.nc"), "netcdf")
+
+
+def test_unreadable_entries_are_skipped(results, monkeypatch):
+    iterdir = Path.iterdir
+
+    def denied(path):
+        if path.name == "runs":
+            raise PermissionError(path)
+        return iterdir(path)
+
+    monkeypatch.setattr(Path, "iterdir", denied)
+    assert list(directory_index(results).index) == ["base.nc", "zipped.zip"]
+
+
+def test_archives_are_extracted_once_and_within_limits(results, monkeypatch, tmp_path):
+    monkeypatch.setattr(network_sources.tempfile, "gettempdir", lambda: str(tmp_path))
+    network = read_local_network(str(results / "zipped.zip"), "zip")
+    assert len(network.buses) == 3
+    assert len(list((tmp_path / "pypsa_explorer_archives").iterdir())) == 1
+
+    monkeypatch.setattr(network_sources, "MAX_EXTRACT_BYTES", 10)
+    (results / "zipped.zip").touch()
+    with pytest.raises(ValueError, match="extracted at most"):
+        read_local_network(str(results / "zipped.zip"), "zip")
+    # Nothing is left behind by the refused extraction
+    assert len(list((tmp_path / "pypsa_explorer_archives").iterdir())) == 1
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from _helpers.compute import (
+    network_attributes,
+    period_ranges,
+    period_slice,
+    period_totals,
+)
+
+
+def multi_period_network(periods):
+    n = pypsa.Network()
+    timesteps = pd.date_range("2030-01-01", periods=len(periods), freq="h")
+    n.set_snapshots(pd.MultiIndex.from_arrays([periods, timesteps]))
+    n.add("Carrier", ["AC", "gas"])
+    n.add("Bus", "b0", carrier="AC")
+    n.add("Generator", "gas0", bus="b0", carrier="gas", p_nom=10.0)
+    n.generators_t["p"] = pd.DataFrame(
+        {"gas0": np.arange(len(periods), dtype=float)}, index=n.snapshots
+    )
+    return n
+
+
+def test_contiguous_periods_are_slices():
+    n = multi_period_network([2030, 2030, 2040, 2040])
+    assert period_ranges(n) == {2030: slice(0, 2), 2040: slice(2, 4)}
+    assert period_slice(n, n.generators_t["p"], 2040)["gas0"].tolist() == [2.0, 3.0]
+
+
+@pytest.fixture
+def interleaved():
+    return multi_period_network([2030, 2040, 2030, 2040])
+
+
+def test_interleaved_periods(interleaved):
+    assert period_slice(interleaved, interleaved.generators_t["p"], 2040)[
+        "gas0"
+    ].tolist() == [1.0, 3.0]
+    assert period_totals(interleaved).loc[:, "gas"].to_dict() == {2030: 2.0, 2040: 4.0}
+
+
+def test_attributes_of_interleaved_periods(interleaved):
+    attributes = network_attributes(interleaved)
+    assert attributes["Snapshots per period"] == {2030: 2, 2040: 2}
+    assert set(attributes["Period time ranges"]) == {2030, 2040}
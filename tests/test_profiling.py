@@ -0,0 +1,43 @@
+import threading
+import tracemalloc
+
+from _helpers.profiling import Trace, profiled, span
+
+
+@profiled
+def allocate():
+    return bytearray(1_000_000)
+
+
+def test_spans_nest():
+    with Trace(track_memory=False) as trace:
+        with span("outer"):
+            allocate()
+    names = [s.name for s in trace.spans]
+    assert names == ["rerun", "outer", "test_profiling.allocate"]
+    outer = trace.spans[1]
+    assert outer.self_ms <= outer.wall_ms
+    assert trace.spans[2].payload_bytes is None
+    assert trace.spans[2].peak_bytes is None
+
+
+def test_one_trace_records_memory_at_a_time():
+    first = Trace(track_memory=True).start()
+    second = Trace(track_memory=True)
+    # Traces of other sessions run in other threads with their own context
+    thread = threading.Thread(target=second.start)
+    thread.start()
+    thread.join()
+    assert first.track_memory
+    assert not second.track_memory
+
+    allocate()
+    first.finish()
+    second.finish()
+    assert first.spans[-1].peak_bytes >= 1_000_000
+    # tracemalloc stays on for the next trace instead of being stopped under it
+    assert tracemalloc.is_tracing()
+    third = Trace(track_memory=True).start()
+    assert third.track_memory
+    third.finish()
+    tracemalloc.stop()
@@ -0,0 +1,84 @@
+import pytest
+
+from _helpers import query_engine
+from _helpers.query_engine import QueryEngine, QueryError
+
+
+def test_query_filters_static_table(network):
+    result = QueryEngine(network).query("generators", "carrier == 'gas' and p_nom > 30")
+    assert list(result.frame["name"]) == ["gas2"]
+    assert not result.truncated
+
+
+def test_query_caps_rows(network):
+    result = QueryEngine(network).query("generators_t_p", "solar0 > 0", limit=5)
+    assert len(result.frame) == 5
+    assert result.truncated
+
+
+def test_query_stops_at_row_cap(network, monkeypatch):
+    monkeypatch.setattr(query_engine, "QUERY_CHUNK_ROWS", 4)
+    result = QueryEngine(network).query("generators_t_p", "solar0 > 0", limit=3)
+    assert len(result.frame) == 3
+    assert result.truncated
+
+
+def test_query_times_out(network, monkeypatch):
+    monkeypatch.setattr(query_engine, "QUERY_CHUNK_ROWS", 1)
+    with pytest.raises(QueryError, match="cancelled"):
+        QueryEngine(network).query("generators_t_p", "solar0 > 0", timeout=-1)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "p_nom > @limit",
+        "__import__('os')",
+        "carrier.to_csv('{path}') == carrier",
+        "p_nom.to_pickle('{path}') > 0",
+        "carrier.str.contains('gas').to_csv('{path}')",
+        "carrier.str.cat(sep='{path}') == carrier",
+        "p_nom.isin(p_nom.to_csv('{path}'))",
+        "p_nom.pipe(print) > 0",
+        "carrier.__class__ == carrier",
+        "[c for c in carrier]",
+        "(lambda: 1)() > 0",
+    ],
+)
+def test_query_rejects_escapes(network, tmp_path, expression):
+    path = tmp_path / "pwned"
+    with pytest.raises(QueryError):
+        QueryEngine(network).query("generators", expression.format(path=path))
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    "expression, names",
+    [
+        ("carrier.str.startswith('so') and p_nom.between(5, 15)", ["solar0"]),
+        ("carrier.isin(['gas']) & ~(p_nom < 30)", ["gas2"]),
+        ("`marginal_cost` > 55", ["gas2"]),
+        ("p_nom > p_nom.mean()", ["solar1", "gas2"]),
+    ],
+)
+def test_query_allows_column_methods(network, expression, names):
+    assert (
+        list(QueryEngine(network).query("generators", expression).frame["name"])
+        == names
+    )
+
+
+def test_sql_select(network):
+    result = QueryEngine(network).sql(
+        "SELECT carrier, sum(p_nom) AS p_nom FROM generators GROUP BY carrier ORDER BY carrier"
+    )
+    assert result.frame.set_index("carrier")["p_nom"].to_dict() == {
+        "gas": 60.0,
+        "solar": 40.0,
+    }
+
+
+@pytest.mark.parametrize("statement", ["DROP TABLE generators", "SELECT 1; SELECT 2"])
+def test_sql_rejects_other_statements(network, statement):
+    with pytest.raises(QueryError):
+        QueryEngine(network).sql(statement)
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from _helpers.readonly import derived, read_only
+
+
+@pytest.fixture(autouse=True)
+def copy_on_write():
+    with pd.option_context("mode.copy_on_write", True):
+        yield
+
+
+def test_tables_are_copies(network):
+    shared = read_only(network)
+    generators = shared.generators
+    generators.loc["gas2", "p_nom"] = 0.0
+    shared.generators_t["p"].loc[:, "gas2"] = 0.0
+    shared.static("generators").loc["gas0", "p_nom"] = 0.0
+    assert network.generators.at["gas2", "p_nom"] == 40.0
+    assert network.generators.at["gas0", "p_nom"] == 20.0
+    assert (network.generators_t["p"]["gas2"] == 4.0).all()
+
+
+def test_meta_is_a_copy(network):
+    network.meta = {"scenario": {"name": "base"}}
+    shared = read_only(network)
+    shared.meta["scenario"]["name"] = "changed"
+    assert network.meta["scenario"]["name"] == "base"
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["add", "remove", "set_snapshots", "determine_network_topology", "optimize"],
+)
+def test_mutating_methods_are_blocked(network, method):
+    with pytest.raises(AttributeError, match="read-only"):
+        getattr(read_only(network), method)
+
+
+def test_assignment_is_blocked(network):
+    with pytest.raises(AttributeError):
+        read_only(network).generators = pd.DataFrame()
+
+
+def test_derived_is_memoized(network):
+    calls = []
+
+    @derived
+    def total(n):
+        calls.append(1)
+        return n.generators["p_nom"].sum()
+
+    shared = read_only(network)
+    assert total(shared) == total(shared) == 100.0
+    assert len(calls) == 1
@@ -0,0 +1,41 @@
+import pytest
+
+from _helpers.regions import (
+    from_bus_column,
+    from_csv,
+    regional_capacity,
+    regional_timeseries,
+)
+
+
+def test_capacity_by_region(network):
+    network.buses["country"] = ["DE", "DE", "FR"]
+    capacity = regional_capacity(network, from_bus_column(network, "country"))
+    assert capacity.to_dict("index") == {
+        "DE": {"gas": 20.0, "solar": 40.0},
+        "FR": {"gas": 40.0, "solar": 0.0},
+    }
+
+
+def test_timeseries_by_region(network):
+    mapping = from_csv(b"bus,region\nb0,north\nb1,north\nb2,south\nb2,south\n", "hash")
+    regional = regional_timeseries(network, mapping, "generators", "p")
+    assert (regional["north"] == 6.0).all()
+    assert (regional["south"] == 4.0).all()
+
+    average = regional_timeseries(network, mapping, "generators", "p", how="mean")
+    assert (average["north"] == 2.0).all()
+
+
+def test_unmapped_buses_are_left_out(network):
+    mapping = from_csv(b"bus,region\nb2,south\n", "hash")
+    # The only load is at b1
+    assert list(regional_timeseries(network, mapping, "loads", "p").columns) == []
+    assert list(regional_timeseries(network, mapping, "generators", "p").columns) == [
+        "south"
+    ]
+
+
+def test_buses_in_two_regions_are_rejected():
+    with pytest.raises(ValueError, match="b1"):
+        from_csv(b"bus,region\nb0,north\nb1,north\nb1,south\n", "hash")
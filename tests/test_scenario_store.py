@@ -0,0 +1,117 @@
+import os
+
+import pandas as pd
+import pytest
+
+from _helpers.scenario_store import ScenarioStore, scenario_sources
+from _helpers.visualization import combined_from_store, stats_from_store
+
+
+def statistics(scale):
+    index = pd.MultiIndex.from_tuples(
+        [("Generator", "Solar"), ("Generator", "Gas"), ("StorageUnit", "Battery")]
+    )
+    columns = pd.MultiIndex.from_product(
+        [["Optimal Capacity", "Supply"], ["2030", "2040"]]
+    )
+    return (
+        pd.DataFrame(
+            [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0], [9.0, 10.0, 11.0, 12.0]],
+            index,
+            columns,
+        )
+        * scale
+    )
+
+
+@pytest.fixture
+def scenarios(tmp_path):
+    """Two scenario folders and a comparison YAML naming them by relative paths."""
+    for name, scale in [("base_low", 1), ("high_low", 2)]:
+        folder = tmp_path / "results" / name / "statistics"
+        folder.mkdir(parents=True)
+        statistics(scale).to_csv(folder / "statistics.csv")
+        statistics(10 * scale).to_csv(folder / "statistics_regional.csv")
+    config = tmp_path / "compare.yaml"
+    config.write_text(
+        "scenarios:\n  - {name: base_low, path: results/base_low}\n  - {name: high_low, path: results/high_low}\n",
+    )
+    return config
+
+
+def test_refresh_only_reads_changed_scenarios(scenarios):
+    sources, store_dir = scenario_sources(scenarios)
+    assert store_dir == scenarios.parent / ".scenario_store"
+    store = ScenarioStore(store_dir)
+    assert store.refresh(sources) == ["base_low", "high_low"]
+    assert store.refresh(sources) == []
+
+    changed = (
+        scenarios.parent / "results" / "high_low" / "statistics" / "statistics.csv"
+    )
+    statistics(3).to_csv(changed)
+    os.utime(changed, ns=(0, 0))
+    assert store.refresh(sources) == ["high_low"]
+    # A new store on the same directory starts from the saved table
+    reopened = ScenarioStore(store_dir)
+    assert reopened.refresh(sources) == []
+    assert reopened.select("Supply", "2040", ["high_low"])["high_low"].sum() == 3 * (
+        4 + 8 + 12
+    )
+
+
+def test_select_ignores_missing_labels(scenarios):
+    sources, store_dir = scenario_sources(scenarios)
+    store = ScenarioStore(store_dir)
+    store.refresh(sources)
+    values = store.select(
+        "Optimal Capacity",
+        "2030",
+        ["base_low", "other"],
+        ["Generator", "StorageUnit", "Link"],
+    )
+    assert sorted(values.to_numpy()) == [1.0, 5.0, 9.0]
+    table = store.wide("Optimal Capacity", "2030", components=["Generator", "Link"])
+    assert table.to_dict("index") == {
+        "Gas": {"base_low": 5.0, "high_low": 10.0},
+        "Solar": {"base_low": 1.0, "high_low": 2.0},
+    }
+
+
+def test_statistics_tables_round_trip(scenarios):
+    sources, store_dir = scenario_sources(scenarios)
+    store = ScenarioStore(store_dir)
+    store.refresh(sources)
+    assert store.tables("base_low") == ["statistics", "statistics_regional"]
+    stats = stats_from_store(store, {"base_low": "Base_low"})
+    assert list(stats) == ["Base_low", "high_low"]
+    pd.testing.assert_frame_equal(
+        stats["Base_low"]["statistics_regional"].sort_index().sort_index(axis=1),
+        statistics(10).sort_index().sort_index(axis=1),
+    )
+
+
+def test_combined_from_store_uses_aliases(scenarios):
+    sources, store_dir = scenario_sources(scenarios)
+    store = ScenarioStore(store_dir)
+    store.refresh(sources)
+    carriers = pd.DataFrame(
+        index=pd.Index(["Solar", "Gas", "Battery"], name="nice_name")
+    )
+    combined = combined_from_store(
+        store,
+        "Optimal Capacity",
+        carriers,
+        scenarios=["High_low", "base_low"],
+        variable_units="%",
+        alias_dict={"high_low": "High_low"},
+    )
+    assert list(combined["Scenario"].unique()) == ["High_low", "base_low"]
+    high = combined.loc[
+        (combined["Scenario"] == "High_low") & (combined["horizon"] == "2030")
+    ]
+    assert high.set_index("nice_name")["statistics"].to_dict() == {
+        "Solar": 2.0,
+        "Gas": 10.0,
+        "Battery": 18.0,
+    }
@@ -0,0 +1,66 @@
+import inspect
+from pathlib import Path
+
+from _helpers import sidecar
+from _helpers.artifacts import PRECOMPUTABLE, attached, detach
+from _helpers.fingerprint import register_fingerprint
+from _helpers.readonly import read_only
+from _helpers.sidecar import (
+    SIDECAR_ARTIFACTS,
+    attach_sidecar,
+    file_hash,
+    read_sidecar,
+    write_sidecar,
+)
+
+
+def _upload(network, tmp_path, content_hash):
+    path = tmp_path / "network.nc"
+    network.export_to_netcdf(path)
+    upload = read_only(network)
+    register_fingerprint(upload, f"file:{content_hash}")
+    return upload, path
+
+
+def test_sidecar_roundtrip(network, tmp_path):
+    path = tmp_path / "network.nc"
+    network.export_to_netcdf(path)
+    sidecar = write_sidecar(network, path)
+    assert len(sidecar.manifest["artifacts"]) + len(sidecar.manifest["skipped"]) <= len(
+        SIDECAR_ARTIFACTS
+    )
+    assert sidecar.get("component_counts") is not None
+    assert read_sidecar(path).manifest["content_hash"] == file_hash(path)
+
+
+def test_sidecar_of_other_upload_is_ignored(network, tmp_path):
+    upload, path = _upload(network, tmp_path, "a" * 64)
+    write_sidecar(upload, path)
+    assert read_sidecar(path, "a" * 64) is not None
+
+    other = read_only(network)
+    register_fingerprint(other, f"file:{'b' * 64}")
+    assert attach_sidecar(other, path) is None
+    assert attached(other) is None
+
+    assert attach_sidecar(upload, path) is not None
+    detach(upload)
+
+
+def test_sidecar_of_other_code_is_ignored(network, tmp_path, monkeypatch):
+    path = tmp_path / "network.nc"
+    network.export_to_netcdf(path)
+    write_sidecar(network, path)
+    assert read_sidecar(path) is not None
+
+    monkeypatch.setattr(sidecar, "APP_VERSION", sidecar._code_version() + "-changed")
+    assert read_sidecar(path) is None
+
+
+def test_code_version_covers_precomputable_modules():
+    sources = {inspect.getsourcefile(inspect.unwrap(f)) for f in PRECOMPUTABLE.values()}
+    assert {Path(s).name for s in sources} >= {
+        "compute.py",
+        "kpis.py",
+        "extract_data.py",
+    }
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from _helpers.storage import _run_lengths, duration_histogram, storage_statistics
+
+
+def test_run_lengths_do_not_cross_columns():
+    state = np.array([[1, 1], [1, -1], [0, -1]], dtype=np.int8)
+    lengths, states = _run_lengths(state)
+    # Column 0: 1 1 0 | separator 0; column 1: 1 -1 -1 | separator 0
+    assert list(zip(lengths, states)) == [(2, 1), (2, 0), (1, 1), (2, -1), (1, 0)]
+
+
+@pytest.fixture
+def battery(network):
+    network.add("Carrier", "battery")
+    network.add(
+        "StorageUnit", "battery", bus="b1", carrier="battery", p_nom=2.0, max_hours=4.0
+    )
+    p = [2.0] * 3 + [0.0] * 3 + [-1.0] * 6 + [0.0] * 12
+    network.storage_units_t["p"] = pd.DataFrame({"battery": p}, index=network.snapshots)
+    return network
+
+
+def test_storage_statistics(battery):
+    statistics = storage_statistics(battery).loc[("storage_units", "battery")]
+    assert statistics["discharged (MWh)"] == 6.0
+    assert statistics["charged (MWh)"] == 6.0
+    assert statistics["equivalent full cycles"] == pytest.approx(6.0 / 8.0)
+    assert statistics["utilization"] == pytest.approx(9 / 24)
+
+
+def test_duration_histogram(battery):
+    battery.snapshot_weightings.loc[:, :] = 2.0
+    histogram = duration_histogram(battery)
+    # One discharge of 3 and one charge of 6 two-hour snapshots
+    assert histogram.to_dict("index") == {
+        6.0: {"charging": 0.0, "discharging": 1.0},
+        12.0: {"charging": 1.0, "discharging": 0.0},
+    }
+
+
+@pytest.fixture
+def multi_period(battery):
+    timesteps = battery.snapshots
+    p = battery.storage_units_t["p"]["battery"].to_numpy()
+    battery.set_snapshots(pd.MultiIndex.from_product([[2030, 2040], timesteps]))
+    battery.investment_periods = [2030, 2040]
+    battery.storage_units_t["p"] = pd.DataFrame(
+        {"battery": np.tile(p, 2)}, index=battery.snapshots
+    )
+    battery.storage_units_t["state_of_charge"] = (
+        battery.storage_units_t["p"].cumsum() * -1 + 6
+    )
+    return battery
+
+
+def test_multi_period_statistics(multi_period):
+    statistics = storage_statistics(multi_period).loc[("storage_units", "battery")]
+    # Cycles are averaged over the two periods
+    assert statistics["equivalent full cycles"] == pytest.approx(6.0 / 8.0)
+
+
+def test_storage_view_with_investment_periods(multi_period):
+    from streamlit.testing.v1 import AppTest
+
+    def app(network):
+        from views.storage_view import show_storage_view
+
+        show_storage_view(network)
+
+    at = AppTest.from_function(app, args=(multi_period,)).run()
+    assert not at.exception
+    assert at.selectbox[0].options == ["2030", "2040"]
+    at.selectbox[0].select("2040").run()
+    assert not at.exception
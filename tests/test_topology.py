@@ -0,0 +1,43 @@
+import pytest
+
+from _helpers.readonly import read_only
+from _helpers.topology import shortest_path, topology_summary
+
+
+@pytest.fixture
+def linked(network):
+    """The three-bus line plus a DC bus linked to both ends."""
+    network.add("Bus", "dc", carrier="DC")
+    network.add("Link", ["k0", "k2"], bus0=["b0", "dc"], bus1=["dc", "b2"], p_nom=10.0)
+    return network
+
+
+def test_summary_counts(linked):
+    linked.add("Bus", "isolated", carrier="AC")
+    summary = topology_summary(linked)
+    assert summary["Islands"] == 2
+    assert isinstance(summary["Islands"], int)
+    assert summary["Isolated buses"] == 1
+    # The DC bus is not part of an AC sub-network
+    assert summary["AC sub-networks"] == 2
+    assert summary["Branches"] == 4
+
+
+def test_links_do_not_shortcut_lines(linked):
+    # Both routes have two branches; each link weighs as much as the median line
+    path, distance = shortest_path(linked, "b0", "b2")
+    assert len(path) == 3
+    assert distance == pytest.approx(0.2)
+
+
+def test_paths_from_a_cached_source(linked):
+    shared = read_only(linked)
+    assert shortest_path(shared, "b0", "b1") == (["b0", "b1"], pytest.approx(0.1))
+    assert shortest_path(shared, "b0", "b0") == (["b0"], 0.0)
+    shared_path, _ = shortest_path(shared, "b0", "b2")
+    assert shared_path[0] == "b0" and shared_path[-1] == "b2"
+
+
+def test_disconnected_buses(network):
+    network.add("Bus", "isolated")
+    assert shortest_path(network, "b0", "isolated") == (None, float("inf"))
@@ -0,0 +1,61 @@
+"""Streamlit glue for computing view results in the background."""
+
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+from _helpers.jobs import JobExecutor
+
+POLL_INTERVAL = 0.5
+
+
+@st.cache_resource
+def job_executor():
+    return JobExecutor()
+
+
+def _session_key():
+    return st.session_state.setdefault("session_key", uuid.uuid4().hex)
+
+
+@contextmanager
+def background_jobs(view):
+    """Yield a ``submit(key, func, *args)`` for ``view``; jobs not submitted in this rerun are cancelled."""
+    executor = job_executor()
+    group = (_session_key(), view)
+    submitted = set()
+
+    def submit(key, func, *args, **kwargs):
+        submitted.add(key)
+        return executor.submit(group, key, func, *args, **kwargs)
+
+    try:
+        yield submit
+    finally:
+        executor.cancel_stale(group, submitted)
+
+
+def show_when_ready(future, render, message="Computing..."):
+    """Render the result of ``future`` now if it is done, otherwise show a placeholder until it is."""
+    if future.cancelled():
+        # Only happens when the executor shuts down, the next rerun submits the job again
+        st.warning("The computation was cancelled, rerun the app to try again.")
+        return
+    if future.done():
+        error = future.exception()
+        if error is not None:
+            # Failed jobs are submitted again on the next rerun
+            st.error(f"Computation failed: {error}")
+            return
+        render(future.result())
+        return
+
+    @st.fragment(run_every=POLL_INTERVAL)
+    def poll():
+        if future.done():
+            # A full rerun picks up the finished job and renders it in place
+            st.rerun()
+        st.info(message)
+
+    poll()
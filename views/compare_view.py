@@ -0,0 +1,92 @@
+import plotly.express as px
+import streamlit as st
+
+from _helpers.comparison import (
+    COMPARE_COMPONENTS,
+    COMPARE_METRICS,
+    align,
+    by_carrier,
+    deltas,
+    dispatch_deltas,
+    shared_columns,
+)
+from _helpers.figures import carrier_bars
+from _helpers.profiling import profiled
+
+
+@profiled
+def show_compare_view(variants):
+    st.header("Network Comparison")
+
+    if len(variants) < 2:
+        st.info(
+            "Please select at least two networks to compare using the sidebar options."
+        )
+        return
+
+    names = [v.name for v in variants]
+    if len(set(names)) < len(names):
+        st.error("Networks to compare must have distinct names.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        component = st.selectbox("Select component:", list(COMPARE_COMPONENTS))
+    with col2:
+        metric = st.selectbox("Select metric:", COMPARE_METRICS)
+    with col3:
+        reference = st.selectbox("Reference network:", names)
+
+    # Totals and deltas by carrier
+    st.subheader(f"{metric} by carrier")
+    carrier_table = by_carrier(variants, component, metric)
+    if carrier_table.empty:
+        st.info(f"No {component.replace('_', ' ')} found in the selected networks.")
+        return
+
+    carrier_deltas = deltas(carrier_table, reference)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(carrier_table)
+    with col2:
+        st.dataframe(
+            carrier_deltas.drop(columns=reference).add_suffix(f" - {reference}")
+        )
+
+    st.plotly_chart(
+        carrier_bars(
+            carrier_deltas.drop(columns=reference),
+            f"{metric} difference to {reference}",
+        )
+    )
+
+    # Per component changes
+    st.subheader(f"{metric} by component")
+    component_deltas = deltas(align(variants, component, metric), reference)
+    changed = component_deltas.drop(columns=reference)
+    changed = changed.loc[(changed.abs() > 1e-6).any(axis=1)]
+    if changed.empty:
+        st.info("No differences between the selected networks.")
+    else:
+        st.dataframe(changed)
+
+    # Dispatch over the snapshots shared by all networks
+    st.subheader("Dispatch difference by carrier")
+    dispatch = dispatch_deltas(variants, component, reference)
+    if dispatch.empty:
+        st.info("The selected networks have no dispatch data on common snapshots.")
+    else:
+        dispatch.columns = [f"{name}: {carrier}" for name, carrier in dispatch.columns]
+        fig = px.line(
+            dispatch,
+            x=dispatch.index.get_level_values(-1),
+            y=dispatch.columns,
+            title=f"Dispatch difference to {reference}",
+        )
+        st.plotly_chart(fig)
+
+    with st.expander("Memory"):
+        total, shared = shared_columns(variants)
+        st.write(
+            f"**Static columns held:** {total}, of which {shared} are shared between networks."
+        )
@@ -1,11 +1,137 @@
 import streamlit as st
 import yaml
 
+from _helpers.metadata import (
+    flat_meta,
+    flatten_meta,
+    meta_children,
+    meta_diff,
+    meta_yaml,
+    read_meta,
+    search_meta,
+)
+from _helpers.network_loader import (
+    SAMPLE_NETWORKS,
+    save_upload,
+    shared_sample_network,
+    upload_hash,
+    upload_path,
+)
+from _helpers.profiling import profiled
+
+# Sections listed per level of the tree, use search to reach the others
+MAX_SECTIONS = 200
+
+
+def show_meta_tree(flat):
+    """Browse the tree one level at a time, so only the open node is rendered."""
+    path = st.session_state.get("meta_path", "")
+    if path and path not in flat.index:
+        path = ""
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.write(f"**Path:** `{path or '(root)'}`")
+    with col2:
+        if path and st.button("⬆ Up", key="meta_up"):
+            st.session_state["meta_path"] = flat.at[path, "parent"]
+            st.rerun()
+
+    children = meta_children(flat, path)
+    sections = children.loc[children["children"] > 0]
+    if len(sections) > MAX_SECTIONS:
+        st.caption(f"Showing the first {MAX_SECTIONS} of {len(sections)} sections.")
+    for child, row in sections.head(MAX_SECTIONS).iterrows():
+        if st.button(f"📂 {row['key']} ({row['value']})", key=f"meta_open_{child}"):
+            st.session_state["meta_path"] = child
+            st.rerun()
+
+    leaves = children.loc[children["children"] == 0, ["key", "type", "value"]]
+    if not leaves.empty:
+        st.dataframe(leaves.set_index("key"), use_container_width=True)
+
+
+def show_meta_search(flat):
+    text = st.text_input("Search key paths and values:", placeholder="solving.options")
+    if not text:
+        return
+    matches = search_meta(flat, text)
+    st.caption(
+        f"{len(matches)} matches"
+        + (" (first 500 shown)" if len(matches) == 500 else "")
+    )
+    st.dataframe(matches[["type", "value"]], use_container_width=True)
+
+
+def other_meta():
+    """Flattened ``meta`` of a sample network or an uploaded network or config file, or ``None``."""
+    # Streamlit runs every tab, so nothing is downloaded or read until a source is chosen
+    source = st.radio(
+        "Compare with:", ["None", "Sample network", "Uploaded file"], horizontal=True
+    )
+    if source == "None":
+        return None
+    if source == "Sample network":
+        name = st.selectbox("Sample network:", SAMPLE_NETWORKS)
+        return flat_meta(shared_sample_network(name))
+
+    uploaded = st.file_uploader(
+        "Network (.nc) or config (.yaml, .json):", type=["nc", "yaml", "yml", "json"]
+    )
+    if uploaded is None:
+        return None
+    # Cache the flattened tree per upload, the network file itself is never loaded
+    cache = st.session_state.setdefault("meta_uploads", {})
+    content_hash = upload_hash(uploaded)
+    if content_hash not in cache:
+        if uploaded.name.endswith(".nc"):
+            # netCDF reads the header from the saved file, without a copy of the whole upload
+            meta = read_meta(save_upload(uploaded, str(upload_path(content_hash))))
+        else:
+            meta = yaml.safe_load(uploaded.getvalue())
+        cache.clear()
+        cache[content_hash] = flatten_meta(meta)
+    return cache[content_hash]
+
+
+def show_meta_diff(flat):
+    try:
+        other = other_meta()
+    except Exception as e:
+        st.error(f"Could not read metadata: {e}")
+        return
+    if other is None:
+        return
+    diff = meta_diff(flat, other)
+    if diff.empty:
+        st.info("The metadata is identical.")
+        return
+    counts = diff["status"].value_counts()
+    st.caption(", ".join(f"{n} {status}" for status, n in counts.items()))
+    st.dataframe(
+        diff.rename(columns={"left": "this network", "right": "other"}),
+        use_container_width=True,
+    )
+
+
+@profiled
 def show_config_view(network):
     st.title("Network Configuration")
-    st.write("Below is the configuration YAML dictionary stored in the network:")
 
-    config_dict = network.meta
-    config_yaml = yaml.dump(config_dict, default_flow_style=False)
-    
-    st.code(config_yaml, language='yaml')
+    flat = flat_meta(network)
+    if flat.empty:
+        st.info("No metadata is stored in this network.")
+        return
+    st.write(
+        f"The network's metadata holds {int((flat['children'] == 0).sum())} settings."
+    )
+
+    browse, search, compare = st.tabs(["Browse", "Search", "Compare"])
+    with browse:
+        show_meta_tree(flat)
+    with search:
+        show_meta_search(flat)
+    with compare:
+        show_meta_diff(flat)
+
+    st.download_button("Download YAML", meta_yaml(network), file_name="meta.yaml")
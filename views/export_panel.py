@@ -0,0 +1,170 @@
+"""Download of the data behind a view in Parquet, CSV or Excel.
+
+Exports are written to a file on the server. With Streamlit's static file
+serving enabled (``server.enableStaticServing`` in ``.streamlit/config.toml``)
+the file is written under ``static/exports`` and streamed to the browser
+from there; otherwise a download button reads it into memory, up to
+``DOWNLOAD_MAX_BYTES``. Files are removed when the export is replaced, its
+options change or the session ends, and files left behind by a server that
+stopped are removed after ``EXPORT_MAX_AGE`` seconds.
+"""
+
+import secrets
+import shutil
+import tempfile
+import time
+import weakref
+from pathlib import Path
+
+import streamlit as st
+
+from _helpers.export import EXPORT_FORMATS, export_filename, write_chunks
+from _helpers.fingerprint import fingerprint
+
+# Streamlit serves the static folder next to the app script under app/static
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+DOWNLOAD_MAX_BYTES = 200 * 1024**2
+
+EXPORT_MAX_AGE = 24 * 3600
+
+
+def static_serving():
+    return st.get_option("server.enableStaticServing")
+
+
+def export_directory():
+    if static_serving():
+        return STATIC_DIR / "exports"
+    return Path(tempfile.gettempdir()) / "pypsa_explorer_exports"
+
+
+class ExportFile:
+    """File of one export in its own unguessable folder, removed with the object."""
+
+    def __init__(self, directory, filename, params):
+        token = secrets.token_hex(16)
+        self.directory = Path(directory) / token
+        self.directory.mkdir(parents=True)
+        self.path = self.directory / filename
+        self.params = params
+        self.rows = 0
+        self.url = (
+            f"app/static/exports/{token}/{filename}"
+            if directory == STATIC_DIR / "exports"
+            else None
+        )
+        # Runs when the export is replaced or the session's state is dropped
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def discard(self):
+        self._finalizer()
+
+
+def _sweep(directory):
+    """Remove exports older than ``EXPORT_MAX_AGE``, e.g. of sessions of a server that stopped."""
+    if not directory.is_dir():
+        return
+    cutoff = time.time() - EXPORT_MAX_AGE
+    for folder in directory.iterdir():
+        try:
+            if folder.stat().st_mtime < cutoff:
+                shutil.rmtree(folder, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def show_export_panel(key, network, name, chunks, index=None, selection=()):
+    """Offer the rows produced by ``chunks(start, stop)`` for download.
+
+    ``index`` are the row labels, used to pick a time window. The export is
+    written to a file on the server and only offered for download while
+    ``selection`` (the view's filter) and the export options are unchanged.
+    """
+    with st.expander("Export data"):
+        col1, col2 = st.columns(2)
+        with col1:
+            fmt = st.selectbox("Format:", list(EXPORT_FORMATS), key=f"{key}_format")
+        with col2:
+            compression = st.selectbox(
+                "Compression:", EXPORT_FORMATS[fmt][1], key=f"{key}_compression"
+            )
+
+        start, stop = 0, None
+        if index is not None and len(index) > 1:
+            first, last = st.slider(
+                "Time window:",
+                0,
+                len(index) - 1,
+                (0, len(index) - 1),
+                key=f"{key}_window_{len(index)}",
+            )
+            st.caption(f"{index[first]} to {index[last]}")
+            start, stop = first, last + 1
+
+        params = (
+            fingerprint(network),
+            name,
+            tuple(selection),
+            fmt,
+            compression,
+            start,
+            stop,
+        )
+        state_key = f"{key}_export"
+        export = st.session_state.get(state_key)
+        if export is not None and export.params != params:
+            # The prepared file no longer matches the selection
+            export.discard()
+            export = st.session_state[state_key] = None
+
+        if st.button("Prepare export", key=f"{key}_prepare"):
+            if export is not None:
+                export.discard()
+                export = st.session_state[state_key] = None
+            directory = export_directory()
+            _sweep(directory)
+            new = ExportFile(directory, export_filename(name, fmt, compression), params)
+            written = False
+            try:
+                with st.spinner("Writing export..."):
+                    new.rows = write_chunks(
+                        chunks(start, stop), fmt, new.path, compression
+                    )
+                written = True
+            except (
+                ValueError,
+                TypeError,
+                OSError,
+            ) as e:  # e.g. Excel's row limit or mixed column types
+                st.error(f"Export failed: {e}")
+            finally:
+                if not written:
+                    new.discard()
+            if not written:
+                return
+            export = st.session_state[state_key] = new
+
+        if export is None or not export.path.exists():
+            return
+
+        size = export.path.stat().st_size
+        st.caption(f"{export.rows} rows · {size / 1e6:.1f} MB")
+        if export.url is not None:
+            st.markdown(
+                f'<a href="{export.url}" download="{export.path.name}">Download</a>',
+                unsafe_allow_html=True,
+            )
+        elif size <= DOWNLOAD_MAX_BYTES:
+            with open(export.path, "rb") as f:
+                st.download_button(
+                    "Download",
+                    data=f,
+                    file_name=export.path.name,
+                    key=f"{key}_download",
+                )
+        else:
+            st.warning(
+                f"Exports over {DOWNLOAD_MAX_BYTES / 1e6:.0f} MB are only offered with static file serving "
+                "(server.enableStaticServing) enabled.",
+            )
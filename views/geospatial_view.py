@@ -1,11 +1,24 @@
 import streamlit as st
-import plotly.express as px
 import pydeck as pdk
-import logging
-import random
 
+from _helpers.compute import capacity_by_carrier, component_map_data, component_table
+from _helpers.figures import bus_map, capacity_pie
+from _helpers.fingerprint import fingerprint
+from _helpers.profiling import profiled
+from _helpers.regions import region_map_data
+from _helpers.topology import island_map_data, topology_summary
+from views.background import background_jobs, show_when_ready
+from views.regions_panel import select_regions
 
+
+@profiled
 def show_geospatial_view(network):
+    # Map jobs of the previous selection are cancelled on every rerun, whichever branch runs
+    with background_jobs("Geospatial") as submit:
+        _show_geospatial_view(network, submit)
+
+
+def _show_geospatial_view(network, submit):
     st.header("Geospatial View")
 
     # Allow user to select which network component to view
@@ -22,18 +35,7 @@ def show_geospatial_view(network):
         ],
     )
 
-    # Get the corresponding dataframe
-    component_dfs = {
-        "Buses": network.buses,
-        "Lines": network.lines,
-        "Generators": network.generators,
-        "Loads": network.loads,
-        "Storage Units": network.storage_units,
-        "Links": network.links,
-        "Transformers": network.transformers,
-    }
-
-    df = component_dfs[component_type]
+    df = component_table(network, component_type)
 
     if len(df) == 0:
         st.info(f"No {component_type.lower()} found in this network.")
@@ -45,124 +47,85 @@ def show_geospatial_view(network):
         # Show the component on a map if coordinates are available
         if component_type == "Buses" and "x" in df.columns and "y" in df.columns:
             st.subheader("Bus Locations")
-
-            fig = px.scatter_mapbox(
-                df.reset_index(),
-                lat="y",
-                lon="x",
-                hover_name=df.index,
-                zoom=3,
-                height=500,
-            )
-            fig.update_layout(mapbox_style="open-street-map")
-            st.plotly_chart(fig)
+            st.plotly_chart(bus_map(df))
 
         # Additional component specific analysis
-        if component_type == "Generators" and len(network.generators) > 0:
+        if component_type == "Generators":
             st.subheader("Generator Capacity by Type")
 
-            # Group generators by carrier/type
-            if "carrier" in network.generators.columns:
-                gen_by_carrier = network.generators.groupby("carrier").sum()
-
-                if "p_nom" in gen_by_carrier.columns:
-                    fig = px.pie(
-                        gen_by_carrier.reset_index(),
-                        values="p_nom",
-                        names="carrier",
-                        title="Installed Capacity by Generator Type",
-                    )
-                    st.plotly_chart(fig)
-                else:
-                    st.info("Generator capacity (p_nom) information is not available.")
+            capacity = capacity_by_carrier(network)
+            if capacity is not None:
+                st.plotly_chart(capacity_pie(capacity))
             else:
-                st.info("Generator type information is not available.")
-
-        # Add a PyDeck map for visualization
-        if "x" in df.columns and "y" in df.columns:
-            st.subheader("Map Visualization")
-
-            map_data = df.rename(columns={"x": "lon", "y": "lat"})
-
-            # Add p_nom for elevation if available, otherwise use a constant value
-            if "p_nom" in map_data.columns:
-                logging.info("Using p_nom for elevation")
-                map_data["elevation"] = map_data["p_nom"]
-                max_elevation = max(
-                    1,
-                    map_data["elevation"].max(),
-                )  # Avoid division by zero
-                map_data["elevation_normalized"] = (
-                    map_data["elevation"] / max_elevation * 1000
+                st.info(
+                    "Generator type (carrier) or capacity (p_nom) information is not available."
                 )
-            else:
-                map_data["elevation_normalized"] = 100  # Default elevation
-
-            # Convert latitude and longitude to a format pydeck can use
-            map_data = map_data.reset_index()
-
-            # Define color mapping based on carrier type
-            def get_carrier_color(carrier):
-                """Return RGB color based on carrier type"""
-                carrier_colors = {
-                    "nuclear": [10, 230, 120],
-                    "onwind": [52, 152, 219],
-                    "solar": [241, 196, 15],
-                    "hydro": [41, 128, 185],
-                    "gas": [230, 126, 34],
-                    "CCGT": [127, 140, 141],
-                    "OCGT": [117, 130, 141],
-                    "coal": [17, 10, 161],
-                    "oil": [192, 57, 43],
-                    "biomass": [39, 174, 96],
-                    "geothermal": [142, 68, 173],
-                }
-                carrier_str = str(carrier).lower()
-                if carrier_str in carrier_colors:
-                    return carrier_colors[carrier_str]
-                else:
-                    # Generate a random color for unknown carrier types
-                    # Using seed based on carrier name for consistency
-                    random.seed(carrier_str)
-                    return [
-                        random.randint(50, 250),
-                        random.randint(50, 250),
-                        random.randint(50, 250),
-                    ]
-
-            # Check if carrier column exists and apply colors
-            if "carrier" in map_data.columns:
-                map_data["color"] = map_data["carrier"].apply(get_carrier_color)
-                get_color = "color"
-            else:
-                get_color = [255, 140, 0]
-
-            st.pydeck_chart(
-                pdk.Deck(
-                    map_style=None,
-                    initial_view_state=pdk.ViewState(
-                        latitude=map_data["lat"].mean(),
-                        longitude=map_data["lon"].mean(),
-                        zoom=5,
-                        pitch=50,
-                    ),
-                    layers=[
-                        pdk.Layer(
-                            "ScatterplotLayer",
-                            data=map_data,
-                            pickable=True,
-                            opacity=0.8,
-                            stroked=True,
-                            filled=True,
-                            radius_scale=30,
-                            radius_min_pixels=1,
-                            radius_max_pixels=100,
-                            line_width_min_pixels=1,
-                            get_position=["lon", "lat"],
-                            get_radius="elevation_normalized",
-                            get_fill_color=get_color,
-                            get_line_color=[0, 0, 0],
-                        ),
-                    ],
-                ),
+
+        # Regions are drawn at the mean location of their buses, sized by capacity
+        mapping = select_regions(network)
+        if mapping is not None and st.toggle("Show regions instead of buses"):
+            show_map(region_map_data(network, mapping))
+            return
+
+        # Color buses by island to spot disconnected parts of the grid
+        if component_type == "Buses" and topology_summary(network)["Islands"] > 1:
+            if st.toggle("Color buses by island"):
+                show_map(island_map_data(network))
+                return
+
+        # Prepare the PyDeck map in the background, along with the maps users
+        # usually look at next
+        futures = {
+            label: submit(
+                (fingerprint(network), "component_map_data", label),
+                component_map_data,
+                network,
+                label,
             )
+            for label in dict.fromkeys([component_type, "Buses", "Generators"])
+        }
+        show_when_ready(
+            futures[component_type],
+            show_map,
+            "Preparing map...",
+        )
+
+
+def show_map(map_df):
+    # Only components with coordinates can be shown on the map
+    if map_df is None:
+        return
+
+    st.subheader("Map Visualization")
+
+    get_color = "color" if "color" in map_df.columns else [255, 140, 0]
+
+    st.pydeck_chart(
+        pdk.Deck(
+            map_style=None,
+            initial_view_state=pdk.ViewState(
+                latitude=map_df["lat"].mean(),
+                longitude=map_df["lon"].mean(),
+                zoom=5,
+                pitch=50,
+            ),
+            layers=[
+                pdk.Layer(
+                    "ScatterplotLayer",
+                    data=map_df,
+                    pickable=True,
+                    opacity=0.8,
+                    stroked=True,
+                    filled=True,
+                    radius_scale=30,
+                    radius_min_pixels=1,
+                    radius_max_pixels=100,
+                    line_width_min_pixels=1,
+                    get_position=["lon", "lat"],
+                    get_radius="elevation_normalized",
+                    get_fill_color=get_color,
+                    get_line_color=[0, 0, 0],
+                ),
+            ],
+        ),
+    )
@@ -0,0 +1,30 @@
+import streamlit as st
+
+from _helpers.profiling import TRACE_MEMORY_ENV
+
+
+def show_profiling_panel(trace):
+    st.caption(
+        "Wall and self time per stage of the last rerun. The self time of a view "
+        "is mostly widget layout and Streamlit serialization.",
+    )
+    if not trace.track_memory:
+        st.caption(
+            f"Peak memory is recorded when the server runs with `{TRACE_MEMORY_ENV}=1`."
+        )
+    st.dataframe(
+        trace.to_frame(),
+        hide_index=True,
+        column_config={
+            "Wall [ms]": st.column_config.NumberColumn(format="%.1f"),
+            "Self [ms]": st.column_config.NumberColumn(format="%.1f"),
+            "Peak memory [MB]": st.column_config.NumberColumn(format="%.2f"),
+            "Payload [MB]": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+    st.download_button(
+        "Export spans (JSON)",
+        trace.to_json(),
+        file_name=f"trace_{trace.trace_id}.jsonl",
+        mime="application/json",
+    )
@@ -0,0 +1,106 @@
+import streamlit as st
+
+from _helpers.fingerprint import fingerprint
+from _helpers.profiling import profiled
+from _helpers.query_engine import (
+    COLUMN_METHODS,
+    DEFAULT_ROW_LIMIT,
+    DEFAULT_TIMEOUT,
+    MAX_ROW_LIMIT,
+    QueryEngine,
+    QueryError,
+    STR_METHODS,
+    duckdb,
+)
+
+
+def get_query_engine(network):
+    """Reuse the session's query engine (and its result cache) while the network is unchanged."""
+    engine = st.session_state.get("query_engine")
+    if engine is None or engine.fingerprint != fingerprint(network):
+        engine = QueryEngine(network)
+        st.session_state["query_engine"] = engine
+    else:
+        engine.network = network
+    return engine
+
+
+@profiled
+def show_query_view(network):
+    st.header("Query Console")
+
+    engine = get_query_engine(network)
+    tables = engine.tables
+    if not tables:
+        st.info("No tables found in this network.")
+        return
+
+    languages = ["Pandas query", "SQL"] if duckdb is not None else ["Pandas query"]
+    language = st.radio("Query language:", languages, horizontal=True)
+    if duckdb is None:
+        st.caption("Install the `duckdb` package to enable SQL queries.")
+
+    with st.expander("Available tables"):
+        st.write(", ".join(f"`{t}`" for t in tables))
+        st.caption(
+            "Static tables carry the component name in a `name` column, "
+            "time-series tables (`<component>_t_<attribute>`) a `snapshot` column.",
+        )
+
+    with st.form("query_form"):
+        if language == "Pandas query":
+            table = st.selectbox("Select table:", tables)
+            text = st.text_area(
+                "Query expression:",
+                placeholder="p_nom > 100 and carrier == 'gas'",
+                help="Comparisons of columns and constants; columns only offer "
+                + ", ".join(
+                    f"`.{m}()`"
+                    for m in [
+                        *sorted(COLUMN_METHODS),
+                        *(f"str.{m}" for m in sorted(STR_METHODS)),
+                    ]
+                )
+                + ".",
+            )
+        else:
+            table = None
+            text = st.text_area(
+                "SQL statement:",
+                placeholder="SELECT carrier, sum(p_nom) AS p_nom FROM generators GROUP BY carrier",
+            )
+        col1, col2 = st.columns(2)
+        with col1:
+            limit = st.number_input(
+                "Row limit:",
+                min_value=1,
+                max_value=MAX_ROW_LIMIT,
+                value=DEFAULT_ROW_LIMIT,
+                step=1000,
+            )
+        with col2:
+            timeout = st.number_input(
+                "Time limit (s):", min_value=1.0, max_value=60.0, value=DEFAULT_TIMEOUT
+            )
+        submitted = st.form_submit_button("Run query")
+
+    if not submitted:
+        return
+    if not text.strip():
+        st.info("Please enter a query.")
+        return
+
+    try:
+        if language == "Pandas query":
+            result = engine.query(table, text, limit=int(limit), timeout=timeout)
+        else:
+            result = engine.sql(text, limit=int(limit), timeout=timeout)
+    except QueryError as e:
+        st.error(f"Query failed: {e}")
+        return
+
+    source = "cached result" if result.cached else "executed"
+    st.caption(f"{len(result.frame)} rows · {result.elapsed * 1000:.1f} ms ({source})")
+    if result.truncated:
+        st.warning(f"Result truncated to the first {int(limit)} rows.")
+    st.dataframe(result.frame)
@@ -0,0 +1,86 @@
+"""Sidebar choice of the bus to region mapping used for regional rollups."""
+
+import streamlit as st
+
+from _helpers.fingerprint import fingerprint
+from _helpers.network_loader import upload_hash
+from _helpers.regions import from_bus_column, from_csv, from_geojson, geojson_properties
+
+REGION_SOURCES = ["None", "Bus column", "CSV file", "GeoJSON file"]
+
+
+def _session_mapping(key, build):
+    """Mapping built once per session and ``key``."""
+    mappings = st.session_state.setdefault("region_mappings", {})
+    if key not in mappings:
+        mappings[key] = build()
+    return mappings[key]
+
+
+def select_regions(network):
+    """Region mapping chosen in the sidebar, or ``None``."""
+    with st.sidebar.expander("Regions"):
+        source = st.radio("Group buses by:", REGION_SOURCES, key="region_source")
+        match source:
+            case "Bus column":
+                buses = network.buses
+                columns = [
+                    c
+                    for c in buses.columns
+                    if buses[c].dtype == object and c not in ("control", "type")
+                ]
+                if not columns:
+                    st.info("The buses have no text columns to group by.")
+                    return None
+                default = columns.index("country") if "country" in columns else 0
+                column = st.selectbox(
+                    "Bus column:", columns, index=default, key="region_column"
+                )
+                return from_bus_column(network, column)
+
+            case "CSV file":
+                uploaded = st.file_uploader(
+                    "Bus to region table:",
+                    type="csv",
+                    help="Buses in the first column, regions in the second.",
+                    key="region_csv",
+                )
+                if uploaded is None:
+                    return None
+                content_hash = upload_hash(uploaded)
+                try:
+                    return _session_mapping(
+                        ("csv", content_hash),
+                        lambda: from_csv(uploaded.getvalue(), content_hash),
+                    )
+                except ValueError as e:
+                    st.error(str(e))
+                    return None
+
+            case "GeoJSON file":
+                uploaded = st.file_uploader(
+                    "Region polygons:", type=["geojson", "json"], key="region_geojson"
+                )
+                if uploaded is None:
+                    return None
+                if "x" not in network.buses.columns or "y" not in network.buses.columns:
+                    st.info("The buses have no coordinates.")
+                    return None
+                data = uploaded.getvalue()
+                properties = geojson_properties(data)
+                if not properties:
+                    st.info(
+                        "The GeoJSON features have no properties to name regions by."
+                    )
+                    return None
+                prop = st.selectbox(
+                    "Region name property:", properties, key="region_property"
+                )
+                content_hash = upload_hash(uploaded)
+                return _session_mapping(
+                    ("geojson", fingerprint(network), content_hash, prop),
+                    lambda: from_geojson(network.buses, data, prop, content_hash),
+                )
+
+            case _:
+                return None
@@ -0,0 +1,28 @@
+"""Registry of the explorer views.
+
+View modules pull in plotly, pydeck and pypsa, so they are only imported when
+a view is first shown instead of at app startup.
+"""
+
+import importlib
+
+# label -> (module, function)
+VIEWS = {
+    "System Summary": ("views.system_summary", "show_system_summary"),
+    "Temporal": ("views.temporal_view", "show_temporal_view"),
+    "Geospatial": ("views.geospatial_view", "show_geospatial_view"),
+    "Storage": ("views.storage_view", "show_storage_view"),
+    "Metadata": ("views.config_view", "show_config_view"),
+    "Query": ("views.query_view", "show_query_view"),
+}
+
+COMPARE_VIEW = ("views.compare_view", "show_compare_view")
+SCENARIO_VIEW = ("views.scenario_view", "show_scenario_view")
+
+
+def load_view(module, function):
+    return getattr(importlib.import_module(module), function)
+
+
+def show_view(label, *args):
+    load_view(*VIEWS[label])(*args)
@@ -0,0 +1,73 @@
+import plotly.express as px
+import streamlit as st
+import yaml
+
+from _helpers.profiling import profiled
+from _helpers.scenario_store import ScenarioStore, scenario_sources
+
+COMPONENTS = ["Generator", "StorageUnit", "Link", "Store", "Line"]
+
+
+@st.cache_resource
+def scenario_store(directory):
+    """Store shared by all sessions reading the same scenarios."""
+    return ScenarioStore(directory)
+
+
+@profiled
+def show_scenario_view():
+    st.header("Scenario Statistics")
+
+    path = st.sidebar.text_input(
+        "Scenario comparison YAML or scenarios directory:",
+        help="Each scenario folder holds statistics/statistics*.csv files.",
+    )
+    if not path:
+        st.info(
+            "Please enter the path of a scenario comparison YAML or of a directory of scenario folders."
+        )
+        return
+
+    try:
+        scenarios, store_dir = scenario_sources(path)
+    except (OSError, KeyError, yaml.YAMLError) as e:
+        st.error(f"Could not read scenarios from {path}: {e}")
+        return
+
+    store = scenario_store(str(store_dir))
+    # Only scenarios whose statistics changed since the last rerun are read again
+    ingested = store.refresh(scenarios)
+    if ingested:
+        st.caption(f"Ingested {len(ingested)} new or changed scenarios.")
+    if not store.scenarios:
+        st.info("No scenario statistics found.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        variable = st.selectbox("Select variable:", store.variables())
+    with col2:
+        horizon = st.selectbox("Select horizon:", store.horizons(variable))
+    with col3:
+        components = st.multiselect(
+            "Components:", COMPONENTS, default=["Generator", "StorageUnit"]
+        )
+
+    selected = st.multiselect("Scenarios:", store.scenarios, default=store.scenarios)
+    if not selected or not components:
+        st.info("Please select at least one scenario and component.")
+        return
+
+    table = store.wide(variable, horizon, scenarios=selected, components=components)
+    if table.empty:
+        st.info(f"No {variable} values for the selected scenarios in {horizon}.")
+        return
+
+    fig = px.bar(
+        table.T.rename_axis(index="scenario").reset_index(),
+        x="scenario",
+        y=list(table.index),
+        title=f"{variable} in {horizon}",
+    )
+    st.plotly_chart(fig)
+    st.dataframe(table)
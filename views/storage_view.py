@@ -0,0 +1,65 @@
+import streamlit as st
+
+from _helpers.compute import period_ranges, period_slice
+from _helpers.figures import timeseries_line
+from _helpers.profiling import profiled
+from _helpers.storage import (
+    duration_histogram,
+    soc_by_carrier,
+    storage_frames,
+    storage_statistics,
+)
+
+
+@profiled
+def show_storage_view(network):
+    st.header("Storage Operation")
+
+    statistics = storage_statistics(network)
+    if statistics is None:
+        st.info("No storage units or stores found in this network.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Storages", len(statistics))
+    col2.metric(
+        "Energy capacity", f"{statistics['energy capacity (MWh)'].sum() / 1e3:,.1f} GWh"
+    )
+    col3.metric(
+        "Median full cycles", f"{statistics['equivalent full cycles'].median():,.1f}"
+    )
+
+    st.subheader("Cycles and utilization")
+    st.dataframe(statistics)
+
+    # Multi-horizon networks are plotted one investment period at a time
+    ranges = period_ranges(network)
+    period = st.selectbox("Investment period:", list(ranges)) if ranges else None
+
+    st.subheader("State of charge by type")
+    soc = soc_by_carrier(network)
+    if soc is not None:
+        soc = period_slice(network, soc, period)
+    if soc is not None and soc.to_numpy().any():
+        st.plotly_chart(timeseries_line(soc, "State of charge by carrier"))
+    else:
+        st.info("No state of charge time series available.")
+
+    st.subheader("Charging and discharging durations")
+    histogram = duration_histogram(network)
+    if histogram is None or histogram.empty:
+        st.info("No charging or discharging found.")
+    else:
+        st.bar_chart(histogram)
+
+    with st.expander("State of charge of individual storages"):
+        frames = storage_frames(network)
+        labels = [f"{component}: {name}" for component, name in frames.soc.columns]
+        selected = st.multiselect(
+            "Select storages to plot:", labels, default=labels[:1]
+        )
+        if selected:
+            columns = [frames.soc.columns[labels.index(label)] for label in selected]
+            soc = period_slice(network, frames.soc[columns], period)
+            soc.columns = selected
+            st.plotly_chart(timeseries_line(soc, "State of charge"))
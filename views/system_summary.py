@@ -1,105 +1,179 @@
-import streamlit as st
 import pandas as pd
-import plotly.express as px
+import streamlit as st
+
+from _helpers.compute import (
+    COMPONENT_TABLES,
+    capacity_by_carrier,
+    component_counts,
+    component_table,
+    network_attributes,
+)
+from _helpers.export import frame_chunks
+from _helpers.figures import bus_map, capacity_pie, region_bars
+from _helpers.kpis import period_summary, system_kpis
+from _helpers.profiling import profiled
+from _helpers.regions import CAPACITY_ATTRS, regional_capacity, regional_timeseries
+from _helpers.topology import bus_degrees, island_table, shortest_path, topology_summary
+from views.export_panel import show_export_panel
+from views.regions_panel import select_regions
+
+
+def show_kpis(network):
+    st.subheader("Key Performance Indicators")
+    kpis = system_kpis(network)
+    if kpis.empty:
+        st.info("No dispatch or cost data available for this network.")
+        return
+
+    summary = period_summary(network)
+    periods = list(summary.index)
+    period = (
+        st.selectbox("Investment period:", periods) if len(periods) > 1 else periods[0]
+    )
+    totals = summary.loc[period]
+
+    generation = totals["Generation (MWh)"]
+    available = generation + totals["Curtailment (MWh)"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Generation", f"{generation / 1e6:,.2f} TWh")
+    col2.metric(
+        "Curtailment",
+        f"{totals['Curtailment (MWh)'] / available:.1%}" if available > 0 else "n/a",
+    )
+    col3.metric("Emissions", f"{totals['Emissions (tCO2)'] / 1e6:,.2f} MtCO2")
+    col4.metric("System cost", f"{totals['System cost']:,.0f}")
+
+    st.dataframe(kpis.loc[period])
+    if len(periods) > 1:
+        st.write("**Totals per investment period**")
+        st.dataframe(summary)
 
+
+def show_regional_summary(network, mapping):
+    st.subheader("Regional Rollup")
+    components = {
+        label: c for label, c in COMPONENT_TABLES.items() if c in CAPACITY_ATTRS
+    }
+    label = st.selectbox("Capacity of:", list(components), key="regional_component")
+    capacity = regional_capacity(network, mapping, components[label])
+    if capacity is None or capacity.empty:
+        st.info(f"No {label.lower()} capacity found in the selected regions.")
+    else:
+        st.plotly_chart(region_bars(capacity, f"{label} capacity by region"))
+
+    # Snapshot-weighted energy per region
+    weights = network.snapshot_weightings["generators"]
+    energy = {}
+    for name, component in [
+        ("Generation (MWh)", "generators"),
+        ("Load (MWh)", "loads"),
+    ]:
+        regional = regional_timeseries(network, mapping, component, "p")
+        if regional is not None:
+            energy[name] = regional.mul(weights.reindex(regional.index), axis=0).sum()
+    if energy:
+        st.dataframe(pd.DataFrame(energy).fillna(0))
+
+
+def show_topology(network):
+    st.subheader("Network Topology")
+    summary = topology_summary(network)
+    columns = st.columns(4)
+    for column, name in zip(
+        columns, ["Islands", "AC sub-networks", "Isolated buses", "Mean degree"]
+    ):
+        value = summary[name]
+        column.metric(name, f"{value:.2f}" if isinstance(value, float) else value)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**Islands**")
+        st.dataframe(island_table(network))
+    with col2:
+        st.write("**Buses by degree**")
+        st.bar_chart(bus_degrees(network).value_counts().sort_index())
+
+    with st.expander("Shortest electrical path"):
+        buses = network.buses.index
+        col1, col2 = st.columns(2)
+        with col1:
+            source = st.text_input(
+                "From bus:", placeholder=str(buses[0]) if len(buses) else ""
+            )
+        with col2:
+            target = st.text_input(
+                "To bus:", placeholder=str(buses[-1]) if len(buses) else ""
+            )
+        if not source or not target:
+            return
+        missing = [b for b in (source, target) if b not in buses]
+        if missing:
+            st.error(f"Unknown bus: {', '.join(missing)}")
+            return
+        path, distance = shortest_path(network, source, target)
+        if path is None:
+            st.info(f"{source} and {target} are not connected.")
+        else:
+            st.write(f"**{len(path) - 1} branches**, total reactance {distance:.4g}")
+            st.write(" → ".join(map(str, path)))
+
+
+@profiled
 def show_system_summary(network):
     st.header("System Summary")
-    
-    # Summary of network components
-    components_summary = {
-        "Component": ["Generators", "Buses", "Lines", "Links", "Loads", "Storage Units", "Stores", "Transformers"],
-        "Count": [
-            len(network.generators), 
-            len(network.buses), 
-            len(network.lines),
-            len(network.links),
-            len(network.loads), 
-            len(network.storage_units),
-            len(network.stores),
-            len(network.transformers),
-        ]
-    }
-    
+
     # Display network metadata
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Network Components")
-        st.dataframe(pd.DataFrame(components_summary))
-    
+        st.dataframe(component_counts(network))
+
     with col2:
         st.subheader("Network Attributes")
-        # Get network attributes
-        snapshots = network.snapshots
-        investment_periods = network.investment_periods
-        st.write(f"**Number of snapshots:** {len(snapshots)}")
-        st.write(f"**Investment periods:** {investment_periods}")
-        if hasattr(network, 'name') and network.name:
-            st.write(f"**Network name:** {network.name}")
-        
-        # Show time range if snapshots are timestamps
-        if len(snapshots) > 0:
-            st.write(f"**Time range:** {snapshots[0]} to {snapshots[-1]}")
+        for name, value in network_attributes(network).items():
+            st.write(f"**{name}:** {value}")
+
+    show_kpis(network)
+    show_topology(network)
+
+    mapping = select_regions(network)
+    if mapping is not None:
+        show_regional_summary(network, mapping)
 
     # Allow user to select which network component to view
     component_type = st.selectbox(
         "Select network component:",
-        ["Generators", "Buses", "Lines", "Links", "Loads", "Storage Units", "Stores", "Transformers"],
+        list(COMPONENT_TABLES),
     )
-    
-    # Get the corresponding dataframe
-    component_dfs = {
-        "Buses": network.buses,
-        "Lines": network.lines,
-        "Generators": network.generators,
-        "Loads": network.loads,
-        "Storage Units": network.storage_units,
-        "Links": network.links,
-        "Transformers": network.transformers,
-        "Stores": network.stores,
-    }
-    
-    df = component_dfs[component_type]
-    
+
+    df = component_table(network, component_type)
+
     if len(df) == 0:
         st.info(f"No {component_type.lower()} found in this network.")
     else:
         # Show dataframe with pagination
         st.subheader(f"{component_type} Data")
         st.dataframe(df)
-        
+        show_export_panel(
+            "component_table",
+            network,
+            COMPONENT_TABLES[component_type],
+            lambda start, stop: frame_chunks(df, start, stop),
+        )
+
         # Show the component on a map if coordinates are available
         if component_type == "Buses" and "x" in df.columns and "y" in df.columns:
             st.subheader("Bus Locations")
-            
-            fig = px.scatter_mapbox(
-                df.reset_index(), 
-                lat="y", 
-                lon="x", 
-                hover_name=df.index,
-                zoom=3,
-                height=500
-            )
-            fig.update_layout(mapbox_style="open-street-map")
-            st.plotly_chart(fig)
-        
+            st.plotly_chart(bus_map(df))
+
         # Additional component specific analysis
-        if component_type == "Generators" and len(network.generators) > 0:
+        if component_type == "Generators":
             st.subheader("Generator Capacity by Type")
-            
-            # Group generators by carrier/type
-            if "carrier" in network.generators.columns:
-                gen_by_carrier = network.generators.groupby("carrier").sum()
-                
-                if "p_nom" in gen_by_carrier.columns:
-                    fig = px.pie(
-                        gen_by_carrier.reset_index(), 
-                        values="p_nom", 
-                        names="carrier",
-                        title="Installed Capacity by Generator Type"
-                    )
-                    st.plotly_chart(fig)
-                else:
-                    st.info("Generator capacity (p_nom) information is not available.")
+
+            capacity = capacity_by_carrier(network)
+            if capacity is not None:
+                st.plotly_chart(capacity_pie(capacity))
             else:
-                st.info("Generator type information is not available.")
-        
\ No newline at end of file
+                st.info(
+                    "Generator type (carrier) or capacity (p_nom) information is not available."
+                )
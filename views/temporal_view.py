@@ -1,173 +1,409 @@
 import streamlit as st
-import plotly.express as px
-import pandas as pd
 
+from _helpers.compute import (
+    HEATMAP_LAYOUTS,
+    RESAMPLE_RULES,
+    aggregate_by_carrier,
+    carrier_dispatch,
+    heatmap_matrix,
+    period_profiles,
+    period_ranges,
+    period_slice,
+    period_totals,
+    timeseries,
+)
+from _helpers.export import frame_chunks, timeseries_chunks
+from _helpers.figures import heatmap, period_bars, series_line, timeseries_line
+from _helpers.fingerprint import fingerprint
+from _helpers.profiling import profiled
+from _helpers.regions import regional_timeseries
+from views.background import background_jobs, show_when_ready
+from views.export_panel import show_export_panel
+from views.regions_panel import select_regions
+
+
+def show_period_comparison(network, component, attr):
+    """Totals and profiles of ``attr`` of ``component`` for all investment periods side by side."""
+    label = component.capitalize()
+    totals = period_totals(network, component, attr)
+    if totals is None:
+        st.info(f"No {attr} time series data available for {component}.")
+        return
+    st.plotly_chart(period_bars(totals, f"{label} {attr} by investment period"))
+    st.plotly_chart(
+        timeseries_line(
+            period_profiles(network, component, attr),
+            f"Total {label} {attr} per period",
+        )
+    )
+
+
+def show_regional_timeseries(network, mapping, component, attr, period, how="sum"):
+    """``attr`` of ``component`` rolled up to the regions of ``mapping``."""
+    regional = regional_timeseries(network, mapping, component, attr, period, how)
+    if regional is None or regional.empty:
+        st.info(
+            f"No {attr} time series data available for {component} in the selected regions."
+        )
+        return
+    label = "average" if how == "mean" else "total"
+    st.plotly_chart(
+        timeseries_line(
+            regional, f"Regional {label} {component.replace('_', ' ')} {attr}"
+        )
+    )
+    show_export_panel(
+        "temporal",
+        network,
+        f"{component}_{attr}_by_region" + ("" if period is None else f"_{period}"),
+        lambda start, stop: frame_chunks(regional, start, stop),
+        index=regional.index,
+        selection=[mapping.key],
+    )
+
+
+def show_heatmap(network, component, attr, columns, period):
+    """Hour of day heatmap of one component, one carrier or the total of ``component``."""
+    label = component.replace("_", " ")
+    static = getattr(network, component)
+    sources = ["Total"]
+    if "carrier" in static.columns:
+        sources.append("By type")
+    sources.append("Individual")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        source = st.selectbox("Series:", sources)
+    with col2:
+        match source:
+            case "By type":
+                aggregation = "carrier"
+                key = st.selectbox(
+                    "Type:", sorted(static.loc[columns, "carrier"].dropna().unique())
+                )
+            case "Individual":
+                aggregation = "column"
+                key = st.selectbox(f"{label.capitalize()[:-1]}:", columns)
+            case _:
+                aggregation = "total"
+                key = None
+    with col3:
+        layout = st.selectbox("Layout:", list(HEATMAP_LAYOUTS))
+
+    matrix = heatmap_matrix(
+        network, component, attr, aggregation, key, HEATMAP_LAYOUTS[layout], period
+    )
+    if matrix is None:
+        st.info("Heatmaps need datetime snapshots.")
+        return
+    name = key if key is not None else f"Total {label}"
+    st.plotly_chart(heatmap(matrix, f"{name} {attr} by hour of day"))
+
+
+@profiled
 def show_temporal_view(network):
+    # Jobs of the previous selection are cancelled on every rerun, whichever branch runs
+    with background_jobs("Temporal") as submit:
+        _show_temporal_view(network, submit)
+
+
+def _show_temporal_view(network, submit):
     st.header("Temporal View")
-    
+
     # Select which type of time series to explore
     ts_component_type = st.selectbox(
         "Select time series component:",
-        ["Generators", "Loads", "Storage Units", "Lines", "Buses"]
+        ["Generators", "Loads", "Storage Units", "Lines", "Buses"],
     )
-    
+
+    # Multi-horizon networks are shown one investment period at a time
+    ranges = period_ranges(network)
+    period = None
+    compare_periods = False
+    if ranges:
+        col1, col2 = st.columns(2)
+        with col1:
+            period = st.selectbox("Investment period:", list(ranges))
+        with col2:
+            compare_periods = st.toggle("Compare periods side by side")
+    period_suffix = "" if period is None else f"_{period}"
+
+    mapping = select_regions(network)
+
     # Handle different component types
-    if ts_component_type == "Generators" and hasattr(network, "generators_t"):
+    if ts_component_type == "Generators":
         # Select which generator time series to view
-        ts_attribute = st.selectbox(
+        attr_name = st.selectbox(
             "Select time series attribute:",
-            ["p", "q", "p_max_pu", "p_min_pu"]
+            ["p", "q", "p_max_pu", "p_min_pu"],
         )
-        
-        attr_name = f"{ts_attribute}"
-        if hasattr(network.generators_t, attr_name) and len(getattr(network.generators_t, attr_name)) > 0:
-            ts_df = getattr(network.generators_t, attr_name)
-            
-            # Ensure all columns have the same length
-            ts_df = ts_df.dropna(axis=1, how='all')
-            
+
+        if compare_periods:
+            show_period_comparison(network, "generators", attr_name)
+            return
+
+        ts_df = timeseries(network, "generators", attr_name)
+        if ts_df is not None:
+            ts_df = period_slice(network, ts_df, period)
+            # Start aggregating by type while the generator list is shown
+            aggregation = None
+            if "carrier" in network.generators.columns:
+                aggregation = submit(
+                    (fingerprint(network), "carrier_dispatch", attr_name, None, period),
+                    carrier_dispatch,
+                    network,
+                    attr_name,
+                    None,
+                    period,
+                )
+
             # Select specific generators or aggregate
             if len(ts_df.columns) > 1:
                 # Offer option to view individual generators or aggregated
-                view_option = st.radio(
-                    "View option:",
-                    ["Individual generators", "Aggregate by type", "Sum all generators"]
-                )
-                
+                view_options = [
+                    "Individual generators",
+                    "Aggregate by type",
+                    "Sum all generators",
+                    "Heatmap",
+                ]
+                if mapping is not None:
+                    view_options.append("Aggregate by region")
+                view_option = st.radio("View option:", view_options)
+
                 if view_option == "Individual generators":
                     # Select which generators to plot
                     selected_gens = st.multiselect(
                         "Select generators to plot:",
                         ts_df.columns,
-                        default=[ts_df.columns[0]]
+                        default=[ts_df.columns[0]],
                     )
-                    
+
                     if selected_gens:
+                        show_export_panel(
+                            "temporal",
+                            network,
+                            f"generators_{attr_name}{period_suffix}",
+                            lambda start, stop: timeseries_chunks(
+                                ts_df, selected_gens, start, stop
+                            ),
+                            index=ts_df.index,
+                            selection=selected_gens,
+                        )
                         # Ensure selected generators have consistent lengths
                         ts_df = ts_df[selected_gens].dropna()
-                        
-                        # Plot the selected generators
-                        fig = px.line(
-                            ts_df,
-                            x=ts_df.index,
-                            y=selected_gens,
-                            title=f"Generator {attr_name} time series"
+                        st.plotly_chart(
+                            timeseries_line(ts_df, f"Generator {attr_name} time series")
                         )
-                        st.plotly_chart(fig)
                     else:
                         st.info("Please select at least one generator to plot.")
-                
+
                 elif view_option == "Aggregate by type":
-                    # Get generator types
-                    if "carrier" in network.generators.columns:
-                        # Group generators by type
-                        carrier_groups = {}
-                        for gen in ts_df.columns:
-                            if gen in network.generators.index:
-                                carrier = network.generators.loc[gen, "carrier"]
-                                if carrier not in carrier_groups:
-                                    carrier_groups[carrier] = []
-                                carrier_groups[carrier].append(gen)
-                        
-                        # Aggregate each group
-                        agg_df = pd.DataFrame(index=ts_df.index)
-                        for carrier, gens in carrier_groups.items():
-                            agg_df[carrier] = ts_df[gens].sum(axis=1)
-                        
-                        # Ensure aggregated data has consistent lengths
-                        agg_df = agg_df.dropna()
-                        
-                        # Plot aggregated data
-                        fig = px.line(
-                            agg_df,
-                            x=agg_df.index,
-                            y=agg_df.columns,
-                            title=f"Generator {attr_name} by type"
+                    if aggregation is not None:
+                        resolution = st.selectbox(
+                            "Select resolution:", list(RESAMPLE_RULES)
+                        )
+                        rule = RESAMPLE_RULES[resolution]
+                        if rule is not None:
+                            aggregation = submit(
+                                (
+                                    fingerprint(network),
+                                    "carrier_dispatch",
+                                    attr_name,
+                                    rule,
+                                    period,
+                                ),
+                                carrier_dispatch,
+                                network,
+                                attr_name,
+                                rule,
+                                period,
+                            )
+
+                        def show_aggregation(agg_df):
+                            st.plotly_chart(
+                                timeseries_line(
+                                    agg_df, f"Generator {attr_name} by type"
+                                )
+                            )
+                            show_export_panel(
+                                "temporal",
+                                network,
+                                f"generators_{attr_name}_by_carrier{period_suffix}",
+                                lambda start, stop: frame_chunks(agg_df, start, stop),
+                                index=agg_df.index,
+                                selection=[resolution],
+                            )
+
+                        show_when_ready(
+                            aggregation,
+                            show_aggregation,
+                            "Aggregating generators by type...",
                         )
-                        st.plotly_chart(fig)
                     else:
-                        st.info("Generator type (carrier) information is not available.")
-                
+                        st.info(
+                            "Generator type (carrier) information is not available."
+                        )
+
+                elif view_option == "Aggregate by region":
+                    show_regional_timeseries(
+                        network, mapping, "generators", attr_name, period
+                    )
+
+                elif view_option == "Heatmap":
+                    show_heatmap(
+                        network, "generators", attr_name, ts_df.columns, period
+                    )
+
                 elif view_option == "Sum all generators":
-                    # Sum all generators
                     total_series = ts_df.sum(axis=1).dropna()
-                    
-                    # Plot total
-                    fig = px.line(
-                        x=total_series.index,
-                        y=total_series.values,
-                        title=f"Total Generator {attr_name}"
+                    st.plotly_chart(
+                        series_line(total_series, f"Total Generator {attr_name}")
+                    )
+                    show_export_panel(
+                        "temporal",
+                        network,
+                        f"generators_{attr_name}_total{period_suffix}",
+                        lambda start, stop: timeseries_chunks(
+                            ts_df, None, start, stop, "sum"
+                        ),
+                        index=ts_df.index,
                     )
-                    st.plotly_chart(fig)
             else:
                 # Only one generator, just plot it
-                fig = px.line(
-                    ts_df,
-                    x=ts_df.index,
-                    y=ts_df.columns,
-                    title=f"Generator {attr_name} time series"
+                st.plotly_chart(
+                    timeseries_line(ts_df, f"Generator {attr_name} time series")
                 )
-                st.plotly_chart(fig)
         else:
             st.info(f"No {attr_name} time series data available for generators.")
-    
-    elif ts_component_type == "Loads" and hasattr(network, "loads_t"):
+
+    elif ts_component_type == "Loads":
         # Similar structure for loads
-        ts_attribute = st.selectbox(
+        attr_name = st.selectbox(
             "Select time series attribute:",
-            ["p", "q"]
+            ["p", "q"],
         )
-        
-        attr_name = f"{ts_attribute}"
-        if hasattr(network.loads_t, attr_name) and len(getattr(network.loads_t, attr_name)) > 0:
-            ts_df = getattr(network.loads_t, attr_name)
-            
-            # Ensure all columns have the same length
-            ts_df = ts_df.dropna(axis=1, how='all')
-            
+
+        if compare_periods:
+            show_period_comparison(network, "loads", attr_name)
+            return
+
+        ts_df = timeseries(network, "loads", attr_name)
+        if ts_df is not None:
+            ts_df = period_slice(network, ts_df, period)
             # Option to view individual loads or total
-            view_option = st.radio(
-                "View option:",
-                ["Individual loads", "Total load"]
-            )
-            
+            view_options = ["Individual loads", "Total load", "Heatmap"]
+            if mapping is not None:
+                view_options.append("Load by region")
+            view_option = st.radio("View option:", view_options)
+
             if view_option == "Individual loads":
                 # Select which loads to plot
                 selected_loads = st.multiselect(
                     "Select loads to plot:",
                     ts_df.columns,
-                    default=[ts_df.columns[0]] if len(ts_df.columns) > 0 else []
+                    default=[ts_df.columns[0]] if len(ts_df.columns) > 0 else [],
                 )
-                
+
                 if selected_loads:
+                    show_export_panel(
+                        "temporal",
+                        network,
+                        f"loads_{attr_name}{period_suffix}",
+                        lambda start, stop: timeseries_chunks(
+                            ts_df, selected_loads, start, stop
+                        ),
+                        index=ts_df.index,
+                        selection=selected_loads,
+                    )
                     # Ensure selected loads have consistent lengths
                     ts_df = ts_df[selected_loads].dropna()
-                    
-                    # Plot the selected loads
-                    fig = px.line(
-                        ts_df,
-                        x=ts_df.index,
-                        y=selected_loads,
-                        title=f"Load {attr_name} time series"
+                    st.plotly_chart(
+                        timeseries_line(ts_df, f"Load {attr_name} time series")
                     )
-                    st.plotly_chart(fig)
                 else:
                     st.info("Please select at least one load to plot.")
+            elif view_option == "Load by region":
+                show_regional_timeseries(network, mapping, "loads", attr_name, period)
+            elif view_option == "Heatmap":
+                show_heatmap(network, "loads", attr_name, ts_df.columns, period)
             else:
-                # Sum all loads
                 total_series = ts_df.sum(axis=1).dropna()
-                    
-                # Plot total
-                fig = px.line(
-                    x=total_series.index,
-                    y=total_series.values,
-                    title=f"Total Load {attr_name}"
+                st.plotly_chart(series_line(total_series, f"Total Load {attr_name}"))
+                show_export_panel(
+                    "temporal",
+                    network,
+                    f"loads_{attr_name}_total{period_suffix}",
+                    lambda start, stop: timeseries_chunks(
+                        ts_df, None, start, stop, "sum"
+                    ),
+                    index=ts_df.index,
                 )
-                st.plotly_chart(fig)
         else:
             st.info(f"No {attr_name} time series data available for loads.")
-    
+
+    elif ts_component_type == "Storage Units":
+        attr_name = st.selectbox(
+            "Select time series attribute:",
+            ["p", "state_of_charge", "p_dispatch", "p_store"],
+        )
+
+        if compare_periods:
+            show_period_comparison(network, "storage_units", attr_name)
+            return
+
+        ts_df = timeseries(network, "storage_units", attr_name)
+        if ts_df is not None:
+            ts_df = period_slice(network, ts_df, period)
+            view_option = st.radio(
+                "View option:",
+                [
+                    "Individual storage units",
+                    "Aggregate by type",
+                    "Sum all storage units",
+                ],
+            )
+
+            if view_option == "Individual storage units":
+                selected_units = st.multiselect(
+                    "Select storage units to plot:",
+                    ts_df.columns,
+                    default=[ts_df.columns[0]] if len(ts_df.columns) > 0 else [],
+                )
+                if selected_units:
+                    st.plotly_chart(
+                        timeseries_line(
+                            ts_df[selected_units].dropna(),
+                            f"Storage unit {attr_name} time series",
+                        ),
+                    )
+                else:
+                    st.info("Please select at least one storage unit to plot.")
+            elif view_option == "Aggregate by type":
+                if "carrier" in network.storage_units.columns:
+                    agg_df = aggregate_by_carrier(ts_df, network.storage_units)
+                    st.plotly_chart(
+                        timeseries_line(agg_df, f"Storage unit {attr_name} by type")
+                    )
+                else:
+                    st.info("Storage unit type (carrier) information is not available.")
+            else:
+                total_series = ts_df.sum(axis=1).dropna()
+                st.plotly_chart(
+                    series_line(total_series, f"Total Storage Unit {attr_name}")
+                )
+        else:
+            st.info(f"No {attr_name} time series data available for storage units.")
+
+    elif ts_component_type == "Buses" and mapping is not None:
+        attr_name = st.selectbox(
+            "Select time series attribute:",
+            ["marginal_price", "v_mag_pu"],
+        )
+        show_regional_timeseries(
+            network, mapping, "buses", attr_name, period, how="mean"
+        )
+
     # Similar blocks could be added for other component types
-    
+
     else:
         st.info(f"No time series data available for {ts_component_type}.")